@@ -19,9 +19,19 @@ from enum import Enum
 import uuid
 import hashlib
 import base64
-from collections import defaultdict
+from collections import defaultdict, deque, OrderedDict
 import threading
 import tempfile
+import re
+import socket
+import inspect
+import heapq
+import fnmatch
+import copy
+import math
+import bisect
+import numpy as np
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 
 # =============================================================================
 # 1. CONTAINERIZATION & DOCKER
@@ -605,7 +615,8 @@ class KubernetesManifestGenerator:
         return ingress
     
     def generate_hpa(self, app_name: str, min_replicas: int = 3, 
-                    max_replicas: int = 10, cpu_threshold: int = 70) -> dict:
+                    max_replicas: int = 10, cpu_threshold: int = 70,
+                    rps_target: Optional[float] = None, behavior: Optional[dict] = None) -> dict:
         """Generate Horizontal Pod Autoscaler manifest"""
         
         hpa = {
@@ -640,124 +651,386 @@ class KubernetesManifestGenerator:
             }
         }
         
+        if rps_target is not None:
+            hpa["spec"]["metrics"].append({
+                "type": "Pods",
+                "pods": {
+                    "metric": {"name": "http_requests_per_second"},
+                    "target": {"type": "AverageValue", "averageValue": str(rps_target)}
+                }
+            })
+        
+        if behavior:
+            hpa["spec"]["behavior"] = behavior
+        
         return hpa
 
+_SELECTOR_SPLIT = re.compile(r',(?![^()]*\))')
+_SELECTOR_SET = re.compile(r'([\w./-]+)\s+(in|notin)\s*\(([^)]*)\)')
+_SELECTOR_EQUALITY = re.compile(r'([\w./-]+)\s*(==|!=|=)\s*([\w./-]*)')
+_SELECTOR_KEY = re.compile(r'(!?)\s*([\w./-]+)')
+
+def parse_label_selector(selector: Union[str, Dict[str, str], None]) -> List[tuple]:
+    """Parse a label selector into (key, operator, values) requirements
+    
+    Supports equality (=, ==, !=), set-based (in, notin) and existence
+    (key, !key) terms, or a matchLabels-style dict.
+    """
+    if not selector:
+        return []
+    if isinstance(selector, dict):
+        return [(key, "=", frozenset([value])) for key, value in selector.items()]
+    
+    requirements = []
+    for term in _SELECTOR_SPLIT.split(selector):
+        term = term.strip()
+        match = _SELECTOR_SET.fullmatch(term)
+        if match:
+            values = frozenset(v.strip() for v in match.group(3).split(",") if v.strip())
+            requirements.append((match.group(1), match.group(2), values))
+            continue
+        match = _SELECTOR_EQUALITY.fullmatch(term)
+        if match:
+            operator = "!=" if match.group(2) == "!=" else "="
+            requirements.append((match.group(1), operator, frozenset([match.group(3)])))
+            continue
+        match = _SELECTOR_KEY.fullmatch(term)
+        if match:
+            requirements.append((match.group(2), "!exists" if match.group(1) else "exists", frozenset()))
+            continue
+        raise ValueError(f"Invalid label selector term: {term!r}")
+    return requirements
+
+def labels_match(labels: Dict[str, str], requirements: List[tuple]) -> bool:
+    """Check one label set against parsed selector requirements"""
+    for key, operator, values in requirements:
+        present = key in labels
+        if operator in ("=", "in"):
+            if not present or labels[key] not in values:
+                return False
+        elif operator in ("!=", "notin"):
+            if present and labels[key] in values:
+                return False
+        elif operator == "exists":
+            if not present:
+                return False
+        elif present:  # !exists
+            return False
+    return True
+
+@dataclass
+class WatchEvent:
+    """Change notification emitted by ResourceStore"""
+    type: str  # ADDED, MODIFIED, DELETED
+    kind: str
+    namespace: str
+    name: str
+    resource_version: int
+    object: dict
+
+class ResourceWatch:
+    """Async iterator over store events matching kind/namespace/selector"""
+    
+    def __init__(self, store: 'ResourceStore', kind: Optional[str], namespace: Optional[str],
+                 requirements: List[tuple]):
+        self.store = store
+        self.kind = kind
+        self.namespace = namespace
+        self.requirements = requirements
+        self.queue: asyncio.Queue = asyncio.Queue()
+    
+    def matches(self, event: WatchEvent) -> bool:
+        if self.kind is not None and event.kind != self.kind:
+            return False
+        if self.namespace is not None and event.namespace != self.namespace:
+            return False
+        labels = event.object["metadata"].get("labels", {})
+        return labels_match(labels, self.requirements)
+    
+    def stop(self):
+        """Unregister; iteration ends after already queued events"""
+        self.store._watchers.discard(self)
+        self.queue.put_nowait(None)
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> WatchEvent:
+        event = await self.queue.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+class ResourceStore:
+    """In-memory object store keyed by (kind, namespace, name)
+    
+    Every write bumps a store-wide resourceVersion, maintains inverted label
+    indexes per (kind, namespace) and notifies watchers. Stored objects are
+    treated as immutable: update by putting a modified copy.
+    """
+    
+    def __init__(self, history_size: int = 1000):
+        self.resource_version = 0
+        self._objects: Dict[tuple, Dict[str, dict]] = defaultdict(dict)  # (kind, ns) -> name -> obj
+        self._label_index: Dict[tuple, Dict[str, Dict[str, set]]] = defaultdict(lambda: defaultdict(dict))
+        self._key_index: Dict[tuple, Dict[str, set]] = defaultdict(dict)
+        self._history = deque(maxlen=history_size)
+        self._watchers: set = set()
+    
+    def _index(self, scope: tuple, name: str, labels: Dict[str, str]):
+        values_by_key = self._label_index[scope]
+        keys = self._key_index[scope]
+        for key, value in labels.items():
+            values_by_key[key].setdefault(value, set()).add(name)
+            keys.setdefault(key, set()).add(name)
+    
+    def _unindex(self, scope: tuple, name: str, labels: Dict[str, str]):
+        values_by_key = self._label_index[scope]
+        keys = self._key_index[scope]
+        for key, value in labels.items():
+            names = values_by_key[key][value]
+            names.discard(name)
+            if not names:
+                del values_by_key[key][value]
+            keys[key].discard(name)
+    
+    def _emit(self, event_type: str, kind: str, namespace: str, name: str, obj: dict):
+        event = WatchEvent(event_type, kind, namespace, name, self.resource_version, obj)
+        self._history.append(event)
+        for watcher in self._watchers:
+            if watcher.matches(event):
+                watcher.queue.put_nowait(event)
+    
+    def put(self, kind: str, namespace: str, obj: dict) -> dict:
+        """Create or replace; a set metadata.resourceVersion must match the stored one"""
+        metadata = obj["metadata"]
+        name = metadata["name"]
+        scope = (kind, namespace)
+        current = self._objects[scope].get(name)
+        
+        expected = metadata.get("resourceVersion")
+        if current is not None and expected is not None \
+                and expected != current["metadata"]["resourceVersion"]:
+            raise ValueError(f"Conflict on {kind} {namespace}/{name}: resourceVersion {expected} "
+                             f"is stale (current {current['metadata']['resourceVersion']})")
+        
+        self.resource_version += 1
+        metadata["namespace"] = namespace
+        metadata["resourceVersion"] = str(self.resource_version)
+        
+        if current is not None:
+            self._unindex(scope, name, current["metadata"].get("labels", {}))
+        self._objects[scope][name] = obj
+        self._index(scope, name, metadata.get("labels", {}))
+        
+        self._emit("MODIFIED" if current is not None else "ADDED", kind, namespace, name, obj)
+        return obj
+    
+    def delete(self, kind: str, namespace: str, name: str) -> Optional[dict]:
+        scope = (kind, namespace)
+        obj = self._objects[scope].pop(name, None)
+        if obj is None:
+            return None
+        self._unindex(scope, name, obj["metadata"].get("labels", {}))
+        self.resource_version += 1
+        self._emit("DELETED", kind, namespace, name, obj)
+        return obj
+    
+    def get(self, kind: str, namespace: str, name: str) -> Optional[dict]:
+        return self._objects[(kind, namespace)].get(name)
+    
+    def count(self, kind: str, namespace: str = None) -> int:
+        return sum(len(objects) for (k, ns), objects in self._objects.items()
+                   if k == kind and (namespace is None or ns == namespace))
+    
+    def _select_names(self, scope: tuple, requirements: List[tuple]) -> set:
+        values_by_key = self._label_index[scope]
+        keys = self._key_index[scope]
+        
+        def positive_set(key, operator, values) -> set:
+            if operator == "exists":
+                return keys.get(key, set())
+            index = values_by_key.get(key, {})
+            sets = [index[v] for v in values if v in index]
+            return sets[0] if len(sets) == 1 else set().union(*sets)
+        
+        def estimate(requirement) -> int:
+            key, operator, values = requirement
+            if operator == "exists":
+                return len(keys.get(key, ()))
+            index = values_by_key.get(key, {})
+            return sum(len(index.get(v, ())) for v in values)
+        
+        positives = sorted((r for r in requirements if r[1] in ("=", "in", "exists")), key=estimate)
+        negatives = [r for r in requirements if r[1] not in ("=", "in", "exists")]
+        
+        # Start from the most selective index; intersections then cost O(candidates)
+        if positives:
+            candidates = set(positive_set(*positives[0]))
+        else:
+            candidates = set(self._objects[scope])
+        
+        for key, operator, values in positives[1:]:
+            if not candidates:
+                break
+            if operator == "exists":
+                candidates &= keys.get(key, set())
+            else:
+                index = values_by_key.get(key, {})
+                candidates = set().union(*(candidates & index[v] for v in values if v in index))
+        
+        for key, operator, values in negatives:
+            if operator == "!exists":
+                candidates = candidates - keys.get(key, set())
+            else:
+                index = values_by_key.get(key, {})
+                for value in values:
+                    if value in index:
+                        candidates = candidates - index[value]
+        return candidates
+    
+    def list(self, kind: str, namespace: str = None, label_selector=None) -> List[dict]:
+        """Objects of a kind (all namespaces when namespace is None) matching the selector"""
+        requirements = parse_label_selector(label_selector)
+        scopes = [(kind, namespace)] if namespace is not None else \
+            [scope for scope in self._objects if scope[0] == kind]
+        
+        result = []
+        for scope in scopes:
+            objects = self._objects[scope]
+            if not requirements:
+                result.extend(objects.values())
+            else:
+                result.extend(objects[name] for name in self._select_names(scope, requirements))
+        return result
+    
+    def watch(self, kind: str = None, namespace: str = None, label_selector=None,
+              resource_version: int = None) -> ResourceWatch:
+        """Stream change events; with resource_version, replay newer events from history first"""
+        watcher = ResourceWatch(self, kind, namespace, parse_label_selector(label_selector))
+        if resource_version is not None:
+            if self._history and self._history[0].resource_version > resource_version + 1:
+                raise ValueError(f"resourceVersion {resource_version} is too old (history starts at "
+                                 f"{self._history[0].resource_version})")
+            for event in self._history:
+                if event.resource_version > resource_version and watcher.matches(event):
+                    watcher.queue.put_nowait(event)
+        self._watchers.add(watcher)
+        return watcher
+
 class KubernetesCluster:
     """Mock Kubernetes cluster (simulates kubectl operations)"""
     
     def __init__(self):
-        self.resources: Dict[str, Dict[str, Any]] = defaultdict(dict)
-        self.pods: Dict[str, dict] = {}
+        self.store = ResourceStore()
         self.namespaces = {"default"}
+        self.controller_manager = None  # set while a ControllerManager reconciles
     
     async def apply_manifest(self, manifest: dict, namespace: str = "default") -> bool:
         """Apply Kubernetes manifest"""
         kind = manifest["kind"]
         name = manifest["metadata"]["name"]
+        namespace = manifest["metadata"].get("namespace", namespace)
         
         print(f"🚀 Applying {kind}: {name}")
         
         # Simulate apply time
         await asyncio.sleep(0.5)
         
-        # Store resource
-        resource_key = f"{kind.lower()}s"
-        self.resources[resource_key][name] = manifest
+        # Store a private copy so the caller's manifest is never mutated
+        resource = copy.deepcopy(manifest)
+        resource["metadata"].pop("resourceVersion", None)
+        self.namespaces.add(namespace)
+        self.store.put(kind, namespace, resource)
         
-        # If it's a deployment, create mock pods
-        if kind == "Deployment":
-            await self._create_pods_for_deployment(manifest, namespace)
+        # If it's a deployment, create mock pods (controllers do it when running)
+        if kind == "Deployment" and self.controller_manager is None:
+            await self._create_pods_for_deployment(resource, namespace)
         
         print(f"✅ {kind} {name} applied successfully")
         return True
     
+    def _create_pod(self, deployment: dict, namespace: str) -> dict:
+        template_labels = deployment["spec"]["template"]["metadata"]["labels"]
+        pod_name = f"{template_labels.get('app', deployment['metadata']['name'])}-{uuid.uuid4().hex[:8]}"
+        pod = {
+            "apiVersion": "v1",
+            "kind": "Pod",
+            "metadata": {
+                "name": pod_name,
+                "labels": dict(template_labels),
+                "ownerReferences": [{"kind": "Deployment", "name": deployment["metadata"]["name"]}],
+                "creationTimestamp": datetime.utcnow().isoformat()
+            },
+            "status": {"phase": "Running"}
+        }
+        return self.store.put("Pod", namespace, pod)
+    
     async def _create_pods_for_deployment(self, deployment: dict, namespace: str):
         """Create mock pods for deployment"""
-        replicas = deployment["spec"]["replicas"]
-        app_name = deployment["metadata"]["labels"]["app"]
-        
-        for i in range(replicas):
-            pod_name = f"{app_name}-{uuid.uuid4().hex[:8]}"
-            
-            pod = {
-                "name": pod_name,
-                "namespace": namespace,
-                "status": "Running",
-                "app": app_name,
-                "created_at": datetime.utcnow().isoformat()
-            }
-            
-            self.pods[pod_name] = pod
+        existing = self.store.list("Pod", namespace, deployment["spec"]["selector"]["matchLabels"])
+        for _ in range(deployment["spec"]["replicas"] - len(existing)):
+            self._create_pod(deployment, namespace)
     
-    def get_pods(self, namespace: str = "default", label_selector: str = None) -> List[dict]:
-        """Get pods"""
-        pods = list(self.pods.values())
-        
-        if label_selector:
-            # Simple label filtering
-            app_name = label_selector.split("=")[1] if "=" in label_selector else None
-            if app_name:
-                pods = [p for p in pods if p.get("app") == app_name]
-        
-        return pods
+    def get_pods(self, namespace: str = "default", label_selector: Union[str, Dict[str, str]] = None) -> List[dict]:
+        """Get pods (namespace=None lists all namespaces)"""
+        return self.store.list("Pod", namespace, label_selector)
     
-    def get_resource(self, kind: str, name: str) -> Optional[dict]:
+    def get_resource(self, kind: str, name: str, namespace: str = "default") -> Optional[dict]:
         """Get resource by kind and name"""
-        resource_key = f"{kind.lower()}s"
-        return self.resources[resource_key].get(name)
+        return self.store.get(kind, namespace, name)
     
-    def list_resources(self, kind: str) -> List[dict]:
+    def list_resources(self, kind: str, namespace: str = None, label_selector: str = None) -> List[dict]:
         """List resources by kind"""
-        resource_key = f"{kind.lower()}s"
-        return list(self.resources[resource_key].values())
+        return self.store.list(kind, namespace, label_selector)
+    
+    def watch(self, kind: str = None, namespace: str = None, label_selector: str = None,
+              resource_version: int = None) -> ResourceWatch:
+        """Watch resource changes (async iterator of WatchEvent)"""
+        return self.store.watch(kind, namespace, label_selector, resource_version)
     
-    async def scale_deployment(self, name: str, replicas: int) -> bool:
+    async def scale_deployment(self, name: str, replicas: int, namespace: str = "default") -> bool:
         """Scale deployment"""
-        deployment = self.get_resource("Deployment", name)
+        deployment = self.get_resource("Deployment", name, namespace)
         if not deployment:
             return False
         
         print(f"📈 Scaling deployment {name} to {replicas} replicas")
-        deployment["spec"]["replicas"] = replicas
+        updated = copy.deepcopy(deployment)
+        updated["spec"]["replicas"] = replicas
+        deployment = self.store.put("Deployment", namespace, updated)
+        if self.controller_manager is not None:
+            return True  # the ReplicaSet reconciler converges the pods
         
         # Update pods
-        app_name = deployment["metadata"]["labels"]["app"]
-        current_pods = [p for p in self.pods.values() if p.get("app") == app_name]
+        current_pods = self.get_pods(namespace, deployment["spec"]["selector"]["matchLabels"])
         
         if len(current_pods) < replicas:
             # Add pods
-            for i in range(replicas - len(current_pods)):
-                pod_name = f"{app_name}-{uuid.uuid4().hex[:8]}"
-                pod = {
-                    "name": pod_name,
-                    "namespace": "default",
-                    "status": "Running", 
-                    "app": app_name,
-                    "created_at": datetime.utcnow().isoformat()
-                }
-                self.pods[pod_name] = pod
+            for _ in range(replicas - len(current_pods)):
+                self._create_pod(deployment, namespace)
         
         elif len(current_pods) > replicas:
-            # Remove excess pods
-            pods_to_remove = current_pods[replicas:]
-            for pod in pods_to_remove:
-                del self.pods[pod["name"]]
+            # Remove newest pods first
+            current_pods.sort(key=lambda p: p["metadata"]["creationTimestamp"])
+            for pod in current_pods[replicas:]:
+                self.store.delete("Pod", namespace, pod["metadata"]["name"])
         
         print(f"✅ Deployment {name} scaled successfully")
         return True
     
     def get_cluster_status(self) -> dict:
         """Get cluster status"""
-        total_pods = len(self.pods)
-        running_pods = sum(1 for p in self.pods.values() if p["status"] == "Running")
+        pods = self.store.list("Pod")
+        running_pods = sum(1 for p in pods if p["status"]["phase"] == "Running")
         
         return {
-            "total_pods": total_pods,
+            "total_pods": len(pods),
             "running_pods": running_pods,
-            "deployments": len(self.resources["deployments"]),
-            "services": len(self.resources["services"]),
-            "configmaps": len(self.resources["configmaps"]),
-            "secrets": len(self.resources["secrets"])
+            "deployments": self.store.count("Deployment"),
+            "services": self.store.count("Service"),
+            "configmaps": self.store.count("ConfigMap"),
+            "secrets": self.store.count("Secret")
         }
 
 # Kubernetes demonstration
@@ -864,16 +1137,44 @@ redis:
     pods = cluster.get_pods(label_selector=f"app={app_name}")
     print(f"\nPods for {app_name}:")
     for pod in pods:
-        print(f"  - {pod['name']}: {pod['status']}")
+        print(f"  - {pod['metadata']['name']}: {pod['status']['phase']} "
+              f"(resourceVersion {pod['metadata']['resourceVersion']})")
+    
+    # Watch pod changes while scaling
+    pod_watch = cluster.watch("Pod", "default", label_selector=f"app={app_name}")
     
     # Scale deployment
     await cluster.scale_deployment(f"{app_name}-deployment", 5)
+    await cluster.scale_deployment(f"{app_name}-deployment", 4)
+    pod_watch.stop()
+    
+    print(f"\nWatch events:")
+    async for event in pod_watch:
+        print(f"  {event.type:<8} {event.kind}/{event.name} (rv {event.resource_version})")
     
     # Check pods after scaling
     pods = cluster.get_pods(label_selector=f"app={app_name}")
     print(f"\nPods after scaling:")
     for pod in pods:
-        print(f"  - {pod['name']}: {pod['status']}")
+        print(f"  - {pod['metadata']['name']}: {pod['status']['phase']}")
+    
+    # Set-based selectors over a large simulated cluster
+    store = ResourceStore()
+    tiers = ["web", "api", "worker"]
+    environments = ["dev", "staging", "prod", "canary"]
+    for i in range(100_000):
+        store.put("Pod", f"team-{i % 5}", {"metadata": {
+            "name": f"pod-{i}",
+            "labels": {"app": f"app-{i % 50}", "tier": tiers[i % 3], "env": environments[i % 4]}
+        }})
+    
+    selector = "app=app-7,tier in (web,api),env!=dev"
+    start = time.perf_counter()
+    for _ in range(100):
+        matched = store.list("Pod", "team-2", selector)
+    elapsed_us = (time.perf_counter() - start) / 100 * 1e6
+    print(f"\n🔎 '{selector}' over {store.count('Pod'):,} pods: "
+          f"{len(matched)} matches in {elapsed_us:.0f}µs")
 
 # Run Kubernetes demo
 asyncio.run(kubernetes_demo())
@@ -901,18 +1202,110 @@ class MetricPoint:
         
         return f"{self.name}{labels_str} {self.value}"
 
+class TimeSeriesRingBuffer:
+    """Fixed-size, NumPy-backed (timestamp, value) ring buffer for one series"""
+    
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.timestamps = np.full(capacity, -np.inf)
+        self.values = np.zeros(capacity)
+        self.count = 0
+        self._next = 0
+    
+    def append(self, timestamp: float, value: float):
+        index = self._next
+        self.timestamps[index] = timestamp
+        self.values[index] = value
+        self._next = (index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+    
+    def latest(self) -> float:
+        if self.count == 0:
+            return np.nan
+        return self.values[self._next - 1]
+    
+    def window(self, seconds: float, now: float = None) -> tuple:
+        """(timestamps, values) recorded in the last `seconds` (unordered)"""
+        now = time.time() if now is None else now
+        mask = self.timestamps >= now - seconds
+        return self.timestamps[mask], self.values[mask]
+    
+    @staticmethod
+    def aggregate_window(timestamps: np.ndarray, values: np.ndarray, aggregation: str) -> float:
+        """Aggregate a window: avg, min, max, sum, count, rate or pXX"""
+        if values.size == 0:
+            return np.nan
+        if aggregation == "avg":
+            return float(values.mean())
+        if aggregation == "max":
+            return float(values.max())
+        if aggregation == "min":
+            return float(values.min())
+        if aggregation == "sum":
+            return float(values.sum())
+        if aggregation == "count":
+            return float(values.size)
+        if aggregation == "rate":
+            # Per-second increase of a cumulative counter
+            first, last = timestamps.argmin(), timestamps.argmax()
+            elapsed = timestamps[last] - timestamps[first]
+            return float((values[last] - values[first]) / elapsed) if elapsed > 0 else np.nan
+        if aggregation.startswith("p"):
+            return float(np.percentile(values, float(aggregation[1:])))
+        raise ValueError(f"Unknown aggregation: {aggregation}")
+    
+    def aggregate(self, aggregation: str, seconds: float, now: float = None) -> float:
+        if aggregation == "latest":
+            return self.latest()
+        return self.aggregate_window(*self.window(seconds, now), aggregation)
+
+class TimeSeriesStore:
+    """Ring buffer per series name"""
+    
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.series: Dict[str, TimeSeriesRingBuffer] = {}
+    
+    def record(self, name: str, value: float, timestamp: float = None):
+        buffer = self.series.get(name)
+        if buffer is None:
+            buffer = self.series[name] = TimeSeriesRingBuffer(self.capacity)
+        buffer.append(time.time() if timestamp is None else timestamp, value)
+    
+    def aggregate(self, name: str, aggregation: str = "latest",
+                  seconds: float = 300, now: float = None) -> float:
+        buffer = self.series.get(name)
+        if buffer is None:
+            return np.nan
+        return buffer.aggregate(aggregation, seconds, now)
+
+_SNAPSHOT_QUANTILES = (0.5, 0.95, 0.99)
+
 class MetricsCollector:
     """Application metrics collector"""
     
-    def __init__(self):
-        self.metrics: Dict[str, List[MetricPoint]] = defaultdict(list)
+    def __init__(self, series_capacity: int = 4096, clock: Callable[[], float] = None,
+                 window_samples: int = 2048, max_points: int = 1000):
+        # Raw history is capped per metric: only the latest max_points are kept
+        self.metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_points))
+        self.clock = clock or time.time  # timestamps for time_series (virtual in simulations)
         self.counters: Dict[str, float] = defaultdict(float)
         self.gauges: Dict[str, float] = {}
-        self.histograms: Dict[str, List[float]] = defaultdict(list)
+        self.histograms: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_points))
+        # Running [count, sum, min, max] so summaries never rescan the lists
+        self._histogram_stats: Dict[str, List[float]] = {}
+        # consumer -> name -> bounded samples since that consumer's last
+        # collect_snapshot(), so each consumer gets its own quantile window
+        self.window_samples = window_samples
+        self._histogram_windows: Dict[str, Dict[str, deque]] = {"default": {}}
+        # Recent values per series for windowed queries and alerts
+        self.time_series = TimeSeriesStore(series_capacity)
     
     def counter(self, name: str, value: float = 1, labels: Dict[str, str] = None):
         """Increment counter metric"""
         self.counters[name] += value
+        self.time_series.record(name, self.counters[name], self.clock())
         
         metric = MetricPoint(
             name=name,
@@ -926,6 +1319,7 @@ class MetricsCollector:
     def gauge(self, name: str, value: float, labels: Dict[str, str] = None):
         """Set gauge metric"""
         self.gauges[name] = value
+        self.time_series.record(name, value, self.clock())
         
         metric = MetricPoint(
             name=name,
@@ -939,6 +1333,22 @@ class MetricsCollector:
     def histogram(self, name: str, value: float, labels: Dict[str, str] = None):
         """Record histogram metric"""
         self.histograms[name].append(value)
+        self.time_series.record(name, value, self.clock())
+        
+        for window in list(self._histogram_windows.values()):
+            samples = window.get(name)
+            if samples is None:
+                samples = window[name] = deque(maxlen=self.window_samples)
+            samples.append(value)
+        
+        stats = self._histogram_stats.get(name)
+        if stats is None:
+            self._histogram_stats[name] = [1, value, value, value]
+        else:
+            stats[0] += 1
+            stats[1] += value
+            stats[2] = min(stats[2], value)
+            stats[3] = max(stats[3], value)
         
         metric = MetricPoint(
             name=name,
@@ -963,12 +1373,13 @@ class MetricsCollector:
             output.append(f"# TYPE {name} gauge")
             output.append(f"{name} {value}")
         
-        # Histograms (simplified)
-        for name, values in self.histograms.items():
+        # Histograms (simplified); quantiles over the latest max_points samples
+        for name, values in list(self.histograms.items()):
             if values:
+                count, total, _, _ = self._histogram_stats[name]
                 output.append(f"# TYPE {name} histogram")
-                output.append(f"{name}_count {len(values)}")
-                output.append(f"{name}_sum {sum(values)}")
+                output.append(f"{name}_count {count}")
+                output.append(f"{name}_sum {total}")
                 
                 # Calculate quantiles
                 sorted_values = sorted(values)
@@ -980,6 +1391,34 @@ class MetricsCollector:
         
         return "\n".join(output)
     
+    def collect_snapshot(self, consumer: str = "default") -> Dict[str, Dict[tuple, Any]]:
+        """Snapshot in the exporter format: {kind: {(name, labels): value}}
+        
+        Counts and sums are cumulative; histogram quantiles cover only the
+        samples recorded since this consumer's previous call (at most
+        window_samples), NaN when there were none. A new consumer's window
+        starts at its first call.
+        """
+        windows = self._histogram_windows.get(consumer, {})
+        self._histogram_windows[consumer] = {}
+        
+        histograms = {}
+        for name, (count, total, _, _) in list(self._histogram_stats.items()):
+            samples = windows.get(name)
+            if samples:
+                values = np.fromiter(samples, dtype=float, count=len(samples))
+                quantiles = dict(zip(_SNAPSHOT_QUANTILES,
+                                     np.quantile(values, _SNAPSHOT_QUANTILES).tolist()))
+            else:
+                quantiles = dict.fromkeys(_SNAPSHOT_QUANTILES, math.nan)
+            histograms[(name, ())] = {"count": count, "sum": total, "quantiles": quantiles}
+        
+        return {
+            "counters": {(name, ()): value for name, value in list(self.counters.items())},
+            "gauges": {(name, ()): value for name, value in list(self.gauges.items())},
+            "histograms": histograms
+        }
+    
     def get_metrics_summary(self) -> dict:
         """Get metrics summary"""
         return {
@@ -987,13 +1426,13 @@ class MetricsCollector:
             "gauges": dict(self.gauges),
             "histograms": {
                 name: {
-                    "count": len(values),
-                    "sum": sum(values),
-                    "avg": sum(values) / len(values) if values else 0,
-                    "min": min(values) if values else 0,
-                    "max": max(values) if values else 0
+                    "count": count,
+                    "sum": total,
+                    "avg": total / count,
+                    "min": minimum,
+                    "max": maximum
                 }
-                for name, values in self.histograms.items()
+                for name, (count, total, minimum, maximum) in self._histogram_stats.items()
             }
         }
 
@@ -1005,6 +1444,14 @@ class LogLevel(Enum):
     ERROR = "ERROR"
     CRITICAL = "CRITICAL"
 
+LOG_LEVEL_NUMBERS = {
+    LogLevel.DEBUG: 10,
+    LogLevel.INFO: 20,
+    LogLevel.WARNING: 30,
+    LogLevel.ERROR: 40,
+    LogLevel.CRITICAL: 50,
+}
+
 @dataclass
 class LogEntry:
     """Structured log entry"""
@@ -1030,13 +1477,167 @@ class LogEntry:
             **self.extra
         })
 
+class LogDispatcher:
+    """Queue-backed fan-out: handlers run in batches off the caller's thread"""
+    
+    def __init__(self, batch_size: int = 256, flush_interval: float = 0.05,
+                 max_queue: int = 10000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.dropped = 0
+        self.handler_errors: Dict[str, int] = defaultdict(int)
+        self._queue: deque = deque()  # append/popleft are thread-safe
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def submit(self, handlers: List[Callable], entry: LogEntry):
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self._queue.append((handlers, entry))
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+    
+    def _next_batch(self) -> Dict[int, tuple]:
+        """Pop up to batch_size entries, grouped by handler list"""
+        groups: Dict[int, tuple] = {}
+        for _ in range(min(self.batch_size, len(self._queue))):
+            handlers, entry = self._queue.popleft()
+            group = groups.get(id(handlers))
+            if group is None:
+                group = groups[id(handlers)] = (handlers, [])
+            group[1].append(entry)
+        return groups
+    
+    def _record_error(self, handler: Callable, error: Exception, failed: int = 1):
+        """Count failed entries per handler; print only the first error"""
+        name = getattr(handler, "__name__", handler.__class__.__name__)
+        if self.handler_errors[name] == 0:
+            print(f"❌ Log handler {name} failed: {error}")
+        self.handler_errors[name] += failed
+    
+    def _call_handler(self, handler: Callable, entries: List[LogEntry]):
+        """Run one synchronous handler over a batch"""
+        # One failing or slow handler never affects the others' entries
+        handle_batch = getattr(handler, "handle_batch", None)
+        if handle_batch is not None:
+            try:
+                handle_batch(entries)
+            except Exception as e:
+                self._record_error(handler, e, len(entries))
+            return
+        for entry in entries:
+            try:
+                handler(entry)
+            except Exception as e:
+                self._record_error(handler, e)
+    
+    async def _call_handler_async(self, handler: Callable, entries: List[LogEntry]):
+        """Run one coroutine handler over a batch"""
+        handle_batch = getattr(handler, "handle_batch", None)
+        if handle_batch is not None:
+            try:
+                await handle_batch(entries)
+            except Exception as e:
+                self._record_error(handler, e, len(entries))
+            return
+        for entry in entries:
+            try:
+                await handler(entry)
+            except Exception as e:
+                self._record_error(handler, e)
+    
+    @staticmethod
+    def _is_async_handler(handler: Callable) -> bool:
+        target = getattr(handler, "handle_batch", handler)
+        return (inspect.iscoroutinefunction(target) or
+                inspect.iscoroutinefunction(getattr(target, "__call__", None)))
+    
+    def _dispatch_sync(self, groups: Dict[int, tuple]):
+        for handlers, entries in groups.values():
+            for handler in list(handlers):
+                self._call_handler(handler, entries)
+    
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            while self._queue:
+                self._dispatch_sync(self._next_batch())
+            if self._stopping:
+                return
+    
+    def start(self) -> 'LogDispatcher':
+        """Dispatch on a background thread"""
+        self._thread = threading.Thread(target=self._run, name="log-dispatcher", daemon=True)
+        self._thread.start()
+        return self
+    
+    async def _drain_async(self):
+        while self._queue:
+            for handlers, entries in self._next_batch().values():
+                for handler in list(handlers):
+                    if self._is_async_handler(handler):
+                        await self._call_handler_async(handler, entries)
+                    else:
+                        # Blocking handlers (files, sockets) must not stall the loop
+                        await asyncio.to_thread(self._call_handler, handler, entries)
+            await asyncio.sleep(0)
+    
+    async def _run_async(self):
+        while True:
+            await self._drain_async()
+            if self._stopping:
+                return
+            await asyncio.sleep(self.flush_interval)
+    
+    def start_async(self) -> 'LogDispatcher':
+        """Dispatch from an asyncio task (handlers may be coroutines)
+        
+        Entries submitted before this call are dispatched by the task's first pass.
+        """
+        self._task = asyncio.get_running_loop().create_task(self._run_async())
+        return self
+    
+    def close(self):
+        """Drain the queue and stop the background thread"""
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        # Never started, or submitted after the thread exited: drain here
+        while self._queue:
+            self._dispatch_sync(self._next_batch())
+    
+    async def aclose(self):
+        """Drain the queue and stop the asyncio task"""
+        self._stopping = True
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self._drain_async()
+        self.close()
+
 class StructuredLogger:
     """Structured logger with multiple outputs"""
     
-    def __init__(self, name: str):
+    # Looked up once from LOG_LEVEL_NUMBERS, so the level methods compare ints
+    _DEBUG_NO = LOG_LEVEL_NUMBERS[LogLevel.DEBUG]
+    _INFO_NO = LOG_LEVEL_NUMBERS[LogLevel.INFO]
+    _WARNING_NO = LOG_LEVEL_NUMBERS[LogLevel.WARNING]
+    _ERROR_NO = LOG_LEVEL_NUMBERS[LogLevel.ERROR]
+    _CRITICAL_NO = LOG_LEVEL_NUMBERS[LogLevel.CRITICAL]
+    
+    def __init__(self, name: str, dispatcher: Optional[LogDispatcher] = None):
         self.name = name
         self.handlers = []
         self.min_level = LogLevel.INFO
+        self.min_level_no = LOG_LEVEL_NUMBERS[LogLevel.INFO]
+        self.dispatcher = dispatcher
     
     def add_handler(self, handler: Callable[[LogEntry], None]):
         """Add log handler"""
@@ -1045,45 +1646,115 @@ class StructuredLogger:
     def set_level(self, level: LogLevel):
         """Set minimum log level"""
         self.min_level = level
+        self.min_level_no = LOG_LEVEL_NUMBERS[level]
     
     def _log(self, level: LogLevel, message: str, **kwargs):
         """Internal logging method"""
-        if self._should_log(level):
-            entry = LogEntry(
-                level=level,
-                message=message,
-                timestamp=datetime.utcnow(),
-                logger_name=self.name,
-                extra=kwargs
-            )
-            
-            for handler in self.handlers:
+        if LOG_LEVEL_NUMBERS[level] < self.min_level_no:
+            return
+        
+        entry = LogEntry(
+            level=level,
+            message=message,
+            timestamp=datetime.utcnow(),
+            logger_name=self.name,
+            extra=kwargs
+        )
+        
+        if self.dispatcher is not None:
+            self.dispatcher.submit(self.handlers, entry)
+            return
+        
+        for handler in self.handlers:
+            try:
                 handler(entry)
+            except Exception as e:
+                print(f"❌ Log handler error: {e}")
     
     def _should_log(self, level: LogLevel) -> bool:
         """Check if should log at given level"""
-        levels = [LogLevel.DEBUG, LogLevel.INFO, LogLevel.WARNING, LogLevel.ERROR, LogLevel.CRITICAL]
-        return levels.index(level) >= levels.index(self.min_level)
+        return LOG_LEVEL_NUMBERS[level] >= self.min_level_no
     
     def debug(self, message: str, **kwargs):
         """Log debug message"""
-        self._log(LogLevel.DEBUG, message, **kwargs)
+        if self.min_level_no <= self._DEBUG_NO:
+            self._log(LogLevel.DEBUG, message, **kwargs)
     
     def info(self, message: str, **kwargs):
         """Log info message"""
-        self._log(LogLevel.INFO, message, **kwargs)
+        if self.min_level_no <= self._INFO_NO:
+            self._log(LogLevel.INFO, message, **kwargs)
     
     def warning(self, message: str, **kwargs):
         """Log warning message"""
-        self._log(LogLevel.WARNING, message, **kwargs)
+        if self.min_level_no <= self._WARNING_NO:
+            self._log(LogLevel.WARNING, message, **kwargs)
     
     def error(self, message: str, **kwargs):
         """Log error message"""
-        self._log(LogLevel.ERROR, message, **kwargs)
+        if self.min_level_no <= self._ERROR_NO:
+            self._log(LogLevel.ERROR, message, **kwargs)
     
     def critical(self, message: str, **kwargs):
         """Log critical message"""
-        self._log(LogLevel.CRITICAL, message, **kwargs)
+        if self.min_level_no <= self._CRITICAL_NO:
+            self._log(LogLevel.CRITICAL, message, **kwargs)
+
+_ALERT_CONDITIONS = {"greater_than": 0, "less_than": 1, "equals": 2}
+
+class AlertEvaluator:
+    """Alert rules compiled into arrays; one vectorized comparison per tick"""
+    
+    def __init__(self, store: TimeSeriesStore):
+        self.store = store
+        self.rules: List[dict] = []
+        self._queries: List[tuple] = []  # unique (metric, aggregation, window)
+        self._query_index = np.zeros(0, dtype=np.int64)
+        self._thresholds = np.zeros(0)
+        self._conditions = np.zeros(0, dtype=np.int8)
+    
+    def compile(self, rules: List[dict]):
+        """Deduplicate queries so rules sharing a series/window share the work"""
+        query_ids: Dict[tuple, int] = {}
+        query_index = []
+        for rule in rules:
+            query = (rule["metric_name"], rule["aggregation"], rule["window_seconds"])
+            query_index.append(query_ids.setdefault(query, len(query_ids)))
+        
+        self.rules = list(rules)
+        self._queries = list(query_ids)
+        self._query_index = np.array(query_index, dtype=np.int64)
+        self._thresholds = np.array([rule["threshold"] for rule in rules], dtype=float)
+        self._conditions = np.array([_ALERT_CONDITIONS[rule["condition"]] for rule in rules], dtype=np.int8)
+    
+    def evaluate(self, now: float = None, fallback: Dict[str, float] = None) -> tuple:
+        """Return (value per rule, triggered mask)"""
+        now = time.time() if now is None else now
+        fallback = fallback or {}
+        
+        windows: Dict[tuple, tuple] = {}
+        query_values = np.empty(len(self._queries))
+        for i, (metric_name, aggregation, seconds) in enumerate(self._queries):
+            buffer = self.store.series.get(metric_name)
+            if buffer is None:
+                query_values[i] = fallback.get(metric_name, np.nan)
+            elif aggregation == "latest":
+                query_values[i] = buffer.latest()
+            else:
+                # Slice each (series, window) once, whatever the number of aggregations
+                window = windows.get((metric_name, seconds))
+                if window is None:
+                    window = windows[(metric_name, seconds)] = buffer.window(seconds, now)
+                query_values[i] = buffer.aggregate_window(*window, aggregation)
+        
+        values = query_values[self._query_index]
+        with np.errstate(invalid="ignore"):
+            triggered = np.select(
+                [self._conditions == 0, self._conditions == 1, self._conditions == 2],
+                [values > self._thresholds, values < self._thresholds, values == self._thresholds],
+                default=False
+            )
+        return values, triggered & ~np.isnan(values)
 
 class MonitoringDashboard:
     """Monitoring dashboard for visualizing metrics"""
@@ -1091,54 +1762,53 @@ class MonitoringDashboard:
     def __init__(self, metrics_collector: MetricsCollector):
         self.metrics_collector = metrics_collector
         self.alerts = []
+        self.evaluator = AlertEvaluator(metrics_collector.time_series)
+        self._compiled = True
     
     def create_alert(self, name: str, metric_name: str, 
-                    threshold: float, condition: str = "greater_than"):
-        """Create alert rule"""
+                    threshold: float, condition: str = "greater_than",
+                    aggregation: str = "latest", window_seconds: float = 300,
+                    verbose: bool = True):
+        """Create alert rule (aggregation: latest, avg, min, max, sum, count, rate, pXX)"""
+        if condition not in _ALERT_CONDITIONS:
+            raise ValueError(f"Unknown alert condition: {condition}")
+        
         alert = {
             "name": name,
             "metric_name": metric_name,
             "threshold": threshold,
             "condition": condition,
+            "aggregation": aggregation,
+            "window_seconds": window_seconds,
             "created_at": datetime.utcnow()
         }
         
         self.alerts.append(alert)
-        print(f"🚨 Alert created: {name} - {metric_name} {condition} {threshold}")
+        self._compiled = False
+        if verbose:
+            metric = metric_name if aggregation == "latest" else f"{aggregation}({metric_name}) over {window_seconds:g}s"
+            print(f"🚨 Alert created: {name} - {metric} {condition} {threshold}")
     
-    def check_alerts(self) -> List[dict]:
+    def check_alerts(self, now: float = None) -> List[dict]:
         """Check alert conditions"""
-        triggered_alerts = []
-        
-        for alert in self.alerts:
-            metric_name = alert["metric_name"]
-            
-            # Get latest metric value
-            latest_value = None
-            if metric_name in self.metrics_collector.counters:
-                latest_value = self.metrics_collector.counters[metric_name]
-            elif metric_name in self.metrics_collector.gauges:
-                latest_value = self.metrics_collector.gauges[metric_name]
-            
-            if latest_value is not None:
-                condition_met = False
-                
-                if alert["condition"] == "greater_than":
-                    condition_met = latest_value > alert["threshold"]
-                elif alert["condition"] == "less_than":
-                    condition_met = latest_value < alert["threshold"]
-                elif alert["condition"] == "equals":
-                    condition_met = latest_value == alert["threshold"]
-                
-                if condition_met:
-                    triggered_alert = {
-                        **alert,
-                        "current_value": latest_value,
-                        "triggered_at": datetime.utcnow()
-                    }
-                    triggered_alerts.append(triggered_alert)
-        
-        return triggered_alerts
+        if not self._compiled:
+            self.evaluator.compile(self.alerts)
+            self._compiled = True
+        if not self.alerts:
+            return []
+        
+        fallback = {**self.metrics_collector.counters, **self.metrics_collector.gauges}
+        values, triggered = self.evaluator.evaluate(now, fallback)
+        triggered_at = datetime.utcnow()
+        
+        return [
+            {
+                **self.evaluator.rules[i],
+                "current_value": float(values[i]),
+                "triggered_at": triggered_at
+            }
+            for i in np.flatnonzero(triggered)
+        ]
     
     def get_dashboard_data(self) -> dict:
         """Get dashboard data"""
@@ -1171,12 +1841,11 @@ class MonitoringDashboard:
                     health_score -= 20
                     issues.append(f"High error rate: {error_rate:.1f}%")
         
-        # Check response times
-        if "http_request_duration" in metrics["histograms"]:
-            duration_stats = metrics["histograms"]["http_request_duration"]
-            if duration_stats["avg"] > 1.0:  # More than 1 second average
-                health_score -= 15
-                issues.append(f"Slow response time: {duration_stats['avg']:.2f}s")
+        # Check response times (recent window, not the full history)
+        avg_duration = self.metrics_collector.time_series.aggregate("http_request_duration", "avg", 300)
+        if not np.isnan(avg_duration) and avg_duration > 1.0:  # More than 1 second average
+            health_score -= 15
+            issues.append(f"Slow response time: {avg_duration:.2f}s")
         
         # Check memory usage
         if "memory_usage_percent" in metrics["gauges"]:
@@ -1197,6 +1866,810 @@ class MonitoringDashboard:
             "issues": issues
         }
 
+@dataclass
+class MetricsWindow:
+    """One aggregation window: cumulative snapshot plus deltas since the last window"""
+    start: float
+    end: float
+    snapshot: Dict[str, Dict[tuple, Any]]
+    counter_deltas: Dict[tuple, float]
+    histogram_deltas: Dict[tuple, Dict[str, float]]
+
+def _series_name(name: str, labels: tuple) -> str:
+    """Prometheus-style series name: name{k="v",...}"""
+    name = re.sub(r'[^a-zA-Z0-9_:]', '_', name)
+    if not labels:
+        return name
+    label_pairs = []
+    for k, v in labels:
+        value = str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        label_pairs.append(f'{re.sub(r"[^a-zA-Z0-9_]", "_", k)}="{value}"')
+    return name + "{" + ",".join(label_pairs) + "}"
+
+def format_prometheus_text(snapshot: Dict[str, Dict[tuple, Any]]) -> str:
+    """Render a collector snapshot in Prometheus text exposition format"""
+    output = []
+    typed = set()
+    
+    def type_line(name: str, metric_type: str):
+        name = re.sub(r'[^a-zA-Z0-9_:]', '_', name)
+        if name not in typed:
+            typed.add(name)
+            output.append(f"# TYPE {name} {metric_type}")
+    
+    for (name, labels), value in sorted(snapshot["counters"].items()):
+        type_line(name, "counter")
+        output.append(f"{_series_name(name, labels)} {value}")
+    
+    for (name, labels), value in sorted(snapshot["gauges"].items()):
+        type_line(name, "gauge")
+        output.append(f"{_series_name(name, labels)} {value}")
+    
+    for (name, labels), summary in sorted(snapshot["histograms"].items()):
+        type_line(name, "summary")
+        for q, value in summary["quantiles"].items():
+            value = "NaN" if math.isnan(value) else value
+            output.append(f"{_series_name(name, labels + (('quantile', q),))} {value}")
+        output.append(f"{_series_name(name + '_count', labels)} {summary['count']}")
+        output.append(f"{_series_name(name + '_sum', labels)} {summary['sum']}")
+    
+    return "\n".join(output) + "\n"
+
+class MetricsExporter:
+    """Exporter interface; receives one MetricsWindow per aggregation window"""
+    
+    def export(self, window: MetricsWindow):
+        pass
+    
+    def close(self):
+        pass
+
+class PrometheusHTTPExporter(MetricsExporter):
+    """Serves the last window's snapshot at /metrics on a local HTTP socket"""
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self._payload = b""
+        exporter = self
+        
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                payload = exporter._payload  # pre-rendered; scrapes cost no aggregation
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.host, self.port = self.server.server_address[:2]
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"📡 Prometheus endpoint: http://{self.host}:{self.port}/metrics")
+    
+    def export(self, window: MetricsWindow):
+        self._payload = format_prometheus_text(window.snapshot).encode("utf-8")
+    
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+class StatsDExporter(MetricsExporter):
+    """Sends window deltas over UDP as StatsD (or DogStatsD with tags), batched per packet"""
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 8125, prefix: str = "",
+                 dogstatsd: bool = False, max_packet_size: int = 1432):
+        self.address = (host, port)
+        self.prefix = prefix
+        self.dogstatsd = dogstatsd
+        self.max_packet_size = max_packet_size
+        self.packets_sent = 0
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    
+    def _line(self, name: str, labels: tuple, value: float, metric_type: str) -> str:
+        name = re.sub(r'[^a-zA-Z0-9_.]', '_', self.prefix + name)
+        if self.dogstatsd:
+            tags = f"|#{','.join(f'{k}:{v}' for k, v in labels)}" if labels else ""
+            return f"{name}:{value}|{metric_type}{tags}"
+        # Plain StatsD has no tags; fold them into the metric path
+        path = "".join(f".{k}_{v}" for k, v in labels)
+        return f"{name}{re.sub(r'[^a-zA-Z0-9_.]', '_', path)}:{value}|{metric_type}"
+    
+    def export(self, window: MetricsWindow):
+        lines = []
+        for (name, labels), delta in window.counter_deltas.items():
+            lines.append(self._line(name, labels, delta, "c"))
+        for (name, labels), value in window.snapshot["gauges"].items():
+            lines.append(self._line(name, labels, value, "g"))
+        for (name, labels), delta in window.histogram_deltas.items():
+            lines.append(self._line(f"{name}.count", labels, delta["count"], "c"))
+            for q, value in window.snapshot["histograms"][(name, labels)]["quantiles"].items():
+                if math.isnan(value):
+                    continue  # StatsD has no NaN; an empty window sends no quantile gauges
+                lines.append(self._line(f"{name}.p{int(q * 100)}", labels, value, "g"))
+        
+        packet = ""
+        for line in lines:
+            if packet and len(packet) + 1 + len(line) > self.max_packet_size:
+                self._send(packet)
+                packet = ""
+            packet = f"{packet}\n{line}" if packet else line
+        if packet:
+            self._send(packet)
+    
+    def _send(self, packet: str):
+        self._socket.sendto(packet.encode("utf-8"), self.address)
+        self.packets_sent += 1
+    
+    def close(self):
+        self._socket.close()
+
+class RotatingFileExporter(MetricsExporter):
+    """Appends one JSON delta snapshot per window; rotates by tracked size"""
+    
+    def __init__(self, file_path: str, max_bytes: int = 1024 * 1024, backup_count: int = 3):
+        self.file_path = file_path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = open(file_path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+    
+    def export(self, window: MetricsWindow):
+        record = {
+            "start": window.start,
+            "end": window.end,
+            "counters": {_series_name(*key): delta for key, delta in window.counter_deltas.items()},
+            "gauges": {_series_name(*key): value for key, value in window.snapshot["gauges"].items()},
+            "histograms": {
+                _series_name(*key): {**delta, "quantiles": window.snapshot["histograms"][key]["quantiles"]}
+                for key, delta in window.histogram_deltas.items()
+            }
+        }
+        line = json.dumps(record) + "\n"
+        if self._file.closed:
+            self._reopen()  # a failed rotation is retried on the next window
+        self._file.write(line)
+        self._file.flush()
+        self._size += len(line.encode("utf-8"))
+        if self._size >= self.max_bytes:
+            self._rotate()
+    
+    def _rotate(self):
+        self._file.close()
+        try:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.file_path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.file_path}.{index + 1}")
+            os.replace(self.file_path, f"{self.file_path}.1")
+        finally:
+            # Reopen even when a rename failed (same file, keeps growing)
+            self._reopen()
+    
+    def _reopen(self):
+        self._file = open(self.file_path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+    
+    def close(self):
+        self._file.close()
+
+class MetricsExportPipeline:
+    """Snapshots a collector once per window and fans the window out to exporters"""
+    
+    def __init__(self, collector, exporters: List[MetricsExporter], window_seconds: float = 10.0,
+                 consumer: str = "default"):
+        self.collector = collector  # anything with collect_snapshot(consumer)
+        self.consumer = consumer  # pipelines sharing a collector need distinct names
+        self.exporters = exporters
+        self.window_seconds = window_seconds
+        self._previous = {"counters": {}, "histograms": {}}
+        self._window_start = time.time()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def collect_window(self) -> MetricsWindow:
+        """Build the next window; cost depends on series count, not event rate"""
+        snapshot = self.collector.collect_snapshot(self.consumer)
+        now = time.time()
+        
+        previous_counters = self._previous["counters"]
+        counter_deltas = {}
+        for key, value in snapshot["counters"].items():
+            delta = value - previous_counters.get(key, 0)
+            if delta:
+                counter_deltas[key] = delta
+        
+        previous_histograms = self._previous["histograms"]
+        histogram_deltas = {}
+        for key, summary in snapshot["histograms"].items():
+            previous = previous_histograms.get(key, {"count": 0, "sum": 0})
+            count = summary["count"] - previous["count"]
+            if count:
+                histogram_deltas[key] = {"count": count, "sum": summary["sum"] - previous["sum"]}
+        
+        window = MetricsWindow(self._window_start, now, snapshot, counter_deltas, histogram_deltas)
+        self._previous = snapshot
+        self._window_start = now
+        return window
+    
+    def flush(self) -> MetricsWindow:
+        """Export one window now"""
+        window = self.collect_window()
+        for exporter in self.exporters:
+            try:
+                exporter.export(window)
+            except Exception as e:
+                print(f"❌ {exporter.__class__.__name__} export failed: {e}")
+        return window
+    
+    def start(self):
+        """Export every window_seconds on a background thread"""
+        def run():
+            while not self._stop.wait(self.window_seconds):
+                self.flush()
+        
+        self._thread = threading.Thread(target=run, name="metrics-export", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the thread, export the final partial window and close exporters"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        for exporter in self.exporters:
+            exporter.close()
+
+# -----------------------------------------------------------------------------
+# Controller manager: reconciliation loops and HPA driven by MetricsCollector
+# -----------------------------------------------------------------------------
+
+class VirtualClock:
+    """Simulated time: sleeping jumps straight to the wake-up time"""
+    
+    def __init__(self, start: float = 0.0):
+        self._now = start
+    
+    def now(self) -> float:
+        return self._now
+    
+    async def sleep_until(self, deadline: float):
+        self._now = max(self._now, deadline)
+        await asyncio.sleep(0)  # still yield to other tasks
+
+class WallClock:
+    """Real time, as seconds since the clock was created"""
+    
+    def __init__(self):
+        self._origin = time.monotonic()
+    
+    def now(self) -> float:
+        return time.monotonic() - self._origin
+    
+    async def sleep_until(self, deadline: float):
+        await asyncio.sleep(max(0.0, deadline - self.now()))
+
+# Kubernetes defaults for autoscaling/v2 spec.behavior
+DEFAULT_HPA_BEHAVIOR = {
+    "scaleUp": {
+        "stabilizationWindowSeconds": 0,
+        "selectPolicy": "Max",
+        "policies": [
+            {"type": "Percent", "value": 100, "periodSeconds": 15},
+            {"type": "Pods", "value": 4, "periodSeconds": 15}
+        ]
+    },
+    "scaleDown": {
+        "stabilizationWindowSeconds": 300,
+        "selectPolicy": "Max",
+        "policies": [{"type": "Percent", "value": 100, "periodSeconds": 15}]
+    }
+}
+
+def _owner(obj: dict) -> Optional[tuple]:
+    """(kind, name) of the first owner reference"""
+    owners = obj["metadata"].get("ownerReferences")
+    return (owners[0]["kind"], owners[0]["name"]) if owners else None
+
+def _scaled_value(value: Union[int, str], total: int, round_up: bool) -> int:
+    """Resolve an int or percentage ("25%") against a replica count"""
+    if isinstance(value, str) and value.endswith("%"):
+        amount = total * float(value[:-1]) / 100
+        return math.ceil(amount) if round_up else math.floor(amount)
+    return int(value)
+
+class ControllerManager:
+    """Event-driven controller loop over a KubernetesCluster
+    
+    Watch events feed a de-duplicated work queue for the Deployment and
+    ReplicaSet reconcilers; periodic work (HPA syncs, pod startup, traffic
+    replay) is kept in a timer heap. With a VirtualClock the loop jumps
+    from timer to timer, so hours of traffic replay in seconds.
+    """
+    
+    def __init__(self, cluster: KubernetesCluster, metrics: MetricsCollector, clock=None,
+                 namespace: str = "default", hpa_sync_period: float = 15.0,
+                 pod_startup_seconds: float = 20.0, metrics_window: float = 30.0,
+                 tolerance: float = 0.1):
+        self.cluster = cluster
+        self.store = cluster.store
+        self.metrics = metrics
+        self.clock = clock or WallClock()
+        self.namespace = namespace
+        self.hpa_sync_period = hpa_sync_period
+        self.pod_startup_seconds = pod_startup_seconds
+        self.metrics_window = metrics_window
+        self.tolerance = tolerance
+        
+        self._timers = []  # heap of (when, seq, callback)
+        self._timer_seq = 0
+        self._work_queue = deque()
+        self._queued = set()
+        self._recommendations: Dict[str, deque] = defaultdict(deque)  # hpa -> (time, replicas)
+        self._scale_history: Dict[str, deque] = defaultdict(deque)    # hpa -> (time, change)
+        self.scale_events: List[dict] = []
+        self.reconciles = 0
+        
+        # Pods are now created by the reconcilers, not by apply/scale calls
+        cluster.controller_manager = self
+        self._watch = cluster.watch(namespace=namespace)
+    
+    def schedule(self, delay: float, callback: Callable[[], None]):
+        """Run callback after delay seconds of (possibly virtual) time"""
+        self._timer_seq += 1
+        heapq.heappush(self._timers, (self.clock.now() + delay, self._timer_seq, callback))
+    
+    def _enqueue(self, kind: str, name: str):
+        key = (kind, name)
+        if key not in self._queued:
+            self._queued.add(key)
+            self._work_queue.append(key)
+    
+    def _handle_event(self, event: WatchEvent):
+        if event.kind in ("Deployment", "ReplicaSet"):
+            self._enqueue(event.kind, event.name)
+        owner = _owner(event.object)
+        if owner and event.kind in ("ReplicaSet", "Pod"):
+            self._enqueue(*owner)
+    
+    def _drain(self):
+        """Process pending watch events and reconcile until the queue is empty"""
+        while True:
+            while not self._watch.queue.empty():
+                event = self._watch.queue.get_nowait()
+                if event is not None:
+                    self._handle_event(event)
+            if not self._work_queue:
+                return
+            kind, name = self._work_queue.popleft()
+            self._queued.discard((kind, name))
+            self.reconciles += 1
+            if kind == "Deployment":
+                self._reconcile_deployment(name)
+            else:
+                self._reconcile_replicaset(name)
+    
+    async def _wait(self, deadline: float):
+        if isinstance(self.clock, VirtualClock):
+            await self.clock.sleep_until(deadline)
+            return
+        # Real time: wake early when a watch event arrives
+        try:
+            event = await asyncio.wait_for(self._watch.queue.get(), deadline - self.clock.now())
+            if event is not None:
+                self._handle_event(event)
+        except asyncio.TimeoutError:
+            pass
+    
+    async def run(self, until: float):
+        """Run controllers until the clock reaches `until` seconds"""
+        # Initial list, like an informer's first sync
+        for deployment in self.store.list("Deployment", self.namespace):
+            self._enqueue("Deployment", deployment["metadata"]["name"])
+        for replicaset in self.store.list("ReplicaSet", self.namespace):
+            self._enqueue("ReplicaSet", replicaset["metadata"]["name"])
+        self.schedule(0, self._sync_hpas)
+        
+        try:
+            while True:
+                self._drain()
+                if self.clock.now() >= until:
+                    break
+                deadline = min(self._timers[0][0], until) if self._timers else until
+                if self.clock.now() < deadline:
+                    await self._wait(deadline)
+                    continue
+                while self._timers and self._timers[0][0] <= self.clock.now():
+                    _, _, callback = heapq.heappop(self._timers)
+                    callback()
+        finally:
+            # A failing callback must not leave the cluster waiting for reconcilers
+            self._watch.stop()
+            self.cluster.controller_manager = None
+    
+    def _update(self, kind: str, obj: dict, section: str, values: dict) -> dict:
+        """Put a copy with obj[section] updated, skipping no-op writes"""
+        if all(obj.get(section, {}).get(k) == v for k, v in values.items()):
+            return obj
+        updated = copy.deepcopy(obj)
+        updated.setdefault(section, {}).update(values)
+        return self.store.put(kind, self.namespace, updated)
+    
+    # --- Deployment reconciler (rolling updates via ReplicaSets) ---
+    
+    def _reconcile_deployment(self, name: str):
+        deployment = self.store.get("Deployment", self.namespace, name)
+        replicasets = [rs for rs in self.store.list("ReplicaSet", self.namespace)
+                       if _owner(rs) == ("Deployment", name)]
+        if deployment is None:
+            for rs in replicasets:
+                self.store.delete("ReplicaSet", self.namespace, rs["metadata"]["name"])
+            return
+        
+        spec = deployment["spec"]
+        template_hash = hashlib.sha1(json.dumps(spec["template"], sort_keys=True).encode()).hexdigest()[:10]
+        new_rs = next((rs for rs in replicasets
+                       if rs["metadata"]["labels"].get("pod-template-hash") == template_hash), None)
+        old_rss = [rs for rs in replicasets if rs is not new_rs]
+        
+        if new_rs is None:
+            template = copy.deepcopy(spec["template"])
+            template["metadata"]["labels"]["pod-template-hash"] = template_hash
+            new_rs = self.store.put("ReplicaSet", self.namespace, {
+                "apiVersion": "apps/v1",
+                "kind": "ReplicaSet",
+                "metadata": {
+                    "name": f"{name}-{template_hash}",
+                    "labels": dict(template["metadata"]["labels"]),
+                    "ownerReferences": [{"kind": "Deployment", "name": name}]
+                },
+                "spec": {
+                    "replicas": 0,
+                    "selector": {"matchLabels": {**spec["selector"]["matchLabels"],
+                                                 "pod-template-hash": template_hash}},
+                    "template": template
+                },
+                "status": {"replicas": 0, "readyReplicas": 0}
+            })
+        
+        desired = spec["replicas"]
+        rolling = spec.get("strategy", {}).get("rollingUpdate", {})
+        max_surge = _scaled_value(rolling.get("maxSurge", "25%"), desired, round_up=True)
+        max_unavailable = _scaled_value(rolling.get("maxUnavailable", "25%"), desired, round_up=False)
+        if max_surge == 0 and max_unavailable == 0:
+            max_unavailable = 1
+        
+        if not old_rss:
+            # Plain scaling
+            new_rs = self._update("ReplicaSet", new_rs, "spec", {"replicas": desired})
+        else:
+            # Surge the new ReplicaSet, then retire old pods while staying available
+            total = sum(rs["spec"]["replicas"] for rs in replicasets)
+            scale_up = min(desired - new_rs["spec"]["replicas"], desired + max_surge - total)
+            if scale_up > 0:
+                new_rs = self._update("ReplicaSet", new_rs, "spec",
+                                      {"replicas": new_rs["spec"]["replicas"] + scale_up})
+            
+            # Ready pods per ReplicaSet, minus deletions it has not carried out yet
+            ready_by_hash = defaultdict(int)
+            for pod in self.store.list("Pod", self.namespace, spec["selector"]["matchLabels"]):
+                if pod["status"]["phase"] == "Running":
+                    ready_by_hash[pod["metadata"]["labels"].get("pod-template-hash")] += 1
+            ready = sum(min(ready_by_hash[rs["metadata"]["labels"]["pod-template-hash"]], rs["spec"]["replicas"])
+                        for rs in [new_rs] + old_rss)
+            removable = ready - (desired - max_unavailable)
+            for rs in old_rss:
+                remove = min(rs["spec"]["replicas"], max(removable, 0))
+                if remove:
+                    self._update("ReplicaSet", rs, "spec", {"replicas": rs["spec"]["replicas"] - remove})
+                    removable -= remove
+                if rs["spec"]["replicas"] - remove == 0 and rs["status"]["replicas"] == 0:
+                    self.store.delete("ReplicaSet", self.namespace, rs["metadata"]["name"])
+        
+        all_rss = [new_rs] + [rs for rs in old_rss
+                              if self.store.get("ReplicaSet", self.namespace, rs["metadata"]["name"])]
+        self._update("Deployment", deployment, "status", {
+            "replicas": sum(rs["status"]["replicas"] for rs in all_rss),
+            "readyReplicas": sum(rs["status"]["readyReplicas"] for rs in all_rss),
+            "updatedReplicas": new_rs["status"]["replicas"]
+        })
+    
+    # --- ReplicaSet reconciler (pods) ---
+    
+    def _reconcile_replicaset(self, name: str):
+        replicaset = self.store.get("ReplicaSet", self.namespace, name)
+        if replicaset is None:
+            for pod in self.store.list("Pod", self.namespace):
+                if _owner(pod) == ("ReplicaSet", name):
+                    self.store.delete("Pod", self.namespace, pod["metadata"]["name"])
+            return
+        
+        pods = self.store.list("Pod", self.namespace, replicaset["spec"]["selector"]["matchLabels"])
+        diff = replicaset["spec"]["replicas"] - len(pods)
+        
+        if diff > 0:
+            template = replicaset["spec"]["template"]
+            for _ in range(diff):
+                pod_name = f"{name}-{uuid.uuid4().hex[:5]}"
+                self.store.put("Pod", self.namespace, {
+                    "apiVersion": "v1",
+                    "kind": "Pod",
+                    "metadata": {
+                        "name": pod_name,
+                        "labels": dict(template["metadata"]["labels"]),
+                        "ownerReferences": [{"kind": "ReplicaSet", "name": name}]
+                    },
+                    "status": {"phase": "Pending", "startTime": self.clock.now()}
+                })
+                self.schedule(self.pod_startup_seconds, lambda pod_name=pod_name: self._pod_ready(pod_name))
+        
+        elif diff < 0:
+            # Delete not-yet-ready pods first, then the youngest
+            pods.sort(key=lambda p: (p["status"]["phase"] == "Running", -p["status"]["startTime"]))
+            for pod in pods[:-diff]:
+                self.store.delete("Pod", self.namespace, pod["metadata"]["name"])
+            pods = pods[-diff:]
+        
+        # New pods start Pending, so only surviving pods can be ready
+        self._update("ReplicaSet", replicaset, "status", {
+            "replicas": replicaset["spec"]["replicas"],
+            "readyReplicas": sum(1 for p in pods if p["status"]["phase"] == "Running")
+        })
+    
+    def _pod_ready(self, pod_name: str):
+        pod = self.store.get("Pod", self.namespace, pod_name)
+        if pod is not None:
+            self._update("Pod", pod, "status", {"phase": "Running"})
+    
+    # --- Horizontal Pod Autoscaler ---
+    
+    def _metric_value(self, deployment: str, metric: dict) -> tuple:
+        """(name, current, target) per-pod averages for one HPA metric spec"""
+        if metric["type"] == "Resource":
+            name = metric["resource"]["name"]
+            series = _series_name(f"pod_{name}_utilization", (("deployment", deployment),))
+            target = metric["resource"]["target"]["averageUtilization"]
+        else:
+            name = metric["pods"]["metric"]["name"]
+            series = _series_name(name, (("deployment", deployment),))
+            target = float(metric["pods"]["target"]["averageValue"])
+        current = self.metrics.time_series.aggregate(series, "avg", self.metrics_window, self.clock.now())
+        return name, current, target
+    
+    def _rate_limit(self, hpa_name: str, current: int, proposed: int, rules: dict) -> int:
+        now = self.clock.now()
+        history = self._scale_history[hpa_name]
+        direction = 1 if proposed > current else -1
+        
+        limits = []
+        for policy in rules["policies"]:
+            changed = sum(change for when, change in history
+                          if when > now - policy["periodSeconds"] and change * direction > 0)
+            period_start = current - changed
+            if policy["type"] == "Pods":
+                limits.append(period_start + direction * policy["value"])
+            else:
+                limits.append(math.ceil(period_start * (1 + direction * policy["value"] / 100)))
+        
+        if rules.get("selectPolicy") == "Disabled" or not limits:
+            return current
+        # "Max" picks the policy allowing the largest change in either direction
+        most_permissive = (rules.get("selectPolicy", "Max") == "Max") == (direction > 0)
+        limit = max(limits) if most_permissive else min(limits)
+        return min(proposed, limit) if direction > 0 else max(proposed, limit)
+    
+    def _sync_hpas(self):
+        for hpa in self.store.list("HorizontalPodAutoscaler", self.namespace):
+            self._sync_hpa(hpa)
+        self.schedule(self.hpa_sync_period, self._sync_hpas)
+    
+    def _sync_hpa(self, hpa: dict):
+        now = self.clock.now()
+        hpa_name = hpa["metadata"]["name"]
+        spec = hpa["spec"]
+        target_name = spec["scaleTargetRef"]["name"]
+        deployment = self.store.get("Deployment", self.namespace, target_name)
+        if deployment is None:
+            return
+        
+        current = deployment["spec"]["replicas"]
+        ready = deployment.get("status", {}).get("readyReplicas", 0)
+        behavior = {direction: {**rules, **spec.get("behavior", {}).get(direction, {})}
+                    for direction, rules in DEFAULT_HPA_BEHAVIOR.items()}
+        
+        # Desired replicas per metric; the largest proposal wins
+        proposals, observed = [], {}
+        for metric in spec["metrics"]:
+            metric_name, value, target = self._metric_value(target_name, metric)
+            if np.isnan(value) or ready == 0:
+                continue
+            observed[metric_name] = round(value, 2)
+            ratio = value / target
+            proposals.append((current if abs(ratio - 1) <= self.tolerance else math.ceil(ready * ratio),
+                              metric_name))
+        if not proposals:
+            return
+        
+        proposed, driven_by = max(proposals)
+        desired = min(max(proposed, spec["minReplicas"]), spec["maxReplicas"])
+        
+        # Stabilization: scale up to the lowest, down to the highest recent recommendation
+        recommendations = self._recommendations[hpa_name]
+        recommendations.append((now, desired))
+        longest = max(behavior["scaleUp"]["stabilizationWindowSeconds"],
+                      behavior["scaleDown"]["stabilizationWindowSeconds"])
+        while recommendations and recommendations[0][0] < now - longest:
+            recommendations.popleft()
+        
+        def window(seconds):
+            return [r for t, r in recommendations if t >= now - seconds]
+        
+        stabilized = current
+        up = min(window(behavior["scaleUp"]["stabilizationWindowSeconds"]))
+        down = max(window(behavior["scaleDown"]["stabilizationWindowSeconds"]))
+        if stabilized < up:
+            stabilized = up
+        if stabilized > down:
+            stabilized = down
+        
+        new_replicas = stabilized
+        if stabilized != current:
+            rules = behavior["scaleUp"] if stabilized > current else behavior["scaleDown"]
+            new_replicas = self._rate_limit(hpa_name, current, stabilized, rules)
+        
+        if new_replicas != current:
+            history = self._scale_history[hpa_name]
+            history.append((now, new_replicas - current))
+            while history and history[0][0] < now - 1800:
+                history.popleft()
+            self._update("Deployment", deployment, "spec", {"replicas": new_replicas})
+            self.scale_events.append({"time": now, "hpa": hpa_name, "from": current,
+                                      "to": new_replicas, "metrics": observed,
+                                      "driven_by": driven_by})
+        
+        self._update("HorizontalPodAutoscaler", hpa, "status", {
+            "currentReplicas": current,
+            "desiredReplicas": new_replicas,
+            "currentMetrics": observed
+        })
+
+class TrafficReplay:
+    """Replays a (seconds, requests/sec) trace against a deployment
+    
+    Every interval the load is spread over the ready pods and per-pod CPU
+    utilization and RPS are recorded in the MetricsCollector the HPA reads.
+    """
+    
+    def __init__(self, manager: ControllerManager, deployment: str, trace: List[tuple],
+                 pod_capacity_rps: float = 100.0, idle_cpu: float = 0.0, interval: float = 5.0):
+        self.manager = manager
+        self.deployment = deployment
+        self.trace = sorted(trace)
+        self.pod_capacity_rps = pod_capacity_rps
+        self.idle_cpu = idle_cpu  # CPU % a pod uses with no traffic
+        self.interval = interval
+        self.stats = {"pod_seconds": 0.0, "overloaded_seconds": 0.0,
+                      "dropped_requests": 0.0, "served_requests": 0.0, "max_pods": 0}
+    
+    def rate_at(self, t: float) -> float:
+        """Linear interpolation between trace points"""
+        times = [point[0] for point in self.trace]
+        i = bisect.bisect_right(times, t)
+        if i == 0:
+            return self.trace[0][1]
+        if i == len(self.trace):
+            return self.trace[-1][1]
+        (t0, r0), (t1, r1) = self.trace[i - 1], self.trace[i]
+        return r0 + (r1 - r0) * (t - t0) / (t1 - t0)
+    
+    def start(self):
+        self.manager.schedule(0, self._tick)
+    
+    def _tick(self):
+        manager = self.manager
+        deployment = manager.store.get("Deployment", manager.namespace, self.deployment)
+        if deployment is None:
+            return
+        
+        rps = self.rate_at(manager.clock.now())
+        pods = manager.store.list("Pod", manager.namespace, deployment["spec"]["selector"]["matchLabels"])
+        ready = sum(1 for p in pods if p["status"]["phase"] == "Running")
+        capacity = ready * self.pod_capacity_rps
+        
+        if ready:
+            per_pod = rps / ready
+            labels = (("deployment", self.deployment),)
+            # CPU relative to the request; the limit allows bursting to 200%
+            cpu = self.idle_cpu + (100.0 - self.idle_cpu) * per_pod / self.pod_capacity_rps
+            manager.metrics.gauge(_series_name("pod_cpu_utilization", labels), min(200.0, cpu))
+            manager.metrics.gauge(_series_name("http_requests_per_second", labels), per_pod)
+        
+        self.stats["pod_seconds"] += len(pods) * self.interval
+        self.stats["served_requests"] += min(rps, capacity) * self.interval
+        self.stats["max_pods"] = max(self.stats["max_pods"], len(pods))
+        if rps > capacity:
+            self.stats["overloaded_seconds"] += self.interval
+            self.stats["dropped_requests"] += (rps - capacity) * self.interval
+        
+        manager.schedule(self.interval, self._tick)
+
+# Autoscaling simulation demonstration
+print("Autoscaling controller örnekleri:")
+
+async def autoscaling_demo():
+    k8s_gen = KubernetesManifestGenerator()
+    app_name = "python-web-app"
+    
+    # A day of traffic: night low, daytime plateau, a lunchtime spike, noise
+    rng = np.random.default_rng(7)
+    trace = []
+    for minute in range(0, 24 * 60 + 1, 5):
+        hour = minute / 60
+        rps = 150 + 650 * max(0.0, np.sin((hour - 6) / 15 * np.pi))
+        if 12 <= hour < 12.5:
+            rps += 900
+        trace.append((minute * 60.0, max(0.0, rps * rng.normal(1.0, 0.05))))
+    
+    configurations = {
+        "default behavior": None,
+        "fast scale-down": {"scaleDown": {"stabilizationWindowSeconds": 60, "selectPolicy": "Max",
+                                          "policies": [{"type": "Pods", "value": 2, "periodSeconds": 60}]}},
+    }
+    
+    for label, behavior in configurations.items():
+        clock = VirtualClock()
+        metrics = MetricsCollector(clock=clock.now)
+        cluster = KubernetesCluster()
+        manager = ControllerManager(cluster, metrics, clock, pod_startup_seconds=30.0)
+        
+        await cluster.apply_manifest(k8s_gen.generate_deployment(app_name, "myapp/web:v1.0.0", replicas=2))
+        await cluster.apply_manifest(k8s_gen.generate_hpa(app_name, min_replicas=2, max_replicas=20,
+                                                          cpu_threshold=70, rps_target=75,
+                                                          behavior=behavior))
+        
+        # Idle CPU keeps the two metrics apart, so each drives part of the scaling
+        replay = TrafficReplay(manager, f"{app_name}-deployment", trace,
+                               pod_capacity_rps=120.0, idle_cpu=25.0)
+        replay.start()
+        
+        # Roll out a new image mid-day; the HPA keeps scaling during the rollout
+        def rollout():
+            deployment = cluster.get_resource("Deployment", f"{app_name}-deployment")
+            updated = copy.deepcopy(deployment)
+            updated["spec"]["template"]["spec"]["containers"][0]["image"] = "myapp/web:v1.1.0"
+            cluster.store.put("Deployment", "default", updated)
+        manager.schedule(15 * 3600, rollout)
+        
+        start = time.perf_counter()
+        await manager.run(until=24 * 3600)
+        elapsed = time.perf_counter() - start
+        
+        stats = replay.stats
+        total = stats["served_requests"] + stats["dropped_requests"]
+        print(f"\n📊 {label}: 24h replayed in {elapsed:.2f}s ({24 * 3600 / elapsed:,.0f}x real time)")
+        print(f"  Scale events: {len(manager.scale_events)}, reconciles: {manager.reconciles}")
+        drivers = defaultdict(int)
+        for event in manager.scale_events:
+            drivers[event["driven_by"]] += 1
+        print(f"  Scaling driven by: {dict(drivers)}")
+        print(f"  Max pods: {stats['max_pods']}, pod-hours: {stats['pod_seconds'] / 3600:.1f}")
+        print(f"  Overloaded: {stats['overloaded_seconds'] / 60:.0f} min, "
+              f"dropped: {stats['dropped_requests'] / total:.2%} of requests")
+        for event in manager.scale_events[:4]:
+            hours, rest = divmod(int(event["time"]), 3600)
+            print(f"  {hours:02d}:{rest // 60:02d} {event['from']} -> {event['to']} pods {event['metrics']}")
+        replicasets = cluster.list_resources("ReplicaSet", "default")
+        print(f"  ReplicaSets: {[(rs['metadata']['name'], rs['spec']['replicas']) for rs in replicasets]}")
+
+# Run autoscaling demo
+asyncio.run(autoscaling_demo())
+
 # =============================================================================
 # 4. CI/CD PIPELINE
 # =============================================================================
@@ -1217,10 +2690,14 @@ class PipelineStep:
     name: str
     stage: PipelineStage
     script: List[str]
-    depends_on: List[str] = field(default_factory=list)
+    # None waits for the previous stage; [] means no dependencies at all
+    depends_on: Optional[List[str]] = None
     environment: Dict[str, str] = field(default_factory=dict)
     timeout: int = 300  # 5 minutes default
     retry_count: int = 0
+    estimated_duration: Optional[float] = None  # seconds, used for scheduling priority
+    inputs: Optional[List[str]] = None  # file globs; None disables caching for the step
+    artifacts: List[str] = field(default_factory=list)  # paths the step produces
     
 @dataclass
 class PipelineExecution:
@@ -1264,6 +2741,16 @@ class GitOpsRepository:
         print(f"📝 Commit created: {commit_id} - {message}")
         return commit_id
     
+    def tree(self, commit_id: str) -> Dict[str, str]:
+        """Full file tree at a commit (commits only store the files they changed)"""
+        commit = self.commits[commit_id]
+        files = {}
+        for cid in self.branches[commit["branch"]]:
+            files.update(self.commits[cid]["files"])
+            if cid == commit_id:
+                break
+        return files
+    
     def get_latest_commit(self, branch: str = None) -> Optional[dict]:
         """Get latest commit"""
         branch = branch or self.current_branch
@@ -1281,15 +2768,128 @@ class GitOpsRepository:
             return True
         return False
 
+class StepCache:
+    """Content-addressed on-disk cache of step outputs with an LRU size limit"""
+    
+    # Temp files older than this were left by a writer that died before os.replace
+    ORPHAN_TMP_AGE = 3600.0
+    
+    def __init__(self, cache_dir: str, max_bytes: int = 50 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        # path -> size, least recently used first; the directory is scanned once
+        self._entries: OrderedDict = OrderedDict()
+        self._total = 0
+        self._load_index()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def _load_index(self):
+        entries = []
+        now = time.time()
+        for item in os.scandir(self.cache_dir):
+            try:
+                stat = item.stat()
+                if item.name.endswith(".tmp"):
+                    if now - stat.st_mtime > self.ORPHAN_TMP_AGE:
+                        os.remove(item.path)
+                elif item.name.endswith(".json"):
+                    entries.append((stat.st_mtime_ns, item.path, stat.st_size))
+            except OSError:
+                continue  # removed concurrently
+        
+        for _, path, size in sorted(entries):  # mtime is the LRU clock across runs
+            self._record(path, size)
+    
+    def _record(self, path: str, size: int):
+        """Insert or refresh an entry as most recently used"""
+        self._total += size - self._entries.pop(path, 0)
+        self._entries[path] = size
+    
+    def get(self, key: str) -> Optional[dict]:
+        """Stored entry, or None; a hit refreshes the entry's LRU position"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+                size = os.fstat(f.fileno()).st_size
+            os.utime(path)  # persist the LRU position for the next run
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self._record(path, size)
+        self.hits += 1
+        return entry
+    
+    def put(self, key: str, entry: dict):
+        """Store atomically, then evict least recently used entries over the limit"""
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+                f.flush()
+                size = os.fstat(f.fileno()).st_size
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._record(path, size)
+        self._evict(keep=path)
+    
+    def _evict(self, keep: str):
+        # Walk from the LRU end only while over the limit; never drop `keep`
+        victims = []
+        total = self._total
+        for path, size in self._entries.items():
+            if total <= self.max_bytes:
+                break
+            if path != keep:
+                victims.append(path)
+                total -= size
+        
+        for path in victims:
+            self._total -= self._entries.pop(path)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    
+    def size(self) -> int:
+        return self._total
+
 class CICDPipeline:
-    """CI/CD Pipeline implementation"""
+    """CI/CD Pipeline implementation
+    
+    Steps form a DAG: a step runs once everything in ``depends_on`` succeeded.
+    Steps with depends_on=None wait for all steps of the previous stage,
+    which keeps the classic build -> test -> deploy ordering; an explicit
+    empty list lets a step start right away.
+    """
     
-    def __init__(self, repository: GitOpsRepository):
+    STAGE_ORDER = [PipelineStage.BUILD, PipelineStage.TEST,
+                   PipelineStage.SECURITY, PipelineStage.DEPLOY,
+                   PipelineStage.VERIFY]
+    
+    def __init__(self, repository: GitOpsRepository, max_workers: int = 4, fail_fast: bool = True,
+                 cache: StepCache = None):
         self.repository = repository
+        self.cache = cache
+        self.artifacts: Dict[str, str] = {}  # workspace: artifact path -> content
         self.steps: List[PipelineStep] = []
         self.executions: List[PipelineExecution] = []
         self.environment_vars = {}
         self.secrets = {}
+        self.max_workers = max_workers
+        self.fail_fast = fail_fast
+        self.step_durations: Dict[str, float] = {}  # last successful run time per step
     
     def add_step(self, step: PipelineStep):
         """Add pipeline step"""
@@ -1304,8 +2904,72 @@ class CICDPipeline:
         """Set secrets"""
         self.secrets.update(secrets)
     
+    def _dependency_graph(self) -> Dict[str, List[str]]:
+        """Resolve each step's dependencies (explicit or previous-stage barrier)"""
+        names = {step.name for step in self.steps}
+        stage_steps = defaultdict(list)
+        for step in self.steps:
+            stage_steps[step.stage].append(step.name)
+        
+        graph = {}
+        for step in self.steps:
+            if step.depends_on is not None:
+                unknown = [dep for dep in step.depends_on if dep not in names]
+                if unknown:
+                    raise ValueError(f"Step '{step.name}' depends on unknown steps: {unknown}")
+                graph[step.name] = list(step.depends_on)
+                continue
+            
+            previous = []
+            for stage in self.STAGE_ORDER[:self.STAGE_ORDER.index(step.stage)]:
+                if stage_steps[stage]:
+                    previous = stage_steps[stage]
+            graph[step.name] = list(previous)
+        
+        # Cycle detection (DFS with an explicit path for the error message)
+        state = {}
+        
+        def visit(name: str, path: List[str]):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                cycle = path[path.index(name):] + [name]
+                raise ValueError(f"Circular step dependency detected: {' -> '.join(cycle)}")
+            state[name] = "visiting"
+            for dep in graph[name]:
+                visit(dep, path + [name])
+            state[name] = "done"
+        
+        for name in graph:
+            visit(name, [])
+        
+        return graph
+    
+    def _critical_path_ranks(self, graph: Dict[str, List[str]]) -> Dict[str, float]:
+        """Longest estimated time from each step's start to the end of the pipeline"""
+        steps = {step.name: step for step in self.steps}
+        dependents = defaultdict(list)
+        for name, deps in graph.items():
+            for dep in deps:
+                dependents[dep].append(name)
+        
+        ranks = {}
+        
+        def rank(name: str) -> float:
+            if name not in ranks:
+                step = steps[name]
+                estimate = (self.step_durations.get(name)
+                            or step.estimated_duration
+                            or 0.1 * len(step.script))
+                ranks[name] = estimate + max((rank(d) for d in dependents[name]), default=0.0)
+            return ranks[name]
+        
+        for name in graph:
+            rank(name)
+        return ranks
+    
     async def run_pipeline(self, commit_id: str) -> Dict[str, Any]:
-        """Run complete pipeline"""
+        """Run complete pipeline, scheduling independent steps concurrently"""
         print(f"\n🚀 Starting CI/CD Pipeline for commit: {commit_id}")
         print(f"{'='*60}")
         
@@ -1313,50 +2977,157 @@ class CICDPipeline:
         if not commit:
             return {"error": "Commit not found"}
         
-        pipeline_start = datetime.utcnow()
-        results = {"commit": commit_id, "steps": [], "overall_status": "success"}
+        graph = self._dependency_graph()
+        ranks = self._critical_path_ranks(graph)
+        steps = {step.name: step for step in self.steps}
+        order = {step.name: i for i, step in enumerate(self.steps)}
+        dependents = defaultdict(list)
+        for name, deps in graph.items():
+            for dep in deps:
+                dependents[dep].append(name)
+        remaining = {name: len(deps) for name, deps in graph.items()}
         
-        # Group steps by stage
-        stages = defaultdict(list)
-        for step in self.steps:
-            stages[step.stage].append(step)
-        
-        # Execute stages in order
-        stage_order = [PipelineStage.BUILD, PipelineStage.TEST, 
-                      PipelineStage.SECURITY, PipelineStage.DEPLOY, 
-                      PipelineStage.VERIFY]
-        
-        for stage in stage_order:
-            if stage not in stages:
-                continue
+        pipeline_start = datetime.utcnow()
+        loop_start = time.perf_counter()
+        results = {"commit": commit_id, "steps": [], "overall_status": "success",
+                   "max_workers": self.max_workers}
+        
+        ready = []  # heap of (-critical path rank, definition order, name)
+        ready_at = {}
+        for name, count in remaining.items():
+            if count == 0:
+                heapq.heappush(ready, (-ranks[name], order[name], name))
+                ready_at[name] = loop_start
+        
+        running: Dict[asyncio.Task, tuple] = {}  # task -> (name, queue_time)
+        finished = set()
+        failed = False
+        
+        def skip(name: str, reason: str):
+            if name in finished:
+                return
+            finished.add(name)
+            results["steps"].append({
+                "step_name": name, "stage": steps[name].stage.value, "status": "skipped",
+                "queue_time": 0.0, "duration": 0.0, "output": reason, "exit_code": -1
+            })
+            print(f"⏭️ {name} skipped ({reason})")
+        
+        def skip_dependents(name: str):
+            for dependent in dependents[name]:
+                if dependent not in finished:
+                    skip(dependent, f"dependency '{name}' did not succeed")
+                    skip_dependents(dependent)
+        
+        while ready or running:
+            while ready and len(running) < self.max_workers and not (failed and self.fail_fast):
+                _, _, name = heapq.heappop(ready)
+                queue_time = time.perf_counter() - ready_at[name]
+                task = asyncio.create_task(self._execute_step(steps[name], commit))
+                running[task] = (name, queue_time)
             
-            print(f"\n📋 Stage: {stage.value.upper()}")
-            print(f"{'-'*40}")
+            if not running:
+                break
             
-            # Execute all steps in current stage
-            stage_success = True
-            for step in stages[stage]:
-                execution = await self._execute_step(step, commit)
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name, queue_time = running.pop(task)
+                finished.add(name)
+                
+                if task.cancelled():
+                    execution = {"step_name": name, "stage": steps[name].stage.value,
+                                 "status": "cancelled", "duration": 0.0,
+                                 "output": "Cancelled after another step failed", "exit_code": -1}
+                    print(f"🛑 {name} cancelled")
+                else:
+                    execution = task.result()
+                execution["queue_time"] = queue_time
                 results["steps"].append(execution)
                 
-                if execution.status != "success":
-                    stage_success = False
-                    results["overall_status"] = "failed"
-                    break
-            
-            # Stop pipeline if stage failed
-            if not stage_success:
-                break
+                if execution["status"] == "success":
+                    if not execution.get("cache_hit"):
+                        self.step_durations[name] = execution["duration"]
+                    for dependent in dependents[name]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0:
+                            heapq.heappush(ready, (-ranks[dependent], order[dependent], dependent))
+                            ready_at[dependent] = time.perf_counter()
+                    continue
+                
+                results["overall_status"] = "failed"
+                skip_dependents(name)
+                if self.fail_fast and not failed:
+                    failed = True
+                    for other in running:
+                        other.cancel()
+        
+        # Anything never started (fail fast) is reported as skipped
+        for step in self.steps:
+            skip(step.name, "pipeline stopped after failure")
         
         pipeline_end = datetime.utcnow()
         results["duration"] = (pipeline_end - pipeline_start).total_seconds()
+        results["critical_path"] = self._critical_path(graph, ranks)
         
         self._print_pipeline_summary(results)
         
         return results
     
+    def _critical_path(self, graph: Dict[str, List[str]], ranks: Dict[str, float]) -> List[str]:
+        """Follow the highest-rank chain from the roots to a sink"""
+        dependents = defaultdict(list)
+        for name, deps in graph.items():
+            for dep in deps:
+                dependents[dep].append(name)
+        roots = [name for name, deps in graph.items() if not deps]
+        if not roots:
+            return []
+        path = [max(roots, key=ranks.get)]
+        while dependents[path[-1]]:
+            path.append(max(dependents[path[-1]], key=ranks.get))
+        return path
+    
+    def _cache_key(self, step: PipelineStep, commit: dict) -> str:
+        """Hash of everything that can change the step's result"""
+        tree = self.repository.tree(commit["id"])
+        digest = hashlib.sha256()
+        digest.update(json.dumps([step.name, step.script, step.artifacts]).encode())
+        
+        for path in sorted(tree):
+            if any(fnmatch.fnmatch(path, pattern) for pattern in step.inputs):
+                digest.update(path.encode() + b"\0")
+                digest.update(hashlib.sha256(tree[path].encode()).digest())
+        
+        env = {**self.environment_vars, **step.environment}
+        digest.update(json.dumps(sorted(env.items())).encode())
+        # Secrets change results too, but only their hashes are mixed in
+        for name in sorted(self.secrets):
+            digest.update(name.encode() + hashlib.sha256(self.secrets[name].encode()).digest())
+        
+        return digest.hexdigest()
+    
     async def _execute_step(self, step: PipelineStep, commit: dict) -> dict:
         """Execute individual pipeline step"""
+        cache_key = None
+        if self.cache is not None and step.inputs is not None:
+            cache_key = self._cache_key(step, commit)
+            entry = self.cache.get(cache_key)
+            if entry is not None:
+                self.artifacts.update(entry["artifacts"])
+                now = datetime.utcnow()
+                print(f"♻️ {step.name} (cache hit {cache_key[:12]})")
+                return {
+                    "step_name": step.name,
+                    "stage": step.stage.value,
+                    "status": "success",
+                    "start_time": now.isoformat(),
+                    "end_time": now.isoformat(),
+                    "duration": 0.0,
+                    "output": entry["output"],
+                    "exit_code": 0,
+                    "cache_hit": True
+                }
+        
         print(f"🔄 Executing: {step.name}")
         
         start_time = datetime.utcnow()
@@ -1377,7 +3148,12 @@ class CICDPipeline:
                 output_lines.append(f"$ {script_line}")
                 
                 # Simulate different script outcomes
-                if "test" in script_line.lower():
+                if script_line.startswith("exit ") and script_line != "exit 0":
+                    exit_code = int(script_line.split()[1])
+                    output_lines.append(f"Process exited with code {exit_code}")
+                    break
+                
+                elif "test" in script_line.lower():
                     if "pytest" in script_line:
                         output_lines.append("===== test session starts =====")
                         output_lines.append("collected 15 items")
@@ -1401,7 +3177,11 @@ class CICDPipeline:
                 else:
                     output_lines.append("Command executed successfully")
             
-            status = "success"
+            status = "success" if exit_code == 0 else "failed"
+            produced = {}
+            if status == "success":
+                produced = {path: f"{step.name} output for {commit['id']}" for path in step.artifacts}
+                self.artifacts.update(produced)
             
         except Exception as e:
             output_lines.append(f"Error: {str(e)}")
@@ -1419,9 +3199,13 @@ class CICDPipeline:
             "end_time": end_time.isoformat(),
             "duration": duration.total_seconds(),
             "output": "\n".join(output_lines),
-            "exit_code": exit_code
+            "exit_code": exit_code,
+            "cache_hit": False
         }
         
+        if cache_key is not None and status == "success":
+            self.cache.put(cache_key, {"output": execution["output"], "artifacts": produced})
+        
         status_icon = "✅" if status == "success" else "❌"
         print(f"{status_icon} {step.name} ({duration.total_seconds():.2f}s)")
         
@@ -1433,12 +3217,19 @@ class CICDPipeline:
         print(f"{'='*60}")
         print(f"Commit: {results['commit']}")
         print(f"Overall Status: {results['overall_status'].upper()}")
-        print(f"Duration: {results['duration']:.2f}s")
+        print(f"Duration: {results['duration']:.2f}s (max {results['max_workers']} parallel steps)")
+        print(f"Critical Path: {' -> '.join(results['critical_path'])}")
+        
+        if self.cache is not None:
+            cached = sum(1 for step in results["steps"] if step.get("cache_hit"))
+            print(f"Cache: {cached} step(s) replayed, {self.cache.size() / 1024:.1f} KB on disk")
         
+        status_icons = {"success": "✅", "failed": "❌", "cancelled": "🛑", "skipped": "⏭️"}
         print(f"\nStep Results:")
         for step in results["steps"]:
-            status_icon = "✅" if step["status"] == "success" else "❌"
-            print(f"{status_icon} {step['step_name']} ({step['stage']}) - {step['duration']:.2f}s")
+            status_icon = "♻️" if step.get("cache_hit") else status_icons.get(step["status"], "❌")
+            print(f"{status_icon} {step['step_name']} ({step['stage']}) - "
+                  f"queued {step['queue_time']:.2f}s, ran {step['duration']:.2f}s")
 
 # =============================================================================
 # 5. INFRASTRUCTURE AS CODE
@@ -1704,6 +3495,40 @@ async def devops_comprehensive_demo():
             metrics.counter("http_errors_total", labels={"method": "GET", "status": "500"})
             logger.error("Database connection failed", error_code="DB001")
     
+    # Slow or failing sinks run on the dispatcher, not on the request path
+    def slow_shipper(log_entry: LogEntry):
+        time.sleep(0.002)  # e.g. a network log shipper
+        shipped.append(log_entry)
+    
+    def broken_sink(log_entry: LogEntry):
+        raise ConnectionError("log collector unreachable")
+    
+    shipped: List[LogEntry] = []
+    dispatcher = LogDispatcher(batch_size=64).start()
+    shipping_logger = StructuredLogger("web-app.requests", dispatcher=dispatcher)
+    shipping_logger.add_handler(broken_sink)
+    shipping_logger.add_handler(slow_shipper)
+    
+    start = time.perf_counter()
+    for i in range(100):
+        shipping_logger.info("Request served", request_id=i)
+    print(f"100 log calls with a 2ms sink: {(time.perf_counter() - start) * 1000:.2f}ms on the caller")
+    dispatcher.close()
+    print(f"Shipped: {len(shipped)}, handler errors: {dict(dispatcher.handler_errors)}")
+    
+    # Same fan-out from an asyncio task, with an async handler
+    async def async_shipper(log_entry: LogEntry):
+        await asyncio.sleep(0)
+        shipped.append(log_entry)
+    
+    async_dispatcher = LogDispatcher().start_async()
+    async_logger = StructuredLogger("web-app.async", dispatcher=async_dispatcher)
+    async_logger.add_handler(async_shipper)
+    for i in range(10):
+        async_logger.warning("Slow query", query_id=i)
+    await async_dispatcher.aclose()
+    print(f"Shipped after async dispatcher: {len(shipped)}")
+    
     # Memory and CPU metrics
     metrics.gauge("memory_usage_percent", 75.5)
     metrics.gauge("cpu_usage_percent", 45.2)
@@ -1714,12 +3539,81 @@ async def devops_comprehensive_demo():
     # Create alerts
     dashboard.create_alert("High Error Rate", "http_errors_total", 5, "greater_than")
     dashboard.create_alert("High Memory Usage", "memory_usage_percent", 80, "greater_than")
+    dashboard.create_alert("Slow p99 Latency", "http_request_duration", 0.5, "greater_than",
+                           aggregation="p99", window_seconds=300)
+    
+    for alert in dashboard.check_alerts():
+        print(f"🔥 {alert['name']}: {alert['current_value']:.2f}")
+    
+    # Thousands of rules over a few series, evaluated in one vectorized pass
+    rule_dashboard = MonitoringDashboard(metrics)
+    for i in range(5000):
+        rule_dashboard.create_alert(
+            f"rule-{i}", ["http_request_duration", "http_requests_total", "memory_usage_percent"][i % 3],
+            threshold=i / 1000, aggregation=["avg", "rate", "p95", "latest"][i % 4],
+            window_seconds=[60, 300][i % 2], verbose=False
+        )
+    rule_dashboard.check_alerts()  # compile
+    start = time.perf_counter()
+    triggered = rule_dashboard.check_alerts()
+    print(f"5000 alert rules evaluated in {(time.perf_counter() - start) * 1000:.2f}ms "
+          f"({len(triggered)} triggered)")
     
     # Get dashboard data
     dashboard_data = dashboard.get_dashboard_data()
     print(f"\nSystem Health Score: {dashboard_data['system_health']['score']}/100")
     print(f"Status: {dashboard_data['system_health']['status']}")
     
+    # Export metrics to local stand-in receivers
+    print("\n--- Metrics Export ---")
+    statsd_receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    statsd_receiver.bind(("127.0.0.1", 0))
+    statsd_receiver.settimeout(1.0)
+    export_dir = tempfile.mkdtemp(prefix="metrics_export_")
+    
+    prometheus_exporter = PrometheusHTTPExporter()
+    statsd_exporter = StatsDExporter(*statsd_receiver.getsockname(), prefix="webapp.", dogstatsd=True)
+    file_exporter = RotatingFileExporter(os.path.join(export_dir, "metrics.jsonl"), max_bytes=512)
+    export_pipeline = MetricsExportPipeline(
+        metrics, [prometheus_exporter, statsd_exporter, file_exporter], window_seconds=0.05
+    )
+    export_pipeline.start()
+    
+    for i in range(200):
+        metrics.counter("http_requests_total")
+        if i % 50 == 0:
+            await asyncio.sleep(0.06)
+    await asyncio.sleep(0.06)
+    
+    def scrape() -> str:
+        import urllib.request
+        url = f"http://{prometheus_exporter.host}:{prometheus_exporter.port}/metrics"
+        with urllib.request.urlopen(url, timeout=2) as response:
+            return response.read().decode("utf-8")
+    
+    scraped = await asyncio.to_thread(scrape)
+    print(f"Scraped series: {[line for line in scraped.splitlines() if line.startswith('http_requests_total')]}")
+    
+    export_pipeline.stop()
+    
+    packets = []
+    try:
+        while True:
+            packets.append(statsd_receiver.recv(65535).decode("utf-8"))
+            statsd_receiver.settimeout(0.1)
+    except socket.timeout:
+        pass
+    statsd_receiver.close()
+    counter_lines = [line for packet in packets for line in packet.splitlines()
+                     if line.startswith("webapp.http_requests_total")]
+    print(f"StatsD packets: {len(packets)}, request deltas: {counter_lines}")
+    
+    export_files = sorted(os.listdir(export_dir))
+    print(f"Rotated snapshot files: {export_files}")
+    for name in export_files:
+        os.remove(os.path.join(export_dir, name))
+    os.rmdir(export_dir)
+    
     # 2. CI/CD Pipeline
     print(f"\n--- CI/CD Pipeline ---")
     
@@ -1734,8 +3628,9 @@ async def devops_comprehensive_demo():
         "tests/test_app.py": "# Test files"
     })
     
-    # Setup CI/CD pipeline
-    pipeline = CICDPipeline(repo)
+    # Setup CI/CD pipeline (steps declaring inputs are cached by content hash)
+    cache_dir = tempfile.mkdtemp(prefix="ci_step_cache_")
+    pipeline = CICDPipeline(repo, cache=StepCache(cache_dir, max_bytes=256 * 1024))
     
     # Set environment
     pipeline.set_environment({
@@ -1748,6 +3643,7 @@ async def devops_comprehensive_demo():
     pipeline.add_step(PipelineStep(
         name="Code Quality Check",
         stage=PipelineStage.BUILD,
+        inputs=["*.py", "setup.cfg"],
         script=[
             "echo 'Running code quality checks...'",
             "black --check .",
@@ -1759,6 +3655,9 @@ async def devops_comprehensive_demo():
     pipeline.add_step(PipelineStep(
         name="Unit Tests",
         stage=PipelineStage.TEST,
+        depends_on=["Code Quality Check"],
+        inputs=["*.py", "requirements.txt"],
+        artifacts=["coverage.xml"],
         script=[
             "echo 'Installing dependencies...'",
             "pip install -r requirements.txt",
@@ -1770,6 +3669,8 @@ async def devops_comprehensive_demo():
     pipeline.add_step(PipelineStep(
         name="Security Scan",
         stage=PipelineStage.SECURITY,
+        depends_on=["Code Quality Check"],  # runs alongside the unit tests
+        inputs=["*.py", "requirements.txt"],
         script=[
             "echo 'Running security scan...'",
             "pip install safety bandit",
@@ -1781,6 +3682,8 @@ async def devops_comprehensive_demo():
     pipeline.add_step(PipelineStep(
         name="Build Docker Image",
         stage=PipelineStage.BUILD,
+        inputs=["*.py", "requirements.txt", "Dockerfile"],
+        artifacts=["image.tar"],
         script=[
             "echo 'Building Docker image...'",
             "docker build -t $APP_NAME:$BUILD_NUMBER .",
@@ -1792,6 +3695,7 @@ async def devops_comprehensive_demo():
     pipeline.add_step(PipelineStep(
         name="Deploy to Production",
         stage=PipelineStage.DEPLOY,
+        depends_on=["Unit Tests", "Security Scan", "Build Docker Image"],
         script=[
             "echo 'Deploying to production...'",
             "kubectl apply -f k8s/",
@@ -1812,6 +3716,25 @@ async def devops_comprehensive_demo():
     # Run pipeline
     pipeline_result = await pipeline.run_pipeline(commit_id)
     
+    # Docs-only change: build/test/scan replay from the cache, deploy steps still run
+    docs_commit_id = repo.commit("Update README", {"README.md": "# Python Web App"})
+    await pipeline.run_pipeline(docs_commit_id)
+    print(f"Artifacts in workspace: {sorted(pipeline.artifacts)}")
+    
+    for name in os.listdir(cache_dir):
+        os.remove(os.path.join(cache_dir, name))
+    os.rmdir(cache_dir)
+    
+    # Fail fast: a failing step cancels running work and skips its dependents
+    failing_pipeline = CICDPipeline(repo, max_workers=2)
+    failing_pipeline.add_step(PipelineStep(name="Lint", stage=PipelineStage.BUILD,
+                                           script=["flake8 .", "exit 1"]))
+    failing_pipeline.add_step(PipelineStep(name="Compile", stage=PipelineStage.BUILD,
+                                           script=["make build"] * 4))
+    failing_pipeline.add_step(PipelineStep(name="Integration Tests", stage=PipelineStage.TEST,
+                                           script=["pytest tests/integration"]))
+    await failing_pipeline.run_pipeline(commit_id)
+    
     # 3. Infrastructure as Code
     print(f"\n--- Infrastructure as Code ---")
     
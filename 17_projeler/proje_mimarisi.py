@@ -8,17 +8,23 @@ proje organizasyonu, dependency injection ve configuration management incelenece
 
 import os
 import json
+import inspect
 import logging
 import asyncio
+import typing
+import contextvars
 from pathlib import Path
+from types import MappingProxyType
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, Protocol, TypeVar, Generic
+from typing import Dict, List, Optional, Any, Protocol, TypeVar, Generic, Callable, Tuple, Mapping, Set
 from dataclasses import dataclass, field
 from contextlib import asynccontextmanager
 from functools import lru_cache
 import threading
 from enum import Enum
 import uuid
+import weakref
+import time
 from datetime import datetime
 
 # =============================================================================
@@ -196,13 +202,104 @@ class ServiceDescriptor:
     instance: Optional[Any] = None
     factory: Optional[callable] = None
 
+class ServiceScope:
+    """Scope holding scoped instances in a slot array (one slot per scoped service)"""
+    
+    def __init__(self, container: 'DIContainer', scope_id: str = None):
+        self.container = container
+        self.scope_id = scope_id or str(uuid.uuid4())
+        self.slots: List[Any] = [None] * len(container._scope_slots)
+        self.created_at = time.monotonic()
+        self.disposed = False
+        self._instances: List[Any] = []  # creation order, disposed in reverse
+        self._token = None
+    
+    def resolve(self, service_type: type) -> Any:
+        """Resolve service within this scope"""
+        return self.container.resolve(service_type, self)
+    
+    def _get_or_create(self, slot: int, create: Callable) -> Any:
+        if self.disposed:
+            raise RuntimeError(f"Scope {self.scope_id} is already disposed")
+        
+        slots = self.slots
+        if slot >= len(slots):
+            # Service registered after the scope was created
+            slots.extend([None] * (slot + 1 - len(slots)))
+        
+        instance = slots[slot]
+        if instance is None:
+            instance = slots[slot] = create(self)
+            self._instances.append(instance)
+        return instance
+    
+    def _release(self) -> List[Any]:
+        instances = self._instances[::-1]
+        self._instances = []
+        self.slots = []
+        self.disposed = True
+        self.container._scopes.pop(self.scope_id, None)
+        return instances
+    
+    def dispose(self):
+        """Dispose scoped instances (async dispose hooks need 'async with')"""
+        if self.disposed:
+            return
+        for instance in self._release():
+            if hasattr(instance, 'dispose'):
+                result = instance.dispose()
+                if inspect.isawaitable(result):
+                    result.close()
+                    print(f"⚠️  Async dispose of {type(instance).__name__} skipped, use 'async with'")
+    
+    async def dispose_async(self):
+        """Dispose scoped instances, awaiting async dispose hooks"""
+        if self.disposed:
+            return
+        for instance in self._release():
+            if hasattr(instance, 'dispose'):
+                result = instance.dispose()
+                if inspect.isawaitable(result):
+                    await result
+    
+    def __enter__(self) -> 'ServiceScope':
+        self._token = self.container._current_scope.set(self)
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            self.dispose()
+        finally:
+            self.container._current_scope.reset(self._token)
+    
+    async def __aenter__(self) -> 'ServiceScope':
+        return self.__enter__()
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            await self.dispose_async()
+        finally:
+            self.container._current_scope.reset(self._token)
+
 class DIContainer:
     """Dependency Injection Container"""
     
     def __init__(self):
         self._services: Dict[type, ServiceDescriptor] = {}
-        self._scoped_instances: Dict[str, Dict[type, Any]] = {}
-        self._lock = threading.Lock()
+        # Live scopes by id; entries leave on dispose
+        self._scopes: Dict[str, ServiceScope] = {}
+        # Scoped service type -> index into ServiceScope.slots
+        self._scope_slots: Dict[type, int] = {}
+        # Scope bound to the current thread / asyncio task
+        self._current_scope: contextvars.ContextVar = contextvars.ContextVar(
+            f"di_scope_{id(self)}", default=None
+        )
+        # Compiled resolution plans: service type -> plan(scope)
+        self._plans: Dict[type, Callable[[Optional[ServiceScope]], Any]] = {}
+        # Compiled types whose plan needs a scope (scoped, or depends on one)
+        self._scope_bound: Set[type] = set()
+        # Re-entrant: creating a singleton may resolve other singletons
+        self._lock = threading.RLock()
     
     def register_singleton(self, service_type: type, implementation: type = None):
         """Register singleton service"""
@@ -212,6 +309,8 @@ class DIContainer:
             implementation=impl,
             lifetime=ServiceLifetime.SINGLETON
         )
+        self._plans.clear()
+        self._scope_bound.clear()
         print(f"📝 Registered singleton: {service_type.__name__}")
         return self
     
@@ -223,6 +322,8 @@ class DIContainer:
             implementation=impl,
             lifetime=ServiceLifetime.TRANSIENT
         )
+        self._plans.clear()
+        self._scope_bound.clear()
         print(f"📝 Registered transient: {service_type.__name__}")
         return self
     
@@ -234,6 +335,8 @@ class DIContainer:
             implementation=impl,
             lifetime=ServiceLifetime.SCOPED
         )
+        self._plans.clear()
+        self._scope_bound.clear()
         print(f"📝 Registered scoped: {service_type.__name__}")
         return self
     
@@ -245,81 +348,165 @@ class DIContainer:
             lifetime=ServiceLifetime.TRANSIENT,
             factory=factory
         )
+        self._plans.clear()
+        self._scope_bound.clear()
         print(f"📝 Registered factory: {service_type.__name__}")
         return self
     
+    def build(self) -> 'DIContainer':
+        """Compile resolution plans for all services (detects cycles up front)"""
+        with self._lock:
+            for service_type in list(self._services):
+                self._compile_plan(service_type, ())
+        print(f"🧩 Compiled {len(self._plans)} resolution plans")
+        return self
+    
     def resolve(self, service_type: type, scope_id: str = None) -> T:
-        """Resolve service instance"""
+        """Resolve service instance (scope_id may be an id, a ServiceScope or omitted)"""
+        plan = self._plans.get(service_type)
+        if plan is None:
+            with self._lock:
+                plan = self._compile_plan(service_type, ())
+        
+        if scope_id is None or isinstance(scope_id, ServiceScope):
+            return plan(scope_id)
+        
+        scope = self._scopes.get(scope_id)
+        if scope is None:
+            raise ValueError(f"Unknown or disposed scope: {scope_id} (use create_scope first)")
+        return plan(scope)
+    
+    @staticmethod
+    def _constructor_dependencies(implementation: type) -> List[Tuple[str, type]]:
+        """Annotated constructor parameters as (name, type), read once per plan"""
+        init = implementation.__init__
+        try:
+            hints = typing.get_type_hints(init)
+        except Exception:
+            hints = getattr(init, '__annotations__', {})
+        
+        dependencies = []
+        for param_name, param in inspect.signature(init).parameters.items():
+            if param_name == 'self' or param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                continue
+            if param.annotation != inspect.Parameter.empty:
+                dependencies.append((param_name, hints.get(param_name, param.annotation)))
+        return dependencies
+    
+    def _compile_plan(self, service_type: type, path: Tuple[type, ...]) -> Callable:
+        """Build a flat, cached resolution plan for service_type"""
+        plan = self._plans.get(service_type)
+        if plan is not None:
+            return plan
+        
+        if service_type in path:
+            cycle = " -> ".join(t.__name__ for t in path + (service_type,))
+            raise ValueError(f"Circular dependency detected: {cycle}")
+        
         if service_type not in self._services:
-            raise ValueError(f"Service {service_type.__name__} not registered")
+            raise ValueError(f"Service {getattr(service_type, '__name__', service_type)} not registered")
         
         descriptor = self._services[service_type]
         
         # Factory resolution
         if descriptor.factory:
-            return descriptor.factory(self)
+            factory = descriptor.factory
+            plan = lambda scope=None: factory(self)
+            self._plans[service_type] = plan
+            return plan
+        
+        # Dependencies are compiled first, so a plan is a tight loop of
+        # already-compiled factory calls
+        implementation = descriptor.implementation
+        dependency_types = self._constructor_dependencies(implementation)
+        dependencies = [
+            (param_name, self._compile_plan(dependency_type, path + (service_type,)))
+            for param_name, dependency_type in dependency_types
+        ]
+        
+        scope_bound = [t for _, t in dependency_types if t in self._scope_bound]
+        if descriptor.lifetime == ServiceLifetime.SINGLETON and scope_bound:
+            # The singleton would keep the first scope's instance alive forever
+            raise ValueError(
+                f"Captive dependency: singleton {service_type.__name__} depends on "
+                f"scoped {scope_bound[0].__name__}"
+            )
+        if descriptor.lifetime == ServiceLifetime.SCOPED or scope_bound:
+            self._scope_bound.add(service_type)
+        
+        if dependencies:
+            def create(scope: Optional[ServiceScope]):
+                return implementation(**{name: dependency(scope)
+                                         for name, dependency in dependencies})
+        else:
+            def create(scope: Optional[ServiceScope]):
+                return implementation()
         
         # Singleton resolution
         if descriptor.lifetime == ServiceLifetime.SINGLETON:
-            if descriptor.instance is None:
-                with self._lock:
-                    if descriptor.instance is None:
-                        descriptor.instance = self._create_instance(descriptor)
-            return descriptor.instance
+            def plan(scope: Optional[ServiceScope] = None):
+                if descriptor.instance is None:
+                    with self._lock:
+                        if descriptor.instance is None:
+                            descriptor.instance = create(scope)
+                return descriptor.instance
         
         # Scoped resolution
-        if descriptor.lifetime == ServiceLifetime.SCOPED:
-            if scope_id is None:
-                raise ValueError("Scope ID required for scoped services")
+        elif descriptor.lifetime == ServiceLifetime.SCOPED:
+            slot = self._scope_slots.setdefault(service_type, len(self._scope_slots))
+            current_scope = self._current_scope
             
-            if scope_id not in self._scoped_instances:
-                self._scoped_instances[scope_id] = {}
-            
-            if service_type not in self._scoped_instances[scope_id]:
-                instance = self._create_instance(descriptor)
-                self._scoped_instances[scope_id][service_type] = instance
-            
-            return self._scoped_instances[scope_id][service_type]
+            def plan(scope: Optional[ServiceScope] = None):
+                if scope is None:
+                    scope = current_scope.get()
+                    if scope is None:
+                        raise ValueError("Scope ID required for scoped services")
+                return scope._get_or_create(slot, create)
         
         # Transient resolution
-        return self._create_instance(descriptor)
-    
-    def _create_instance(self, descriptor: ServiceDescriptor):
-        """Create service instance with dependency injection"""
-        implementation = descriptor.implementation
-        
-        # Get constructor parameters
-        import inspect
-        signature = inspect.signature(implementation.__init__)
-        kwargs = {}
-        
-        for param_name, param in signature.parameters.items():
-            if param_name == 'self':
-                continue
-            
-            # Resolve dependencies
-            if param.annotation != inspect.Parameter.empty:
-                dependency = self.resolve(param.annotation)
-                kwargs[param_name] = dependency
+        else:
+            plan = create
         
-        return implementation(**kwargs)
-    
-    def create_scope(self) -> str:
-        """Create new scope"""
-        scope_id = str(uuid.uuid4())
-        self._scoped_instances[scope_id] = {}
-        return scope_id
+        self._plans[service_type] = plan
+        return plan
+    
+    def scope(self) -> ServiceScope:
+        """Scope for 'with' / 'async with'; bound to the current context while open"""
+        scope = ServiceScope(self)
+        self._scopes[scope.scope_id] = scope
+        return scope
+    
+    def current_scope(self) -> Optional[ServiceScope]:
+        """Scope bound to the current thread / task, if any"""
+        return self._current_scope.get()
+    
+    def create_scope(self, scope_id: str = None) -> str:
+        """Create new scope (resolve() only accepts ids of live scopes)"""
+        if scope_id is not None and scope_id in self._scopes:
+            raise ValueError(f"Scope {scope_id} already exists")
+        scope = ServiceScope(self, scope_id)
+        self._scopes[scope.scope_id] = scope
+        return scope.scope_id
     
     def dispose_scope(self, scope_id: str):
         """Dispose scope and cleanup instances"""
-        if scope_id in self._scoped_instances:
-            # Cleanup scoped instances if they have dispose method
-            for instance in self._scoped_instances[scope_id].values():
-                if hasattr(instance, 'dispose'):
-                    instance.dispose()
-            
-            del self._scoped_instances[scope_id]
+        scope = self._scopes.get(scope_id)
+        if scope is not None:
+            scope.dispose()
             print(f"🗑️  Disposed scope: {scope_id}")
+    
+    def leaked_scopes(self, max_age: float = 60.0) -> List[Dict[str, Any]]:
+        """Diagnostic: scopes still alive after max_age seconds"""
+        now = time.monotonic()
+        return [
+            {
+                "scope_id": scope.scope_id,
+                "age_seconds": round(now - scope.created_at, 3),
+                "instances": [type(instance).__name__ for instance in scope._instances]
+            }
+            for scope in list(self._scopes.values())
+            if now - scope.created_at >= max_age
+        ]
 
 # Example services for DI demonstration
 class IUserRepository(ABC):
@@ -384,6 +571,18 @@ class UserService(Injectable):
     def get_user(self, user_id: int) -> Optional[dict]:
         return self.user_repository.get_by_id(user_id)
 
+class RequestSession(Injectable):
+    """Scoped per-request resource with an async dispose hook"""
+    
+    def __init__(self, user_service: UserService):
+        self.user_service = user_service
+        self.closed = False
+    
+    async def dispose(self):
+        await asyncio.sleep(0)
+        self.closed = True
+        print("🔒 RequestSession closed")
+
 # Dependency injection demonstration
 print("Dependency injection container örnekleri:")
 
@@ -393,9 +592,15 @@ container = DIContainer()
 container.register_singleton(IUserRepository, UserRepository)
 container.register_transient(IEmailService, EmailService)
 container.register_scoped(UserService)
+container.register_scoped(RequestSession)
+
+# Compile resolution plans once (cycles and missing registrations fail here)
+container.build()
 
 # Resolve services
 print("\n1. Service resolution:")
+container.create_scope("scope1")
+container.create_scope("scope2")
 user_service1 = container.resolve(UserService, "scope1")
 user_service2 = container.resolve(UserService, "scope1")  # Same scope
 user_service3 = container.resolve(UserService, "scope2")  # Different scope
@@ -408,6 +613,66 @@ user = user_service1.get_user(1)
 print(f"User found: {user}")
 user_service1.notify_user(1, "Welcome to our platform!")
 
+# Circular dependencies are reported at build time, not deep inside a request
+class OrderService:
+    def __init__(self, payment_service: 'PaymentService'):
+        self.payment_service = payment_service
+
+class PaymentService:
+    def __init__(self, order_service: OrderService):
+        self.order_service = order_service
+
+cyclic_container = DIContainer()
+cyclic_container.register_transient(OrderService)
+cyclic_container.register_transient(PaymentService)
+try:
+    cyclic_container.build()
+except ValueError as e:
+    print(f"❌ {e}")
+
+# A singleton holding a scoped service would outlive every scope
+class AuditLog:
+    def __init__(self, user_service: UserService):
+        self.user_service = user_service
+
+captive_container = DIContainer()
+captive_container.register_singleton(IUserRepository, UserRepository)
+captive_container.register_transient(IEmailService, EmailService)
+captive_container.register_scoped(UserService)
+captive_container.register_singleton(AuditLog)
+try:
+    captive_container.build()
+except ValueError as e:
+    print(f"❌ {e}")
+
+# Context-bound scopes: no id threading, disposed on exit
+print("\n2. Context-bound scopes:")
+with container.scope() as scope:
+    print(f"Resolved from current scope: {container.resolve(UserService) is scope.resolve(UserService)}")
+
+async def handle_request(request_id: int) -> RequestSession:
+    # Each task gets its own scope through contextvars
+    async with container.scope():
+        session = container.resolve(RequestSession)
+        assert session.user_service is container.resolve(UserService)
+        await asyncio.sleep(0)
+        return session
+
+async def scoped_requests_demo():
+    sessions = await asyncio.gather(*(handle_request(i) for i in range(3)))
+    print(f"Distinct sessions per request: {len({id(s) for s in sessions}) == 3}")
+    print(f"Async dispose hooks awaited: {all(s.closed for s in sessions)}")
+
+asyncio.run(scoped_requests_demo())
+
+# Forgotten scopes show up in the leak diagnostic
+forgotten_scope = container.create_scope()
+container.resolve(UserService, forgotten_scope)
+print(f"Leaked scopes: {container.leaked_scopes(max_age=0)}")
+for scope_id in ["scope1", "scope2", forgotten_scope]:
+    container.dispose_scope(scope_id)
+print(f"Leaked scopes after dispose: {container.leaked_scopes(max_age=0)}")
+
 # =============================================================================
 # 3. CONFIGURATION MANAGEMENT
 # =============================================================================
@@ -424,16 +689,32 @@ class ConfigSource(ABC):
     @abstractmethod
     def get_priority(self) -> int:
         pass
+    
+    def has_changed(self) -> bool:
+        """Cheap check whether load() would return something new"""
+        return False
 
 class EnvironmentConfigSource(ConfigSource):
     """Environment variables configuration source"""
     
     def __init__(self, prefix: str = ""):
         self.prefix = prefix.upper()
+        self._fingerprint = None
+    
+    def _snapshot(self) -> Tuple[Tuple[str, str], ...]:
+        return tuple(sorted(
+            (key, value) for key, value in os.environ.items()
+            if not self.prefix or key.startswith(self.prefix)
+        ))
+    
+    def has_changed(self) -> bool:
+        return self._snapshot() != self._fingerprint
     
     def load(self) -> Dict[str, Any]:
         config = {}
-        for key, value in os.environ.items():
+        snapshot = self._snapshot()
+        self._fingerprint = snapshot
+        for key, value in snapshot:
             if not self.prefix or key.startswith(self.prefix):
                 # Convert environment variable to nested dict
                 clean_key = key[len(self.prefix):] if self.prefix else key
@@ -468,18 +749,41 @@ class JsonConfigSource(ConfigSource):
     
     def __init__(self, file_path: str):
         self.file_path = Path(file_path)
+        self._stamp = None
+        self._last_good: Dict[str, Any] = {}
+    
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def has_changed(self) -> bool:
+        return self._file_stamp() != self._stamp
     
     def load(self) -> Dict[str, Any]:
-        if not self.file_path.exists():
+        stamp = self._file_stamp()
+        if stamp is None:
             print(f"⚠️  Config file not found: {self.file_path}")
+            self._stamp = None
+            self._last_good = {}
             return {}
         
         try:
             with open(self.file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                config = json.load(f)
         except Exception as e:
-            print(f"❌ Error loading config file: {e}")
-            return {}
+            # Broken file: keep serving the last good parse. The stamp still
+            # moves, so the file is re-read once it is written again rather
+            # than on every poll
+            self._stamp = stamp
+            print(f"❌ Error loading config file, keeping last good version: {e}")
+            return self._last_good
+        
+        self._stamp = stamp
+        self._last_good = config
+        return config
     
     def get_priority(self) -> int:
         return 50  # Medium priority
@@ -496,6 +800,24 @@ class DefaultConfigSource(ConfigSource):
     def get_priority(self) -> int:
         return 1  # Lowest priority
 
+_MISSING = object()
+
+class ConfigBinding:
+    """Handle to a single config key; value is refreshed when the key changes"""
+    
+    __slots__ = ('key', 'default', 'value', '__weakref__')
+    
+    def __init__(self, key: str, default: Any, value: Any):
+        self.key = key
+        self.default = default
+        self.value = value
+    
+    def __call__(self) -> Any:
+        return self.value
+    
+    def __repr__(self) -> str:
+        return f"ConfigBinding({self.key!r}={self.value!r})"
+
 class ConfigurationManager:
     """Configuration management system"""
     
@@ -503,6 +825,18 @@ class ConfigurationManager:
         self.sources: List[ConfigSource] = []
         self.config: Dict[str, Any] = {}
         self.change_callbacks: List[callable] = []
+        # Immutable snapshot: dotted path -> value (sections included)
+        self._flat: MappingProxyType = MappingProxyType({})
+        # Last parsed result per source, reused by incremental reloads
+        self._source_configs: Dict[int, Dict[str, Any]] = {}
+        # Runtime set() values: kept across reload_changed(), cleared by load_configuration()
+        self._overrides: Dict[str, Any] = {}
+        self._reload_lock = threading.Lock()
+        self._watch_stop: Optional[threading.Event] = None
+        self._watch_thread: Optional[threading.Thread] = None
+        # Key-scoped subscriptions: (prefix, callback(diff))
+        self._subscriptions: List[Tuple[str, Callable[[Dict[str, Tuple[Any, Any]]], None]]] = []
+        self._bindings: Dict[str, weakref.WeakSet] = {}
     
     def add_source(self, source: ConfigSource):
         """Add configuration source"""
@@ -511,67 +845,223 @@ class ConfigurationManager:
         print(f"📋 Added config source: {source.__class__.__name__}")
     
     def load_configuration(self):
-        """Load configuration from all sources"""
-        self.config = {}
+        """Load configuration from all sources (runtime set() values are reset)"""
+        with self._reload_lock:
+            config = {}
+            
+            # Load from sources in priority order (lowest first)
+            for source in self.sources:
+                source_config = source.load()
+                self._source_configs[id(source)] = source_config
+                self._merge_config(config, source_config)
+            
+            self._overrides.clear()
+            print("⚙️  Configuration loaded")
+            diff = self._publish(config)
+        # Callbacks run unlocked, so they may call set() or reload themselves
+        self._notify(diff, config)
+    
+    def reload_changed(self) -> bool:
+        """Re-parse only changed sources and re-merge the top-level keys they touch"""
+        changed = [source for source in self.sources if source.has_changed()]
+        if not changed:
+            return False
+        
+        with self._reload_lock:
+            affected = set()
+            for source in changed:
+                previous = self._source_configs.get(id(source), {})
+                source_config = source.load()
+                self._source_configs[id(source)] = source_config
+                affected.update(previous.keys(), source_config.keys())
+            
+            # Untouched subtrees are shared with the current snapshot; affected
+            # ones are re-merged from every source's cached parse
+            config = {key: value for key, value in self.config.items() if key not in affected}
+            for source in self.sources:
+                source_config = self._source_configs.get(id(source), {})
+                self._merge_config(config, {
+                    key: value for key, value in source_config.items() if key in affected
+                })
+            for key, value in self._overrides.items():
+                if key.split('.', 1)[0] in affected:
+                    self._apply_override(config, key, value)
+            
+            print(f"🔄 Configuration reloaded: {', '.join(type(s).__name__ for s in changed)}")
+            diff = self._publish(config)
+        self._notify(diff, config)
+        return True
+    
+    @staticmethod
+    def _apply_override(config: dict, key: str, value: Any):
+        # Copy-on-write along the path; published snapshots stay untouched
+        keys = key.split('.')
+        current = config
+        for k in keys[:-1]:
+            child = current.get(k)
+            current[k] = dict(child) if isinstance(child, dict) else {}
+            current = current[k]
+        current[keys[-1]] = value
+    
+    def start_watching(self, interval: float = 1.0):
+        """Poll sources on a background thread and hot-reload on change"""
+        if self._watch_thread is not None:
+            return
         
-        # Load from sources in priority order (lowest first)
-        for source in self.sources:
-            source_config = source.load()
-            self._merge_config(self.config, source_config)
+        self._watch_stop = threading.Event()
         
-        print("⚙️  Configuration loaded")
+        def watch(stop: threading.Event):
+            while not stop.wait(interval):
+                try:
+                    self.reload_changed()
+                except Exception as e:
+                    print(f"❌ Config reload error: {e}")
         
-        # Notify change callbacks
-        for callback in self.change_callbacks:
-            try:
-                callback(self.config)
-            except Exception as e:
-                print(f"❌ Config change callback error: {e}")
+        self._watch_thread = threading.Thread(
+            target=watch, args=(self._watch_stop,), name="config-watcher", daemon=True
+        )
+        self._watch_thread.start()
+        print(f"👀 Watching configuration sources every {interval}s")
+    
+    def stop_watching(self):
+        """Stop background reload thread"""
+        if self._watch_thread is None:
+            return
+        self._watch_stop.set()
+        self._watch_thread.join()
+        self._watch_thread = None
+        self._watch_stop = None
     
     def _merge_config(self, target: dict, source: dict):
         """Merge configuration dictionaries"""
         for key, value in source.items():
             if key in target and isinstance(target[key], dict) and isinstance(value, dict):
                 self._merge_config(target[key], value)
+            elif isinstance(value, dict):
+                # Copy so later merges never mutate a source's own dict
+                target[key] = {}
+                self._merge_config(target[key], value)
             else:
                 target[key] = value
     
-    def get(self, key: str, default: Any = None) -> Any:
-        """Get configuration value by key (supports dot notation)"""
-        keys = key.split('.')
-        current = self.config
+    @staticmethod
+    def _flatten(config: dict, prefix: str, flat: Dict[str, Any]) -> MappingProxyType:
+        """Fill flat with dotted paths; sections are stored as read-only views"""
+        view = {}
+        for key, value in config.items():
+            path = f"{prefix}.{key}" if prefix else key
+            if isinstance(value, dict):
+                value = ConfigurationManager._flatten(value, path, flat)
+            flat[path] = value
+            view[key] = value
+        return MappingProxyType(view)
+    
+    @staticmethod
+    def _changed(old_value: Any, new_value: Any) -> bool:
+        # 1 == True == 1.0, but a type change is still a change
+        return type(old_value) is not type(new_value) or old_value != new_value
+    
+    @staticmethod
+    def _thaw(value: Any) -> Any:
+        """Plain (mutable, JSON-serializable) copy of a read-only section view"""
+        if isinstance(value, MappingProxyType):
+            return {key: ConfigurationManager._thaw(child) for key, child in value.items()}
+        return value
+    
+    def _publish(self, config: dict) -> Dict[str, Tuple[Any, Any]]:
+        """Swap in a new snapshot (caller holds the lock); returns the changed keys"""
+        old_flat = self._flat
+        new_flat = {}
+        self._flatten(config, "", new_flat)
         
-        for k in keys:
-            if isinstance(current, dict) and k in current:
-                current = current[k]
-            else:
-                return default
+        diff = {}
+        for key in old_flat.keys() | new_flat.keys():
+            old_value = old_flat.get(key, _MISSING)
+            new_value = new_flat.get(key, _MISSING)
+            old_section = isinstance(old_value, MappingProxyType)
+            new_section = isinstance(new_value, MappingProxyType)
+            # Sections that appear, vanish or stay are covered by their leaves;
+            # a leaf turning into a section (or back) is reported itself
+            if (old_section or old_value is _MISSING) and (new_section or new_value is _MISSING):
+                continue
+            if old_value is not new_value and (old_section or new_section
+                                               or self._changed(old_value, new_value)):
+                diff[key] = (None if old_value is _MISSING else self._thaw(old_value),
+                             None if new_value is _MISSING else self._thaw(new_value))
         
-        return current
-    
-    def get_section(self, section: str) -> Dict[str, Any]:
-        """Get configuration section"""
-        return self.get(section, {})
-    
-    def set(self, key: str, value: Any):
-        """Set configuration value (runtime only)"""
-        keys = key.split('.')
-        current = self.config
+        self.config = config
+        self._flat = MappingProxyType(new_flat)
         
-        for k in keys[:-1]:
-            if k not in current:
-                current[k] = {}
-            current = current[k]
+        for key, bindings in list(self._bindings.items()):
+            # Section bindings refresh when any leaf below them changed
+            if key not in diff and not any(path.startswith(key + '.') for path in diff):
+                continue
+            for binding in list(bindings):
+                binding.value = self._thaw(new_flat.get(key, binding.default))
+        return diff
+    
+    def _notify(self, diff: Dict[str, Tuple[Any, Any]], config: dict):
+        """Run subscribers and change callbacks; must be called without the lock"""
+        if not diff:
+            return
         
-        current[keys[-1]] = value
+        for prefix, callback in list(self._subscriptions):
+            scoped = {
+                key: change for key, change in diff.items()
+                if not prefix or key == prefix or key.startswith(prefix + '.')
+            }
+            if scoped:
+                try:
+                    callback(scoped)
+                except Exception as e:
+                    print(f"❌ Config subscription error ({prefix}): {e}")
         
-        # Notify callbacks
-        for callback in self.change_callbacks:
+        # Notify change callbacks
+        for callback in list(self.change_callbacks):
             try:
-                callback(self.config)
+                callback(config)
             except Exception as e:
                 print(f"❌ Config change callback error: {e}")
     
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get configuration value by key (supports dot notation)
+        
+        Sections come back as plain dict copies; changing them does not
+        change the configuration.
+        """
+        return self._thaw(self._flat.get(key, default))
+    
+    def bind(self, key: str, default: Any = None) -> ConfigBinding:
+        """O(1) handle for hot paths: read binding.value or call binding()"""
+        binding = ConfigBinding(key, default, self._thaw(self._flat.get(key, default)))
+        self._bindings.setdefault(key, weakref.WeakSet()).add(binding)
+        return binding
+    
+    def get_section(self, section: str) -> Dict[str, Any]:
+        """Get configuration section (a copy)"""
+        return self.get(section, {})
+    
+    def set(self, key: str, value: Any):
+        """Set configuration value (runtime only)
+        
+        The value survives reload_changed() of the sources; a full
+        load_configuration() resets it, as before.
+        """
+        with self._reload_lock:
+            # Re-insert so the latest set() wins when overrides nest
+            self._overrides.pop(key, None)
+            self._overrides[key] = value
+            config = dict(self.config)
+            self._apply_override(config, key, value)
+            diff = self._publish(config)
+        self._notify(diff, config)
+    
+    def subscribe(self, prefix: str, callback: Callable[[Dict[str, Tuple[Any, Any]]], None]) -> Callable[[], None]:
+        """Call callback with {key: (old, new)} for changes under prefix; returns unsubscribe"""
+        subscription = (prefix, callback)
+        self._subscriptions.append(subscription)
+        return lambda: self._subscriptions.remove(subscription)
+    
     def on_change(self, callback: callable):
         """Register configuration change callback"""
         self.change_callbacks.append(callback)
@@ -654,6 +1144,35 @@ print(f"API port: {config_manager.get('api.port')}")
 print(f"Debug mode: {config_manager.get('api.debug')}")
 print(f"Database password: {config_manager.get('database.password', 'not set')}")
 
+# Bound keys for hot paths and key-scoped change diffs
+api_port = config_manager.bind('api.port')
+unsubscribe = config_manager.subscribe(
+    'api', lambda diff: print(f"🔔 api changed: {diff}")
+)
+config_manager.subscribe(
+    'database', lambda diff: print(f"🔔 database changed: {diff}")
+)
+config_manager.set('api.port', 9100)        # only the api subscriber fires
+config_manager.set('redis.port', 6379)      # unchanged value, nobody fires
+print(f"Bound API port: {api_port.value}")
+unsubscribe()
+
+# Hot reload: only the edited file is re-parsed, runtime set() values survive
+config_manager.start_watching(interval=0.05)
+print(f"Nothing changed, reload skipped: {not config_manager.reload_changed()}")
+config_data["database"]["name"] = "ecommerce_v2"
+config_file.write_text(json.dumps(config_data, indent=2))
+time.sleep(0.2)
+config_manager.stop_watching()
+print(f"Database name after reload: {config_manager.get('database.name')}")
+
+# A broken write keeps the last good parse until the file is fixed
+config_file.write_text('{"database": {')
+config_manager.reload_changed()
+print(f"After broken write: database.name={config_manager.get('database.name')}, "
+      f"api.port={config_manager.get('api.port')}")
+config_file.write_text(json.dumps(config_data, indent=2))
+
 # Configuration validation
 schema = {
     "database": {
@@ -682,6 +1201,9 @@ print("\n=== Logging and Monitoring ===")
 
 import structlog
 import time
+import math
+import atexit
+from collections import deque
 from contextlib import contextmanager
 
 class LogLevel(Enum):
@@ -691,16 +1213,86 @@ class LogLevel(Enum):
     ERROR = "ERROR"
     CRITICAL = "CRITICAL"
 
-@dataclass
+_LEVEL_NUMBERS = {
+    LogLevel.DEBUG: 10,
+    LogLevel.INFO: 20,
+    LogLevel.WARNING: 30,
+    LogLevel.ERROR: 40,
+    LogLevel.CRITICAL: 50,
+}
+
+# Wall-clock offset so entries only capture time.monotonic_ns();
+# (anchored_at, offset), re-anchored so NTP / clock changes are picked up
+_WALL_CLOCK_REANCHOR_NS = 60 * 1_000_000_000
+_wall_clock_anchor = (time.monotonic_ns(), time.time_ns() - time.monotonic_ns())
+
+def _wall_clock_offset_ns() -> int:
+    global _wall_clock_anchor
+    anchored_at, offset = _wall_clock_anchor
+    now = time.monotonic_ns()
+    if now - anchored_at >= _WALL_CLOCK_REANCHOR_NS:
+        offset = time.time_ns() - time.monotonic_ns()
+        _wall_clock_anchor = (now, offset)
+    return offset
+
+# Request-scoped ids, picked up by every logger in the current thread / task
+correlation_id_var: contextvars.ContextVar = contextvars.ContextVar("correlation_id", default=None)
+user_id_var: contextvars.ContextVar = contextvars.ContextVar("user_id", default=None)
+
+@contextmanager
+def log_context(correlation_id: str = None, user_id: str = None):
+    """Bind correlation / user ids for the current context"""
+    tokens = []
+    if correlation_id is not None:
+        tokens.append((correlation_id_var, correlation_id_var.set(correlation_id)))
+    if user_id is not None:
+        tokens.append((user_id_var, user_id_var.set(user_id)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
 class LogEntry:
-    """Structured log entry"""
-    timestamp: datetime
-    level: LogLevel
-    message: str
-    logger_name: str
-    context: Dict[str, Any] = field(default_factory=dict)
-    correlation_id: Optional[str] = None
-    user_id: Optional[str] = None
+    """Structured log entry
+    
+    Pass timestamp as before, or None plus monotonic_ns; the wall-clock
+    time is then derived the first time a processor reads it.
+    """
+    
+    __slots__ = ('_timestamp', 'monotonic_ns', 'level', 'message', 'logger_name',
+                 'context', 'correlation_id', 'user_id')
+    
+    def __init__(self, timestamp: Optional[datetime], level: LogLevel, message: str,
+                 logger_name: str, context: Mapping[str, Any] = None,
+                 correlation_id: Optional[str] = None, user_id: Optional[str] = None,
+                 monotonic_ns: Optional[int] = None):
+        if timestamp is None and monotonic_ns is None:
+            monotonic_ns = time.monotonic_ns()
+        self._timestamp = timestamp
+        self.monotonic_ns = monotonic_ns
+        self.level = level
+        self.message = message
+        self.logger_name = logger_name
+        self.context = context if context is not None else {}
+        self.correlation_id = correlation_id
+        self.user_id = user_id
+    
+    @property
+    def timestamp(self) -> datetime:
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(
+                (self.monotonic_ns + _wall_clock_offset_ns()) / 1e9
+            )
+        return self._timestamp
+    
+    @timestamp.setter
+    def timestamp(self, value: datetime):
+        self._timestamp = value
+    
+    def __repr__(self) -> str:
+        return (f"LogEntry({self.level.value} {self.logger_name}: {self.message!r}, "
+                f"context={dict(self.context)!r})")
 
 class LogProcessor:
     """Log processor interface"""
@@ -743,83 +1335,243 @@ class ConsoleLogProcessor(LogProcessor):
         print(message)
 
 class FileLogProcessor(LogProcessor):
-    """File log output processor"""
-    
-    def __init__(self, file_path: str, max_size: int = 10 * 1024 * 1024):
+    """File log output processor (buffered, written by a background thread)"""
+    
+    def __init__(self, file_path: str, max_size: int = 10 * 1024 * 1024,
+                 buffer_size: int = 10000, batch_size: int = 512,
+                 flush_interval: float = 0.5, fsync_interval: float = 5.0,
+                 overflow_policy: str = "drop"):
+        if overflow_policy not in ("drop", "block"):
+            raise ValueError("overflow_policy must be 'drop' or 'block'")
+        
         self.file_path = Path(file_path)
         self.max_size = max_size
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.overflow_policy = overflow_policy
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        self.dropped = 0
+        self.write_errors = 0
+        self._buffer: deque = deque()
+        self._cond = threading.Condition()
+        self._enqueued = 0
+        self._written = 0
+        self._closed = False
+        
+        # File stays open; size is tracked instead of stat() per line
+        self._file = open(self.file_path, 'a', encoding='utf-8')
+        self._size = self._file.tell()
+        
+        self._writer = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
     
     def process(self, entry: LogEntry):
-        # Rotate file if needed
-        if self.file_path.exists() and self.file_path.stat().st_size > self.max_size:
-            backup_path = self.file_path.with_suffix(f".{int(time.time())}.bak")
-            self.file_path.rename(backup_path)
-        
+        with self._cond:
+            if self._closed:
+                return
+            while len(self._buffer) >= self.buffer_size:
+                if self.overflow_policy == "drop":
+                    self.dropped += 1
+                    return
+                self._cond.wait()
+                if self._closed:
+                    # Closed while we were blocked; the writer is gone or draining
+                    self.dropped += 1
+                    return
+            self._buffer.append(entry)
+            self._enqueued += 1
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify_all()
+    
+    @staticmethod
+    def _format(entry: LogEntry) -> str:
         log_data = {
             "timestamp": entry.timestamp.isoformat(),
             "level": entry.level.value,
             "logger": entry.logger_name,
             "message": entry.message,
-            "context": entry.context,
+            "context": dict(entry.context),
             "correlation_id": entry.correlation_id,
             "user_id": entry.user_id
         }
+        return json.dumps(log_data, default=str) + '\n'
+    
+    def _run(self):
+        last_flush = last_fsync = time.monotonic()
+        unsynced = False  # written since the last fsync
         
-        with open(self.file_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(log_data) + '\n')
+        while True:
+            with self._cond:
+                if not self._buffer and not self._closed:
+                    self._cond.wait(self.flush_interval)
+                batch = [self._buffer.popleft()
+                         for _ in range(min(self.batch_size, len(self._buffer)))]
+                closing = self._closed and not self._buffer
+                if batch:
+                    # Wake producers blocked on a full buffer
+                    self._cond.notify_all()
+            
+            # An I/O error must not kill the writer: producers and flush()
+            # callers would wait on it forever
+            lost = len(batch)
+            try:
+                if self._file.closed:
+                    self._reopen()  # a failed rotation is retried with the next batch
+                if batch:
+                    data = ''.join(self._format(entry) for entry in batch)
+                    self._file.write(data)
+                    self._size += len(data) if data.isascii() else len(data.encode('utf-8'))
+                    unsynced = True
+                    lost = 0
+                
+                now = time.monotonic()
+                if batch and (len(batch) < self.batch_size or now - last_flush >= self.flush_interval):
+                    self._file.flush()
+                    last_flush = now
+                if unsynced and (now - last_fsync >= self.fsync_interval or closing):
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                    last_fsync = now
+                    unsynced = False
+                
+                if self._size > self.max_size:
+                    self._rotate()
+            except Exception as e:
+                self.write_errors += 1
+                print(f"❌ Log writer error ({lost} entries lost): {e}")
+            
+            if batch:
+                with self._cond:
+                    self._written += len(batch)
+                    self._cond.notify_all()
+            
+            if closing:
+                return
+    
+    def _rotate(self):
+        self._file.close()
+        backup_path = self.file_path.with_suffix(f".{time.time_ns()}.bak")
+        try:
+            self.file_path.rename(backup_path)
+        finally:
+            # Reopen even when the rename failed (same file, keeps growing)
+            self._reopen()
+    
+    def _reopen(self):
+        self._file = open(self.file_path, 'a', encoding='utf-8')
+        self._size = self._file.tell()
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything enqueued so far is written"""
+        with self._cond:
+            target = self._enqueued
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._written >= target, timeout)
+    
+    def close(self):
+        """Drain the buffer, fsync and close the file"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join()
+        self._file.close()
+        atexit.unregister(self.close)
+
+class _LogContext:
+    """Immutable context link; merged view is built once, on first use"""
+    
+    __slots__ = ('parent', 'items', '_merged')
+    
+    def __init__(self, parent: Optional['_LogContext'], items: Dict[str, Any]):
+        self.parent = parent
+        self.items = items
+        self._merged = None
+    
+    def merged(self) -> Mapping[str, Any]:
+        if self._merged is None:
+            base = self.parent.merged() if self.parent is not None else MappingProxyType({})
+            # Shared by every entry logged without kwargs, so hand out a read-only view
+            self._merged = MappingProxyType({**base, **self.items}) if self.items else base
+        return self._merged
+
+_EMPTY_CONTEXT = _LogContext(None, {})
 
 class StructuredLogger:
     """Structured logger implementation"""
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, level: LogLevel = LogLevel.DEBUG):
         self.name = name
         self.processors: List[LogProcessor] = []
-        self.context: Dict[str, Any] = {}
+        self.level_no = _LEVEL_NUMBERS[level]
+        self._context = _EMPTY_CONTEXT
         self.correlation_id: Optional[str] = None
         self.user_id: Optional[str] = None
     
+    @property
+    def context(self) -> Mapping[str, Any]:
+        return self._context.merged()
+    
     def add_processor(self, processor: LogProcessor):
         """Add log processor"""
         self.processors.append(processor)
     
-    def with_context(self, **kwargs) -> 'StructuredLogger':
-        """Create logger with additional context"""
-        new_logger = StructuredLogger(self.name)
+    def set_level(self, level: LogLevel):
+        """Change minimum level (shared processors, own threshold)"""
+        self.level_no = _LEVEL_NUMBERS[level]
+    
+    def is_enabled_for(self, level: LogLevel) -> bool:
+        return _LEVEL_NUMBERS[level] >= self.level_no
+    
+    def _child(self) -> 'StructuredLogger':
+        # O(1): shares processors and links to the parent context
+        new_logger = StructuredLogger.__new__(StructuredLogger)
+        new_logger.name = self.name
         new_logger.processors = self.processors
-        new_logger.context = {**self.context, **kwargs}
+        new_logger.level_no = self.level_no
+        new_logger._context = self._context
         new_logger.correlation_id = self.correlation_id
         new_logger.user_id = self.user_id
         return new_logger
     
+    def with_context(self, **kwargs) -> 'StructuredLogger':
+        """Create logger with additional context"""
+        new_logger = self._child()
+        new_logger._context = _LogContext(self._context, kwargs)
+        return new_logger
+    
     def with_correlation(self, correlation_id: str) -> 'StructuredLogger':
         """Create logger with correlation ID"""
-        new_logger = StructuredLogger(self.name)
-        new_logger.processors = self.processors
-        new_logger.context = self.context.copy()
+        new_logger = self._child()
         new_logger.correlation_id = correlation_id
-        new_logger.user_id = self.user_id
         return new_logger
     
     def with_user(self, user_id: str) -> 'StructuredLogger':
         """Create logger with user ID"""
-        new_logger = StructuredLogger(self.name)
-        new_logger.processors = self.processors
-        new_logger.context = self.context.copy()
-        new_logger.correlation_id = self.correlation_id
+        new_logger = self._child()
         new_logger.user_id = user_id
         return new_logger
     
-    def _log(self, level: LogLevel, message: str, **kwargs):
+    def _log(self, level: LogLevel, message: str, kwargs: Dict[str, Any]):
         """Internal logging method"""
+        if not self.processors:
+            return
+        
+        context = self._context.merged()
         entry = LogEntry(
-            timestamp=datetime.now(),
+            timestamp=None,
+            monotonic_ns=time.monotonic_ns(),
             level=level,
             message=message,
             logger_name=self.name,
-            context={**self.context, **kwargs},
-            correlation_id=self.correlation_id,
-            user_id=self.user_id
+            context={**context, **kwargs} if kwargs else context,
+            correlation_id=self.correlation_id or correlation_id_var.get(),
+            user_id=self.user_id or user_id_var.get()
         )
         
         for processor in self.processors:
@@ -828,68 +1580,351 @@ class StructuredLogger:
             except Exception as e:
                 print(f"Log processor error: {e}")
     
+    # Level check comes first: disabled calls build nothing
     def debug(self, message: str, **kwargs):
-        self._log(LogLevel.DEBUG, message, **kwargs)
+        if self.level_no <= 10:
+            self._log(LogLevel.DEBUG, message, kwargs)
     
     def info(self, message: str, **kwargs):
-        self._log(LogLevel.INFO, message, **kwargs)
+        if self.level_no <= 20:
+            self._log(LogLevel.INFO, message, kwargs)
     
     def warning(self, message: str, **kwargs):
-        self._log(LogLevel.WARNING, message, **kwargs)
+        if self.level_no <= 30:
+            self._log(LogLevel.WARNING, message, kwargs)
     
     def error(self, message: str, **kwargs):
-        self._log(LogLevel.ERROR, message, **kwargs)
+        if self.level_no <= 40:
+            self._log(LogLevel.ERROR, message, kwargs)
     
     def critical(self, message: str, **kwargs):
-        self._log(LogLevel.CRITICAL, message, **kwargs)
+        if self.level_no <= 50:
+            self._log(LogLevel.CRITICAL, message, kwargs)
+
+class HistogramSketch:
+    """Fixed-memory histogram with log-spaced buckets (relative-error quantiles)"""
+    
+    __slots__ = ('relative_accuracy', 'max_buckets', '_gamma', '_inv_log_gamma',
+                 'buckets', 'zero_count', 'count', 'sum', 'min', 'max')
+    
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._inv_log_gamma = 1.0 / math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def add(self, value: float):
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        
+        if value <= 0:
+            self.zero_count += 1
+            return
+        
+        index = math.ceil(math.log(value) * self._inv_log_gamma)
+        buckets = self.buckets
+        buckets[index] = buckets.get(index, 0) + 1
+        if len(buckets) > self.max_buckets:
+            self._collapse()
+    
+    def _collapse(self):
+        # Fold the lowest buckets together; keeps tail quantiles accurate
+        low, next_low = sorted(self.buckets)[:2]
+        self.buckets[next_low] += self.buckets.pop(low)
+    
+    def merge(self, other: 'HistogramSketch'):
+        for index, bucket_count in other.buckets.copy().items():
+            self.buckets[index] = self.buckets.get(index, 0) + bucket_count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        while len(self.buckets) > self.max_buckets:
+            self._collapse()
+    
+    def difference(self, earlier: 'HistogramSketch') -> 'HistogramSketch':
+        """Values added since `earlier`, a previous copy of this sketch
+        
+        min/max stay the cumulative bounds. Buckets folded by _collapse in
+        between can leave the lowest buckets slightly off; the tail is exact.
+        """
+        window = HistogramSketch(self.relative_accuracy, self.max_buckets)
+        for index, bucket_count in self.buckets.items():
+            bucket_count -= earlier.buckets.get(index, 0)
+            if bucket_count > 0:
+                window.buckets[index] = bucket_count
+        window.zero_count = max(self.zero_count - earlier.zero_count, 0)
+        window.count = window.zero_count + sum(window.buckets.values())
+        window.sum = self.sum - earlier.sum
+        window.min, window.max = self.min, self.max
+        return window
+    
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return self.min  # values <= 0 share a single bucket
+        
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                estimate = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+    
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "avg": self.sum / self.count,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99)
+        }
+
+class _CellOwner:
+    """Lives in a thread's local storage; dies (and retires the cell) with the thread"""
+    __slots__ = ('__weakref__',)
+
+class _MetricHandle(ABC):
+    """Pre-registered metric; each thread records into its own cell"""
+    
+    def __init__(self, key: str):
+        self.key = key
+        self._local = threading.local()
+        # _cells[0] accumulates the cells of threads that have exited
+        self._cells: List[Any] = [self._new_cell()]
+        self._cells_lock = threading.Lock()
+    
+    @abstractmethod
+    def _new_cell(self):
+        pass
+    
+    @abstractmethod
+    def _fold(self, into, cell):
+        pass
+    
+    def _cell(self):
+        cell = self._new_cell()
+        with self._cells_lock:  # once per thread, not per record
+            self._cells.append(cell)
+        self._local.cell = cell
+        owner = self._local.owner = _CellOwner()
+        weakref.finalize(owner, self._retire, cell).atexit = False
+        return cell
+    
+    def _retire(self, cell):
+        with self._cells_lock:
+            self._fold(self._cells[0], cell)
+            self._cells.remove(cell)
+    
+    def _snapshot_cells(self) -> List[Any]:
+        with self._cells_lock:
+            return list(self._cells)
+
+class CounterHandle(_MetricHandle):
+    """Counter with per-thread accumulators, summed on read"""
+    
+    def _new_cell(self):
+        return [0]
+    
+    def _fold(self, into, cell):
+        into[0] += cell[0]
+    
+    def inc(self, value: int = 1):
+        try:
+            self._local.cell[0] += value
+        except AttributeError:
+            self._cell()[0] += value
+    
+    def value(self) -> int:
+        with self._cells_lock:
+            return sum(cell[0] for cell in self._cells)
+
+class GaugeHandle:
+    """Gauge; a plain attribute store is atomic, no lock needed"""
+    
+    def __init__(self, key: str):
+        self.key = key
+        self.current = 0.0
+    
+    def set(self, value: float):
+        self.current = value
+
+class HistogramHandle(_MetricHandle):
+    """Histogram with a per-thread sketch, merged on read
+    
+    The latest recent_samples raw values are kept as well (deque.append is
+    thread-safe) for callers that want the values themselves.
+    """
+    
+    def __init__(self, key: str, relative_accuracy: float = 0.01, recent_samples: int = 1000):
+        self.relative_accuracy = relative_accuracy
+        self.recent: deque = deque(maxlen=recent_samples)
+        super().__init__(key)
+    
+    def _new_cell(self):
+        return HistogramSketch(self.relative_accuracy)
+    
+    def _fold(self, into, cell):
+        into.merge(cell)
+    
+    def record(self, value: float):
+        self.recent.append(value)
+        try:
+            self._local.cell.add(value)
+        except AttributeError:
+            self._cell().add(value)
+    
+    def merged(self) -> HistogramSketch:
+        sketch = HistogramSketch(self.relative_accuracy)
+        for cell in self._snapshot_cells():
+            sketch.merge(cell)
+        return sketch
+
+class TimerHandle(HistogramHandle):
+    """Timer recording seconds measured with perf_counter_ns"""
+    
+    def record_ns(self, duration_ns: int):
+        self.record(duration_ns / 1e9)
+    
+    @contextmanager
+    def time(self):
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record((time.perf_counter_ns() - start_ns) / 1e9)
 
 class MetricsCollector:
     """Application metrics collector"""
     
     def __init__(self):
-        self.counters: Dict[str, int] = {}
-        self.gauges: Dict[str, float] = {}
-        self.histograms: Dict[str, List[float]] = {}
-        self.timers: Dict[str, List[float]] = {}
-        self._lock = threading.Lock()
+        self._counters: Dict[str, CounterHandle] = {}
+        self._gauges: Dict[str, GaugeHandle] = {}
+        self._histograms: Dict[str, HistogramHandle] = {}
+        self._timers: Dict[str, TimerHandle] = {}
+        # (kind, name, tags) -> handle, so ad-hoc calls skip key building
+        self._handle_cache: Dict[tuple, Any] = {}
+        # consumer -> snapshot key -> cumulative sketch at its last collect_snapshot()
+        self._window_marks: Dict[str, Dict[tuple, HistogramSketch]] = {}
+        self._lock = threading.Lock()  # registration and window marks
+    
+    def _register(self, registry: dict, handle_type: type, name: str,
+                  tags: Optional[Dict[str, str]]):
+        key = self._make_key(name, tags)
+        with self._lock:
+            handle = registry.get(key)
+            if handle is None:
+                handle = registry[key] = handle_type(key)
+                handle.name = name
+                handle.labels = tuple(sorted(tags.items())) if tags else ()
+            return handle
+    
+    def counter(self, name: str, tags: Dict[str, str] = None) -> CounterHandle:
+        """Pre-register counter; keep the handle for hot paths"""
+        return self._register(self._counters, CounterHandle, name, tags)
+    
+    def gauge(self, name: str, tags: Dict[str, str] = None) -> GaugeHandle:
+        """Pre-register gauge"""
+        return self._register(self._gauges, GaugeHandle, name, tags)
+    
+    def histogram(self, name: str, tags: Dict[str, str] = None) -> HistogramHandle:
+        """Pre-register histogram"""
+        return self._register(self._histograms, HistogramHandle, name, tags)
+    
+    def timer_handle(self, name: str, tags: Dict[str, str] = None) -> TimerHandle:
+        """Pre-register timer"""
+        return self._register(self._timers, TimerHandle, name, tags)
+    
+    def _cached(self, kind: str, factory: Callable, name: str, tags: Optional[Dict[str, str]]):
+        cache_key = (kind, name, tuple(sorted(tags.items())) if tags else None)
+        handle = self._handle_cache.get(cache_key)
+        if handle is None:
+            handle = self._handle_cache[cache_key] = factory(name, tags)
+        return handle
     
     def increment(self, name: str, value: int = 1, tags: Dict[str, str] = None):
         """Increment counter metric"""
-        with self._lock:
-            key = self._make_key(name, tags)
-            self.counters[key] = self.counters.get(key, 0) + value
+        self._cached("counter", self.counter, name, tags).inc(value)
     
     def set_gauge(self, name: str, value: float, tags: Dict[str, str] = None):
         """Set gauge metric value"""
-        with self._lock:
-            key = self._make_key(name, tags)
-            self.gauges[key] = value
+        self._cached("gauge", self.gauge, name, tags).set(value)
     
     def record_histogram(self, name: str, value: float, tags: Dict[str, str] = None):
         """Record histogram value"""
-        with self._lock:
-            key = self._make_key(name, tags)
-            if key not in self.histograms:
-                self.histograms[key] = []
-            self.histograms[key].append(value)
+        self._cached("histogram", self.histogram, name, tags).record(value)
     
     def record_timer(self, name: str, duration: float, tags: Dict[str, str] = None):
         """Record timer duration"""
-        with self._lock:
-            key = self._make_key(name, tags)
-            if key not in self.timers:
-                self.timers[key] = []
-            self.timers[key].append(duration)
+        self._cached("timer", self.timer_handle, name, tags).record(duration)
     
     @contextmanager
     def timer(self, name: str, tags: Dict[str, str] = None):
         """Timer context manager"""
-        start_time = time.time()
+        handle = self._cached("timer", self.timer_handle, name, tags)
+        start_ns = time.perf_counter_ns()
         try:
             yield
         finally:
-            duration = time.time() - start_time
-            self.record_timer(name, duration, tags)
+            handle.record((time.perf_counter_ns() - start_ns) / 1e9)
+    
+    @property
+    def counters(self) -> Mapping[str, int]:
+        """Read-only view: key -> current count"""
+        with self._lock:
+            handles = list(self._counters.items())
+        return MappingProxyType({key: handle.value() for key, handle in handles})
+    
+    @property
+    def gauges(self) -> Mapping[str, float]:
+        """Read-only view: key -> current gauge value"""
+        with self._lock:
+            handles = list(self._gauges.items())
+        return MappingProxyType({key: handle.current for key, handle in handles})
+    
+    @property
+    def histograms(self) -> Mapping[str, List[float]]:
+        """Read-only view: key -> recorded values (the latest recent_samples of them)"""
+        with self._lock:
+            handles = list(self._histograms.items())
+        return MappingProxyType({key: list(handle.recent) for key, handle in handles})
+    
+    @property
+    def timers(self) -> Mapping[str, List[float]]:
+        """Read-only view: key -> durations in seconds (the latest recent_samples of them)"""
+        with self._lock:
+            handles = list(self._timers.items())
+        return MappingProxyType({key: list(handle.recent) for key, handle in handles})
+    
+    def histogram_sketches(self) -> Dict[str, HistogramSketch]:
+        """key -> merged sketch over every recorded value"""
+        with self._lock:
+            handles = list(self._histograms.items())
+        return {key: handle.merged() for key, handle in handles}
+    
+    def timer_sketches(self) -> Dict[str, HistogramSketch]:
+        """key -> merged sketch over every recorded duration"""
+        with self._lock:
+            handles = list(self._timers.items())
+        return {key: handle.merged() for key, handle in handles}
     
     def _make_key(self, name: str, tags: Dict[str, str] = None) -> str:
         """Create metric key with tags"""
@@ -899,39 +1934,71 @@ class MetricsCollector:
         tag_string = ",".join(f"{k}={v}" for k, v in sorted(tags.items()))
         return f"{name};{tag_string}"
     
+    def collect_snapshot(self, consumer: str = "default") -> Dict[str, Dict[tuple, Any]]:
+        """Snapshot for exporters: {kind: {(name, labels): value}}
+        
+        Counts and sums are cumulative; quantiles cover only the values
+        recorded since this consumer's previous call (NaN when there were
+        none). Histograms and timers carry their type as a "metric_type"
+        label, so the two never share a key.
+        """
+        with self._lock:
+            counters = list(self._counters.values())
+            gauges = list(self._gauges.values())
+            sketches = ([("histogram", h) for h in self._histograms.values()] +
+                        [("timer", h) for h in self._timers.values()])
+        
+        histograms = {}
+        marks = {}
+        for metric_type, handle in sketches:
+            sketch = handle.merged()
+            if not sketch.count:
+                continue
+            key = (handle.name, tuple(sorted(handle.labels + (("metric_type", metric_type),))))
+            marks[key] = sketch
+            histograms[key] = {"count": sketch.count, "sum": sketch.sum}
+        
+        with self._lock:
+            previous = self._window_marks.get(consumer, {})
+            self._window_marks[consumer] = marks
+        
+        for key, sketch in marks.items():
+            earlier = previous.get(key)
+            window = sketch.difference(earlier) if earlier is not None else sketch
+            histograms[key]["quantiles"] = {
+                q: window.quantile(q) if window.count else math.nan
+                for q in (0.5, 0.95, 0.99)
+            }
+        
+        return {
+            "counters": {(h.name, h.labels): h.value() for h in counters},
+            "gauges": {(h.name, h.labels): h.current for h in gauges},
+            "histograms": histograms
+        }
+    
     def get_metrics(self) -> Dict[str, Any]:
         """Get all collected metrics"""
         with self._lock:
-            metrics = {
-                "counters": self.counters.copy(),
-                "gauges": self.gauges.copy(),
-                "histograms": {},
-                "timers": {}
-            }
-            
-            # Calculate histogram statistics
-            for key, values in self.histograms.items():
-                if values:
-                    metrics["histograms"][key] = {
-                        "count": len(values),
-                        "sum": sum(values),
-                        "min": min(values),
-                        "max": max(values),
-                        "avg": sum(values) / len(values)
-                    }
-            
-            # Calculate timer statistics
-            for key, durations in self.timers.items():
-                if durations:
-                    metrics["timers"][key] = {
-                        "count": len(durations),
-                        "sum": sum(durations),
-                        "min": min(durations),
-                        "max": max(durations),
-                        "avg": sum(durations) / len(durations)
-                    }
-            
-            return metrics
+            counters = list(self._counters.items())
+            gauges = list(self._gauges.items())
+            histograms = list(self._histograms.items())
+            timers = list(self._timers.items())
+        
+        metrics = {
+            "counters": {key: handle.value() for key, handle in counters},
+            "gauges": {key: handle.current for key, handle in gauges},
+            "histograms": {},
+            "timers": {}
+        }
+        
+        # Per-thread sketches are merged only here, at read time
+        for section, handles in (("histograms", histograms), ("timers", timers)):
+            for key, handle in handles:
+                sketch = handle.merged()
+                if sketch.count:
+                    metrics[section][key] = sketch.summary()
+        
+        return metrics
 
 # Logging and monitoring demonstration
 print("Logging and monitoring örnekleri:")
@@ -939,7 +2006,8 @@ print("Logging and monitoring örnekleri:")
 # Setup structured logging
 logger = StructuredLogger("ecommerce.api")
 logger.add_processor(ConsoleLogProcessor(colored=True))
-logger.add_processor(FileLogProcessor("logs/app.log"))
+file_processor = FileLogProcessor("logs/app.log")
+logger.add_processor(file_processor)
 
 # Setup metrics
 metrics = MetricsCollector()
@@ -969,6 +2037,44 @@ with metrics.timer("api_request_duration", tags={"endpoint": "/api/v1/products"}
 metrics.increment("api_requests", tags={"endpoint": "/api/v1/products", "status": "200"})
 metrics.set_gauge("active_connections", 42)
 
+# Ids bound through contextvars reach every logger in this context
+with log_context(correlation_id="req-42", user_id="user456"):
+    logger.with_context(endpoint="/api/v1/orders").info("Order created", order_id=7)
+
+# Debug calls below the threshold return before building anything
+prod_logger = logger.with_context(service="checkout")
+prod_logger.set_level(LogLevel.INFO)
+start = time.perf_counter()
+for i in range(100000):
+    prod_logger.debug("cache lookup", key=i)
+print(f"100k disabled debug calls: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+# Request path only enqueues; the writer thread batches file writes
+start = time.perf_counter()
+for i in range(2000):
+    file_processor.process(LogEntry(datetime.now(), LogLevel.INFO, "request served", "bench", {"i": i}))
+enqueue_time = time.perf_counter() - start
+file_processor.flush()
+print(f"2000 file log entries enqueued in {enqueue_time * 1000:.2f}ms (dropped: {file_processor.dropped})")
+
+# Hot loops: resolve handles once, record without locks or key building
+cache_hits = metrics.counter("cache_hits", tags={"cache": "products"})
+payload_sizes = metrics.histogram("payload_bytes")
+
+def record_worker():
+    for i in range(20000):
+        cache_hits.inc()
+        payload_sizes.record(100 + i % 900)
+
+workers = [threading.Thread(target=record_worker) for _ in range(4)]
+start = time.perf_counter()
+for worker in workers:
+    worker.start()
+for worker in workers:
+    worker.join()
+print(f"4x20k counter+histogram records: {(time.perf_counter() - start) * 1000:.1f}ms, "
+      f"cache_hits={cache_hits.value()}")
+
 # Show collected metrics
 print("\nCollected metrics:")
 all_metrics = metrics.get_metrics()
@@ -980,6 +2086,9 @@ for metric_type, metric_data in all_metrics.items():
 
 # Cleanup test files
 config_file.unlink(missing_ok=True)
+file_processor.close()
+for log_file in Path("logs").glob("app.*"):
+    log_file.unlink()
 Path("logs").rmdir() if Path("logs").exists() else None
 
 print("\n" + "="*60)
@@ -7,15 +7,25 @@ authentication/authorization, database operations ve API documentation incelenec
 """
 
 import asyncio
+import base64
 import hashlib
+import inspect
 import secrets
+import typing
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from decimal import Decimal
+from typing import List, Optional, Dict, Any, Tuple, Callable, Awaitable, Iterator
 from dataclasses import dataclass
 from enum import Enum
 import json
 import uuid
 from contextlib import asynccontextmanager
+from collections import defaultdict
+import bisect
+import heapq
+import math
+import re
+import sqlite3
 import time
 
 # Simulated external dependencies (in real project these would be actual imports)
@@ -39,9 +49,33 @@ class HTTPException(Exception):
 
 print("=== FastAPI Application Structure ===")
 
+def _json_default(value: Any) -> Any:
+    """JSON fallback for values the C encoder cannot handle"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)  # Keep exact precision for money values
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, BaseModel):
+        return value.json_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+# Shared encoder: compact separators, no per-call encoder construction
+_JSON_ENCODER = json.JSONEncoder(default=_json_default, ensure_ascii=False,
+                                 separators=(",", ":"))
+
+def encode_json(value: Any) -> str:
+    """Encode value (models included) as compact JSON text"""
+    if isinstance(value, BaseModel):
+        value = value.json_dict()
+    return _JSON_ENCODER.encode(value)
+
 class APIResponse:
     """Standardized API response structure"""
     
+    __slots__ = ("success", "data", "message", "errors", "pagination", "timestamp")
+    
     def __init__(self, success: bool = True, data: Any = None, 
                  message: str = "", errors: List[str] = None, 
                  pagination: Dict = None):
@@ -70,6 +104,33 @@ class APIResponse:
             result["pagination"] = self.pagination
         
         return result
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialize response straight to UTF-8 JSON bytes"""
+        return b"".join(self.iter_json_bytes())
+    
+    def iter_json_bytes(self, batch_size: int = 100) -> Iterator[bytes]:
+        """Stream response as JSON chunks; list data is encoded in batches"""
+        envelope = self.to_dict()
+        data = envelope.pop("data", None)
+        head = _JSON_ENCODER.encode(envelope)
+        
+        if data is None:
+            yield head.encode()
+            return
+        
+        if not isinstance(data, list):
+            yield f'{head[:-1]},"data":{encode_json(data)}}}'.encode()
+            return
+        
+        yield f'{head[:-1]},"data":['.encode()
+        for start in range(0, len(data), batch_size):
+            # One encoder call per batch; strip the batch's own brackets
+            batch = [item.json_dict() if isinstance(item, BaseModel) else item
+                     for item in data[start:start + batch_size]]
+            chunk = _JSON_ENCODER.encode(batch)[1:-1]
+            yield (chunk if start == 0 else "," + chunk).encode()
+        yield b"]}"
 
 class HTTPStatus(Enum):
     """HTTP Status codes"""
@@ -84,6 +145,19 @@ class HTTPStatus(Enum):
     UNPROCESSABLE_ENTITY = 422
     INTERNAL_SERVER_ERROR = 500
 
+def _iso_or_none(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+def _decimal_or_none(value: Optional[Decimal]) -> Optional[str]:
+    return str(value) if value is not None else None
+
+def _add_extra_attributes(obj: Any, data: dict) -> dict:
+    """Add public attributes set outside __init__ (generic __dict__ behaviour)"""
+    for key, value in obj.__dict__.items():
+        if key not in data and not key.startswith('_'):
+            data[key] = value
+    return data
+
 class BaseModel:
     """Base Pydantic-like model"""
     
@@ -91,9 +165,74 @@ class BaseModel:
         for key, value in kwargs.items():
             setattr(self, key, value)
     
+    @classmethod
+    def _compile_serializers(cls) -> Tuple[Optional[Callable], Optional[Callable]]:
+        """Generate dict/JSON serializers once from the model's __init__ fields"""
+        parameters = list(inspect.signature(cls.__init__).parameters.values())[1:]
+        
+        # Models taking **kwargs have no fixed field list: use the generic path
+        if not parameters or any(p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in parameters):
+            cls._serializers = (None, None)
+            return cls._serializers
+        
+        dict_items = []
+        json_items = []
+        for parameter in parameters:
+            name = parameter.name
+            annotation_types = typing.get_args(parameter.annotation) or (parameter.annotation,)
+            dict_items.append(f"{name!r}: obj.{name}")
+            
+            # Per-field conversions are resolved here, not on every call
+            if datetime in annotation_types:
+                json_items.append(f"{name!r}: _iso(obj.{name})")
+            elif Decimal in annotation_types:
+                json_items.append(f"{name!r}: _decimal(obj.{name})")
+            else:
+                json_items.append(f"{name!r}: obj.{name}")
+        
+        # Attributes added after construction are still included: the
+        # attribute-count check keeps the common case to one len() call
+        field_count = len(parameters)
+        source = (
+            f"def to_dict(obj):\n    data = {{{', '.join(dict_items)}}}\n"
+            f"    if len(obj.__dict__) != {field_count}:\n        _extras(obj, data)\n"
+            f"    return data\n"
+            f"def to_json_dict(obj):\n    data = {{{', '.join(json_items)}}}\n"
+            f"    if len(obj.__dict__) != {field_count}:\n        _extras(obj, data)\n"
+            f"    return data\n"
+        )
+        namespace = {"_iso": _iso_or_none, "_decimal": _decimal_or_none,
+                     "_extras": _add_extra_attributes}
+        exec(compile(source, f"<serializer {cls.__name__}>", "exec"), namespace)
+        
+        cls._serializers = (namespace["to_dict"], namespace["to_json_dict"])
+        return cls._serializers
+    
+    def _get_serializers(self) -> Tuple[Optional[Callable], Optional[Callable]]:
+        serializers = type(self).__dict__.get("_serializers")
+        if serializers is None:
+            serializers = type(self)._compile_serializers()
+        return serializers
+    
     def dict(self):
+        to_dict, _ = self._get_serializers()
+        if to_dict is not None:
+            return to_dict(self)
+        
         return {key: value for key, value in self.__dict__.items() 
                 if not key.startswith('_')}
+    
+    def json_dict(self) -> dict:
+        """Dictionary with JSON-ready values (datetime/Decimal converted)"""
+        _, to_json_dict = self._get_serializers()
+        if to_json_dict is not None:
+            return to_json_dict(self)
+        
+        return self.dict()
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialize model straight to UTF-8 JSON bytes"""
+        return _JSON_ENCODER.encode(self.json_dict()).encode()
 
 # Request/Response Models
 class UserCreate(BaseModel):
@@ -539,12 +678,18 @@ class DatabaseConnection:
         print(f"📝 Executing query: {query}")
         
         # Mock results based on query type
+        if "COUNT(" in query.upper():
+            return [{"count": 1}]
+        
         if "SELECT" in query.upper():
             if "users" in query.lower():
                 return [{"id": 1, "email": "alice@example.com", "first_name": "Alice"}]
             elif "products" in query.lower():
                 return [{"id": 1, "name": "Product A", "price": 29.99}]
         
+        if query.lstrip().upper().startswith(("UPDATE", "DELETE")):
+            return 1  # Affected rows
+        
         return []
     
     async def execute_many(self, query: str, params_list: List[tuple]) -> int:
@@ -556,22 +701,289 @@ class DatabaseConnection:
         print(f"📝 Executing batch query: {query} ({len(params_list)} rows)")
         return len(params_list)
 
+class SQLiteDatabaseConnection(DatabaseConnection):
+    """SQLite-backed connection with real SQL semantics (demos and benchmarks)"""
+    
+    def __init__(self, database: str = ":memory:", echo: bool = False):
+        super().__init__(f"sqlite:///{database}")
+        self.database = database
+        self.echo = echo
+        self.connection = None
+        self.query_count = 0
+    
+    async def connect(self):
+        """Open SQLite connection in autocommit mode"""
+        self.connection = sqlite3.connect(self.database, isolation_level=None)
+        self.connection.row_factory = sqlite3.Row
+        self.connected = True
+    
+    async def disconnect(self):
+        """Close SQLite connection"""
+        if self.connection:
+            self.connection.close()
+        self.connection = None
+        self.connected = False
+    
+    async def execute(self, query: str, params: tuple = None) -> Any:
+        """Execute query; rows for SELECT, lastrowid for INSERT, rowcount otherwise"""
+        if not self.connected:
+            raise Exception("Database not connected")
+        
+        # Yield to the event loop like a network round trip would
+        await asyncio.sleep(0)
+        self.query_count += 1
+        if self.echo:
+            print(f"📝 Executing query: {query}")
+        
+        cursor = self.connection.execute(query, params or ())
+        verb = query.lstrip().split(None, 1)[0].upper()
+        if verb in ("SELECT", "WITH"):
+            return [dict(row) for row in cursor.fetchall()]
+        if verb == "INSERT":
+            return cursor.lastrowid
+        return cursor.rowcount
+    
+    async def execute_many(self, query: str, params_list: List[tuple]) -> int:
+        """Execute query with multiple parameter sets"""
+        if not self.connected:
+            raise Exception("Database not connected")
+        
+        await asyncio.sleep(0)
+        cursor = self.connection.executemany(query, params_list)
+        return cursor.rowcount
+
+class SingleFlight:
+    """Merge concurrent identical calls into one in-flight future"""
+    
+    def __init__(self, micro_ttl: float = 0.0, max_cached: int = 10000):
+        self.micro_ttl = micro_ttl
+        self.max_cached = max_cached
+        self._in_flight: Dict[Any, asyncio.Future] = {}
+        self._recent: Dict[Any, Tuple[Any, float]] = {}  # key -> (result, completed_at)
+        self.stats = {"calls": 0, "executions": 0, "shared": 0, "cached": 0}
+    
+    async def do(self, key: Any, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run func once per key at a time; concurrent callers share its result"""
+        self.stats["calls"] += 1
+        
+        if self.micro_ttl > 0:
+            cached = self._recent.get(key)
+            if cached is not None and time.monotonic() - cached[1] < self.micro_ttl:
+                self.stats["cached"] += 1
+                return cached[0]
+        
+        while True:
+            future = self._in_flight.get(key)
+            if future is None:
+                break
+            self.stats["shared"] += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The leader was cancelled (e.g. its client disconnected):
+                # retry and let one of the waiters run the call instead.
+                # Our own cancellation still propagates.
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+        
+        self.stats["executions"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        else:
+            future.set_result(result)
+            # Don't cache a read that was invalidated while in flight
+            if self.micro_ttl > 0 and self._in_flight.get(key) is future:
+                self._remember(key, result)
+            return result
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+    
+    def _remember(self, key: Any, result: Any):
+        """Cache result for micro_ttl, pruning expired entries when full"""
+        now = time.monotonic()
+        if len(self._recent) >= self.max_cached:
+            self._recent = {k: v for k, v in self._recent.items()
+                            if now - v[1] < self.micro_ttl}
+        self._recent[key] = (result, now)
+    
+    def invalidate(self, key: Any):
+        """Forget cached and in-flight results for key (call after writes)"""
+        self._recent.pop(key, None)
+        self._in_flight.pop(key, None)
+
+class BatchLoader:
+    """DataLoader-style batcher: keys requested in one loop tick share one query"""
+    
+    def __init__(self, batch_fn: Callable[[List[Any]], Awaitable[Dict[Any, Any]]],
+                 max_batch_size: int = 500):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[Any, asyncio.Future] = {}
+        self._dispatch_scheduled = False
+        self._running = set()
+        self.stats = {"loads": 0, "batches": 0}
+    
+    async def load(self, key: Any) -> Any:
+        """Queue key for the next batch and wait for its value"""
+        self.stats["loads"] += 1
+        future = self._pending.get(key)
+        
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            
+            if not self._dispatch_scheduled:
+                # Runs after every callback already queued in this tick
+                self._dispatch_scheduled = True
+                loop.call_soon(self._dispatch)
+        
+        # The future is shared by every caller of this key: one caller being
+        # cancelled must not cancel it for the others
+        return await asyncio.shield(future)
+    
+    def _dispatch(self):
+        """Split pending keys into batches and run them"""
+        pending, self._pending = self._pending, {}
+        self._dispatch_scheduled = False
+        
+        keys = list(pending)
+        for start in range(0, len(keys), self.max_batch_size):
+            batch = {key: pending[key] for key in keys[start:start + self.max_batch_size]}
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+    
+    async def _run_batch(self, batch: Dict[Any, asyncio.Future]):
+        """Load one batch and resolve its futures"""
+        self.stats["batches"] += 1
+        try:
+            results = await self.batch_fn(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(key))
+
+class ReadCoalescer:
+    """Single-flight and batched primary key reads for a repository"""
+    
+    def __init__(self, repository: 'BaseRepository', micro_ttl: float = 0.0,
+                 max_batch_size: int = 500):
+        self.repository = repository
+        self.max_batch_size = max_batch_size
+        self.single_flight = SingleFlight(micro_ttl)
+        self._loaders: Dict[str, BatchLoader] = {}
+    
+    def _loader(self, table: str) -> BatchLoader:
+        loader = self._loaders.get(table)
+        if loader is None:
+            async def batch_fn(ids: List[int]) -> Dict[int, dict]:
+                return await self.repository.get_many_by_ids(table, ids)
+            
+            loader = self._loaders[table] = BatchLoader(batch_fn, self.max_batch_size)
+        return loader
+    
+    async def get(self, table: str, id: int) -> Optional[dict]:
+        """Get row through single-flight, then through the per-table batcher"""
+        return await self.single_flight.do((table, id), lambda: self._loader(table).load(id))
+    
+    def invalidate(self, table: str, id: int):
+        self.single_flight.invalidate((table, id))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "single_flight": dict(self.single_flight.stats),
+            "batches": {table: dict(loader.stats) for table, loader in self._loaders.items()}
+        }
+
 class BaseRepository:
     """Base repository pattern"""
     
     def __init__(self, db_connection: DatabaseConnection):
         self.db = db_connection
+        self.read_coalescer: Optional[ReadCoalescer] = None
+    
+    def enable_read_coalescing(self, micro_ttl: float = 0.0,
+                               max_batch_size: int = 500) -> ReadCoalescer:
+        """Route get_by_id through single-flight and a WHERE id IN (...) batcher"""
+        self.read_coalescer = ReadCoalescer(self, micro_ttl, max_batch_size)
+        return self.read_coalescer
+    
+    def _invalidate(self, table: str, id: int):
+        if self.read_coalescer is not None:
+            self.read_coalescer.invalidate(table, id)
     
     async def get_by_id(self, table: str, id: int) -> Optional[dict]:
         """Get record by ID"""
+        if self.read_coalescer is not None:
+            row = await self.read_coalescer.get(table, id)
+            # Callers share one row: hand each a copy
+            return dict(row) if row is not None else None
+        
         query = f"SELECT * FROM {table} WHERE id = ?"
         results = await self.db.execute(query, (id,))
         return results[0] if results else None
     
-    async def get_all(self, table: str, limit: int = 100, offset: int = 0) -> List[dict]:
+    async def get_many_by_ids(self, table: str, ids: List[int]) -> Dict[int, dict]:
+        """Get records for several IDs with a single query"""
+        if not ids:
+            return {}
+        
+        placeholders = ", ".join("?" for _ in ids)
+        query = f"SELECT * FROM {table} WHERE id IN ({placeholders})"
+        results = await self.db.execute(query, tuple(ids))
+        return {row["id"]: row for row in results}
+    
+    def _where_clause(self, filters: Dict[str, Any] = None,
+                      conditions: List[str] = None, params: List[Any] = None) -> Tuple[str, List[Any]]:
+        """Build WHERE clause from equality filters"""
+        conditions = list(conditions or [])
+        params = list(params or [])
+        for column, value in (filters or {}).items():
+            conditions.append(f"{column} = ?")
+            params.append(value)
+        
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+    
+    async def get_all(self, table: str, limit: int = 100, offset: int = 0,
+                      filters: Dict[str, Any] = None) -> List[dict]:
         """Get all records with pagination"""
-        query = f"SELECT * FROM {table} LIMIT ? OFFSET ?"
-        return await self.db.execute(query, (limit, offset))
+        where, params = self._where_clause(filters)
+        query = f"SELECT * FROM {table}{where} ORDER BY id LIMIT ? OFFSET ?"
+        return await self.db.execute(query, tuple(params + [limit, offset]))
+    
+    async def get_page_after(self, table: str, after_id: int = 0, limit: int = 100,
+                             filters: Dict[str, Any] = None) -> List[dict]:
+        """Keyset pagination: next rows after the last seen id"""
+        # Seeks the primary key index instead of scanning OFFSET rows,
+        # so page 1000 costs the same as page 1
+        where, params = self._where_clause(filters, ["id > ?"], [after_id])
+        query = f"SELECT * FROM {table}{where} ORDER BY id LIMIT ?"
+        return await self.db.execute(query, tuple(params + [limit]))
+    
+    async def count(self, table: str, filters: Dict[str, Any] = None) -> int:
+        """Count records"""
+        where, params = self._where_clause(filters)
+        results = await self.db.execute(f"SELECT COUNT(*) AS count FROM {table}{where}", tuple(params))
+        return results[0]["count"] if results else 0
     
     async def create(self, table: str, data: dict) -> int:
         """Create new record"""
@@ -579,7 +991,10 @@ class BaseRepository:
         placeholders = ", ".join(["?" for _ in data.values()])
         query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
         
-        await self.db.execute(query, tuple(data.values()))
+        row_id = await self.db.execute(query, tuple(data.values()))
+        if isinstance(row_id, int):
+            return row_id
+        
         # Return mock ID
         return len(data)  # Simplified
     
@@ -589,12 +1004,14 @@ class BaseRepository:
         query = f"UPDATE {table} SET {set_clause} WHERE id = ?"
         
         await self.db.execute(query, tuple(list(data.values()) + [id]))
+        self._invalidate(table, id)
         return True
     
     async def delete(self, table: str, id: int) -> bool:
         """Delete record"""
         query = f"DELETE FROM {table} WHERE id = ?"
         await self.db.execute(query, (id,))
+        self._invalidate(table, id)
         return True
 
 class UserRepository(BaseRepository):
@@ -645,22 +1062,245 @@ class UserRepository(BaseRepository):
         
         return True
 
+# Turkish-aware search normalization: dotted/dotless I first, then fold
+# diacritics so that "isikli" matches "Işıklı"
+_TURKISH_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+_TURKISH_FOLD = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+def normalize_search_text(text: str) -> str:
+    """Lowercase with Turkish rules and fold diacritics"""
+    return text.translate(_TURKISH_LOWER).lower().translate(_TURKISH_FOLD)
+
+class ProductSearchIndex:
+    """In-process inverted index for ranked, prefix and paginated product search
+    
+    Only active products are indexed, so hit counts and pages never include
+    rows the listing would filter out afterwards.
+    """
+    
+    FIELD_WEIGHTS = {"name": 3.0, "description": 1.0}
+    
+    def __init__(self, max_prefix_expansions: Optional[int] = 64):
+        # Short prefixes can match thousands of terms; None means unbounded
+        self.max_prefix_expansions = max_prefix_expansions
+        self._postings: Dict[str, Dict[int, float]] = {}  # term -> {product_id: weight}
+        self._doc_terms: Dict[int, set] = {}
+        # Sorted vocabulary for prefix lookups. New terms are appended to
+        # _new_terms and merged with one sort before the next lookup, so a
+        # bulk build costs O(V log V) instead of an O(V) insort per term.
+        self._terms: List[str] = []
+        self._new_terms: List[str] = []
+        self._removed_terms: set = set()  # still in _terms, no longer indexed
+    
+    @staticmethod
+    def tokenize(text: Optional[str]) -> List[str]:
+        """Split normalized text into search terms"""
+        return _TOKEN_PATTERN.findall(normalize_search_text(text or ""))
+    
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+    
+    def index_product(self, product_id: int, name: str, description: Optional[str] = None,
+                      is_active: bool = True):
+        """Add or re-index a product (inactive products are removed)"""
+        self.remove_product(product_id)
+        if not is_active:
+            return
+        
+        weights = defaultdict(float)
+        for field_name, text in (("name", name), ("description", description)):
+            field_weight = self.FIELD_WEIGHTS[field_name]
+            for term in self.tokenize(text):
+                weights[term] += field_weight
+        
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                if term in self._removed_terms:
+                    self._removed_terms.discard(term)
+                else:
+                    self._new_terms.append(term)
+            postings[product_id] = weight
+        
+        self._doc_terms[product_id] = set(weights)
+    
+    def remove_product(self, product_id: int):
+        """Remove product from the index"""
+        terms = self._doc_terms.pop(product_id, None)
+        if not terms:
+            return
+        
+        for term in terms:
+            postings = self._postings[term]
+            del postings[product_id]
+            if not postings:
+                del self._postings[term]
+                self._removed_terms.add(term)
+    
+    def _sorted_terms(self) -> List[str]:
+        """Merge pending vocabulary changes into the sorted term list"""
+        if self._new_terms:
+            # Timsort merges the sorted run and the appended run in ~O(V)
+            self._terms.extend(self._new_terms)
+            self._terms.sort()
+            self._new_terms = []
+        if len(self._removed_terms) > len(self._terms) // 2:
+            self._terms = [term for term in self._terms if term in self._postings]
+            self._removed_terms = set()
+        return self._terms
+    
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        """Indexed terms starting with prefix, capped at max_prefix_expansions
+        
+        Over the cap, the terms with the most documents are kept. That keeps
+        scoring cost bounded for one- or two-letter prefixes, at the price of
+        missing products matched only by rarer completions (hit counts are
+        then a lower bound); the next keystroke narrows the prefix again.
+        """
+        terms_list = self._sorted_terms()
+        terms = []
+        i = bisect.bisect_left(terms_list, prefix)
+        while i < len(terms_list) and terms_list[i].startswith(prefix):
+            if terms_list[i] in self._postings:
+                terms.append(terms_list[i])
+            i += 1
+        
+        limit = self.max_prefix_expansions
+        if limit is not None and len(terms) > limit:
+            terms = heapq.nlargest(limit, terms, key=lambda term: len(self._postings[term]))
+        return terms
+    
+    def search(self, query: str, limit: int = 20, offset: int = 0,
+               prefix: bool = True) -> Tuple[List[Tuple[int, float]], int]:
+        """Return one page of (product_id, score) and the total number of hits"""
+        tokens = self.tokenize(query)
+        if not tokens:
+            return [], 0
+        
+        doc_count = len(self._doc_terms)
+        token_terms = []
+        
+        for position, token in enumerate(tokens):
+            # Last token is treated as a prefix (search-as-you-type)
+            if prefix and position == len(tokens) - 1:
+                terms = self._expand_prefix(token)
+            else:
+                terms = [token] if token in self._postings else []
+            
+            if not terms:
+                return [], 0
+            token_terms.append(terms)
+        
+        # All tokens must match: score the rarest token's postings, then only
+        # probe the surviving candidates for the others, so the cost follows
+        # the result size rather than the catalog size
+        token_terms.sort(key=lambda terms: sum(len(self._postings[t]) for t in terms))
+        
+        hits: Dict[int, float] = {}
+        for term in token_terms[0]:
+            postings = self._postings[term]
+            idf = math.log(1 + doc_count / len(postings))
+            for product_id, weight in postings.items():
+                score = weight * idf
+                if score > hits.get(product_id, 0.0):
+                    hits[product_id] = score
+        
+        for terms in token_terms[1:]:
+            term_postings = [
+                (self._postings[term], math.log(1 + doc_count / len(self._postings[term])))
+                for term in terms
+            ]
+            matched = {}
+            for product_id, score in hits.items():
+                best = max((postings[product_id] * idf for postings, idf in term_postings
+                            if product_id in postings), default=None)
+                if best is not None:
+                    matched[product_id] = score + best
+            hits = matched
+            if not hits:
+                return [], 0
+        
+        top = heapq.nlargest(offset + limit, hits.items(), key=lambda item: (item[1], -item[0]))
+        return top[offset:offset + limit], len(hits)
+
 class ProductRepository(BaseRepository):
     """Product repository"""
     
+    def __init__(self, db_connection: DatabaseConnection,
+                 search_index: Optional[ProductSearchIndex] = None):
+        super().__init__(db_connection)
+        self.search_index = search_index
+    
     async def get_by_category(self, category_id: int) -> List[dict]:
         """Get products by category"""
         query = "SELECT * FROM products WHERE category_id = ? AND is_active = true"
         return await self.db.execute(query, (category_id,))
     
-    async def search_products(self, search_term: str) -> List[dict]:
-        """Search products by name or description"""
-        query = """
-        SELECT * FROM products 
-        WHERE (name LIKE ? OR description LIKE ?) AND is_active = true
-        """
-        pattern = f"%{search_term}%"
-        return await self.db.execute(query, (pattern, pattern))
+    async def search_products(self, search_term: str, limit: int = 20,
+                              offset: int = 0) -> List[dict]:
+        """Search products by name or description (ranked when an index is attached)"""
+        if self.search_index is None:
+            query = """
+            SELECT * FROM products 
+            WHERE (name LIKE ? OR description LIKE ?) AND is_active = true
+            LIMIT ? OFFSET ?
+            """
+            pattern = f"%{search_term}%"
+            return await self.db.execute(query, (pattern, pattern, limit, offset))
+        
+        ranked, _ = self.search_index.search(search_term, limit, offset)
+        if not ranked:
+            return []
+        
+        # Fetch only the page by primary key, then restore rank order
+        product_ids = [product_id for product_id, _ in ranked]
+        placeholders = ", ".join("?" for _ in product_ids)
+        query = f"SELECT * FROM products WHERE id IN ({placeholders}) AND is_active = true"
+        rows = await self.db.execute(query, tuple(product_ids))
+        
+        rows_by_id = {row["id"]: row for row in rows}
+        return [rows_by_id[product_id] for product_id in product_ids if product_id in rows_by_id]
+    
+    async def count_products(self, category_id: Optional[int] = None,
+                             search: Optional[str] = None) -> int:
+        """Count products matching a listing"""
+        if search:
+            if self.search_index is not None:
+                _, total = self.search_index.search(search, limit=0)
+                return total
+            
+            pattern = f"%{search}%"
+            results = await self.db.execute(
+                "SELECT COUNT(*) AS count FROM products "
+                "WHERE (name LIKE ? OR description LIKE ?) AND is_active = true",
+                (pattern, pattern)
+            )
+            return results[0]["count"] if results else 0
+        
+        if category_id:
+            return await self.count("products", {"category_id": category_id, "is_active": True})
+        
+        return await self.count("products")
+    
+    async def rebuild_search_index(self, batch_size: int = 1000):
+        """Build the search index from the products table"""
+        if self.search_index is None:
+            return
+        
+        last_id = 0
+        while True:
+            rows = await self.db.execute(
+                "SELECT id, name, description, is_active FROM products WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size)
+            )
+            if not rows:
+                break
+            for row in rows:
+                self.search_index.index_product(row["id"], row["name"], row["description"],
+                                                bool(row["is_active"]))
+            last_id = rows[-1]["id"]
     
     async def create_product(self, product_data: ProductCreate) -> ProductResponse:
         """Create new product"""
@@ -676,6 +1316,10 @@ class ProductRepository(BaseRepository):
         
         product_id = await self.create("products", data)
         
+        if self.search_index is not None:
+            self.search_index.index_product(product_id, product_data.name,
+                                            product_data.description)
+        
         return ProductResponse(
             id=product_id,
             name=product_data.name,
@@ -686,20 +1330,138 @@ class ProductRepository(BaseRepository):
         )
     
     async def update_stock(self, product_id: int, quantity_change: int) -> bool:
-        """Update product stock"""
-        # In real implementation, this would be atomic
+        """Update product stock atomically with a single conditional UPDATE"""
+        # The database applies the change and the non-negative guard in one
+        # statement, so concurrent orders cannot overwrite each other
+        query = """
+        UPDATE products
+        SET stock_quantity = stock_quantity + ?, updated_at = ?
+        WHERE id = ? AND stock_quantity + ? >= 0
+        """
+        affected = await self.db.execute(
+            query, (quantity_change, datetime.utcnow(), product_id, quantity_change)
+        )
+        if affected:
+            self._invalidate("products", product_id)
+            return True
+        
+        # No row matched: find out why (only the failure path pays a second query)
         product = await self.get_by_id("products", product_id)
         if not product:
             return False
         
-        new_quantity = product.get("stock_quantity", 0) + quantity_change
-        if new_quantity < 0:
-            raise ValueError("Insufficient stock")
-        
-        return await self.update("products", product_id, {
-            "stock_quantity": new_quantity,
+        raise ValueError("Insufficient stock")
+    
+    async def update_product(self, product_id: int, data: dict) -> bool:
+        """Update product fields and keep the search index in sync"""
+        success = await self.update("products", product_id, {
+            **data,
             "updated_at": datetime.utcnow()
         })
+        
+        if success and self.search_index is not None and \
+                ("name" in data or "description" in data or "is_active" in data):
+            product = await self.get_by_id("products", product_id)
+            if product:
+                self.search_index.index_product(product_id, product["name"],
+                                                product.get("description"),
+                                                bool(product["is_active"]))
+        
+        return success
+
+class StockReservationLedger:
+    """In-process ledger that coalesces small stock changes for hot SKUs"""
+    
+    def __init__(self, product_repository: ProductRepository,
+                 flush_interval: float = 0.005, max_pending: int = 256):
+        self.product_repository = product_repository
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[int, List[Tuple[int, asyncio.Future]]] = defaultdict(list)
+        self._pending_count = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        self.stats = {"reservations": 0, "writes": 0, "fallbacks": 0}
+    
+    async def reserve(self, product_id: int, quantity_change: int) -> bool:
+        """Queue stock change; resolves once its batch is written"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending[product_id].append((quantity_change, future))
+        self._pending_count += 1
+        self.stats["reservations"] += 1
+        
+        if self._pending_count >= self.max_pending:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        
+        return await future
+    
+    async def _flush_later(self):
+        """Flush pending changes after the coalescing window"""
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+        await self.flush()
+    
+    async def flush(self):
+        """Write all pending changes, one conditional UPDATE per SKU"""
+        pending, self._pending = self._pending, defaultdict(list)
+        self._pending_count = 0
+        
+        for product_id, entries in pending.items():
+            await self._apply(product_id, entries)
+    
+    async def _apply(self, product_id: int, entries: List[Tuple[int, asyncio.Future]]):
+        """Apply coalesced change, falling back to one-by-one on insufficient stock"""
+        # Cancelled callers no longer want their change
+        entries = [(change, future) for change, future in entries if not future.done()]
+        if not entries:
+            return
+        total_change = sum(change for change, _ in entries)
+        
+        try:
+            applied = await self.product_repository.update_stock(product_id, total_change)
+        except ValueError:
+            pass
+        except Exception as e:
+            for _, future in entries:
+                self._resolve(future, error=e)
+            return
+        else:
+            self.stats["writes"] += 1
+            for _, future in entries:
+                self._resolve(future, applied)
+            return
+        
+        # Combined change would oversell: apply in arrival order so that
+        # earlier reservations still succeed and only the overflow fails
+        self.stats["fallbacks"] += 1
+        for change, future in entries:
+            if future.done():
+                continue
+            try:
+                applied = await self.product_repository.update_stock(product_id, change)
+            except Exception as e:
+                self._resolve(future, error=e)
+            else:
+                self.stats["writes"] += 1
+                self._resolve(future, applied)
+    
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: Any = None, error: Exception = None):
+        """Settle a reservation unless its caller was cancelled during the write"""
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    
+    async def close(self):
+        """Cancel the scheduled flush and write everything still pending"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
 
 # Database service layer
 class UserService:
@@ -722,9 +1484,11 @@ class UserService:
         user_data = await self.user_repository.get_by_id("users", user_id)
         if not user_data:
             return None
-        
-        return UserResponse(**{k: v for k, v in user_data.items() 
-                             if k != "password_hash"})
+
+        # Only response fields: never password_hash, nor bookkeeping columns
+        fields = inspect.signature(UserResponse.__init__).parameters
+        return UserResponse(**{k: v for k, v in user_data.items()
+                             if k in fields and k != "self"})
     
     async def update_user_profile(self, user_id: int, user_data: UserUpdate) -> UserResponse:
         """Update user profile"""
@@ -745,9 +1509,21 @@ class UserService:
 print("Database integration örnekleri:")
 
 async def database_demo():
-    # Setup database connection
-    db = DatabaseConnection("postgresql://localhost/ecommerce")
+    # Setup database connection (SQLite, so inserted rows can be read back)
+    db = SQLiteDatabaseConnection(echo=True)
     await db.connect()
+    await db.execute("""
+    CREATE TABLE users (
+        id INTEGER PRIMARY KEY, email TEXT UNIQUE, password_hash TEXT,
+        first_name TEXT, last_name TEXT, phone TEXT, is_active BOOLEAN,
+        created_at TIMESTAMP, updated_at TIMESTAMP
+    )""")
+    await db.execute("""
+    CREATE TABLE products (
+        id INTEGER PRIMARY KEY, name TEXT, description TEXT, price REAL,
+        category_id INTEGER, stock_quantity INTEGER, is_active BOOLEAN,
+        created_at TIMESTAMP, updated_at TIMESTAMP
+    )""")
     
     # Setup repositories
     user_repo = UserRepository(db)
@@ -795,6 +1571,148 @@ async def database_demo():
 # Run database demo
 asyncio.run(database_demo())
 
+# Stock concurrency benchmark
+print("\nStock concurrency benchmark:")
+
+async def stock_concurrency_benchmark(orders: int = 500, initial_stock: int = 10000):
+    db = SQLiteDatabaseConnection()
+    await db.connect()
+    await db.execute("""
+    CREATE TABLE products (
+        id INTEGER PRIMARY KEY, name TEXT, description TEXT, price REAL,
+        category_id INTEGER, stock_quantity INTEGER, is_active BOOLEAN,
+        created_at TIMESTAMP, updated_at TIMESTAMP
+    )""")
+    product_repo = ProductRepository(db)
+    
+    async def reset_stock(quantity: int) -> int:
+        product = await product_repo.create_product(ProductCreate(
+            name="Hot SKU", description="Flash sale item", price=9.99,
+            category_id=1, stock_quantity=quantity
+        ))
+        return product.id
+    
+    async def current_stock(product_id: int) -> int:
+        product = await product_repo.get_by_id("products", product_id)
+        return product["stock_quantity"]
+    
+    try:
+        # 1. Legacy read-modify-write (get_by_id + update)
+        product_id = await reset_stock(initial_stock)
+        
+        async def read_modify_write():
+            product = await product_repo.get_by_id("products", product_id)
+            await product_repo.update("products", product_id, {
+                "stock_quantity": product["stock_quantity"] - 1
+            })
+        
+        start = time.perf_counter()
+        await asyncio.gather(*(read_modify_write() for _ in range(orders)))
+        duration = time.perf_counter() - start
+        lost = (await current_stock(product_id)) - (initial_stock - orders)
+        print(f"  read-modify-write : {duration*1000:7.1f}ms, lost updates: {lost}")
+        
+        # 2. Single conditional UPDATE
+        product_id = await reset_stock(initial_stock)
+        start = time.perf_counter()
+        await asyncio.gather(*(product_repo.update_stock(product_id, -1) for _ in range(orders)))
+        duration = time.perf_counter() - start
+        lost = (await current_stock(product_id)) - (initial_stock - orders)
+        print(f"  conditional UPDATE: {duration*1000:7.1f}ms, lost updates: {lost}")
+        
+        # 3. Reservation ledger (coalesced writes)
+        product_id = await reset_stock(initial_stock)
+        ledger = StockReservationLedger(product_repo)
+        start = time.perf_counter()
+        await asyncio.gather(*(ledger.reserve(product_id, -1) for _ in range(orders)))
+        duration = time.perf_counter() - start
+        lost = (await current_stock(product_id)) - (initial_stock - orders)
+        print(f"  reservation ledger: {duration*1000:7.1f}ms, lost updates: {lost}, "
+              f"writes: {ledger.stats['writes']}")
+        
+        # 4. Oversell protection: more orders than stock
+        product_id = await reset_stock(orders // 5)
+        results = await asyncio.gather(
+            *(ledger.reserve(product_id, -1) for _ in range(orders)),
+            return_exceptions=True
+        )
+        accepted = sum(1 for r in results if r is True)
+        print(f"  oversell check    : accepted {accepted}/{orders}, "
+              f"remaining stock: {await current_stock(product_id)}")
+        await ledger.close()
+    finally:
+        await db.disconnect()
+
+asyncio.run(stock_concurrency_benchmark())
+
+# Full-text product search
+print("\nFull-text product search:")
+
+async def product_search_demo():
+    db = SQLiteDatabaseConnection()
+    await db.connect()
+    await db.execute("""
+    CREATE TABLE products (
+        id INTEGER PRIMARY KEY, name TEXT, description TEXT, price REAL,
+        category_id INTEGER, stock_quantity INTEGER, is_active BOOLEAN,
+        created_at TIMESTAMP, updated_at TIMESTAMP
+    )""")
+    product_repo = ProductRepository(db, search_index=ProductSearchIndex())
+    
+    try:
+        catalog = [
+            ("Işıklı Mekanik Klavye", "RGB ışıklı, Türkçe Q klavye"),
+            ("İnce Laptop Çantası", "15.6 inç laptop için su geçirmez çanta"),
+            ("Gaming Laptop", "RTX 4080 ekran kartlı oyun bilgisayarı"),
+            ("Şarj Kablosu", "USB-C hızlı şarj kablosu, 2 metre"),
+            ("Kablosuz Mouse", "Sessiz tıklamalı kablosuz mouse"),
+        ]
+        for name, description in catalog:
+            await product_repo.create_product(ProductCreate(
+                name=name, description=description, price=99.9, category_id=1
+            ))
+        
+        for term in ["isikli", "LAPTOP", "kablo", "laptop çanta", "şarj kab"]:
+            products = await product_repo.search_products(term, limit=3)
+            print(f"  '{term}': {[p['name'] for p in products]}")
+        
+        # Incremental update: renamed product is found under its new name
+        await product_repo.update_product(5, {"name": "Ergonomik Mouse"})
+        products = await product_repo.search_products("ergonomik")
+        print(f"  after rename 'ergonomik': {[p['name'] for p in products]}")
+        
+        # Deactivated products leave the index: pages stay full, counts exact
+        await product_repo.update_product(3, {"is_active": False})
+        products = await product_repo.search_products("laptop")
+        total = await product_repo.count_products(search="laptop")
+        print(f"  after deactivating 'Gaming Laptop': {[p['name'] for p in products]} (total {total})")
+    finally:
+        await db.disconnect()
+    
+    # Latency stays flat as the catalog grows (selective query)
+    words = ["kablo", "laptop", "klavye", "mouse", "monitör", "kulaklık",
+             "çanta", "şarj", "telefon", "tablet", "kamera", "hoparlör"]
+    for catalog_size in (5000, 50000):
+        index = ProductSearchIndex()
+        build_start = time.perf_counter()
+        for product_id in range(1, catalog_size + 1):
+            index.index_product(
+                product_id,
+                f"{words[product_id % len(words)]} model{product_id}",
+                f"{words[(product_id * 7) % len(words)]} seri{product_id % 997}"
+            )
+        index.search("warmup")  # first lookup merges the new vocabulary
+        build_time = time.perf_counter() - build_start
+        start = time.perf_counter()
+        for _ in range(100):
+            index.search("model1237 lap", limit=20)
+        elapsed = (time.perf_counter() - start) / 100
+        _, prefix_hits = index.search("model1", limit=20)
+        print(f"  {catalog_size:>6} products: built in {build_time:.2f}s, "
+              f"{elapsed*1000:.3f}ms per search, 'model1*' matches {prefix_hits}")
+
+asyncio.run(product_search_demo())
+
 # =============================================================================
 # 4. API ENDPOINTS IMPLEMENTATION
 # =============================================================================
@@ -804,10 +1722,80 @@ print("\n=== API Endpoints Implementation ===")
 class PaginationParams:
     """Pagination parameters"""
     
-    def __init__(self, page: int = 1, limit: int = 20):
+    def __init__(self, page: int = 1, limit: int = 20, cursor: Optional[str] = None):
         self.page = max(1, page)
         self.limit = max(1, min(100, limit))  # Max 100 items per page
         self.offset = (self.page - 1) * self.limit
+        self.cursor = cursor
+
+def encode_cursor(last_id: int) -> str:
+    """Encode keyset position as an opaque cursor"""
+    payload = json.dumps({"v": 1, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    """Decode opaque cursor back to the keyset position"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = payload["id"]
+        if payload.get("v") != 1 or not isinstance(last_id, int):
+            raise ValueError("Unsupported cursor")
+        return last_id
+    except Exception:
+        raise HTTPException(400, "Invalid pagination cursor")
+
+class CountCache:
+    """Cached total counts refreshed in the background (stale-while-revalidate)"""
+    
+    def __init__(self, ttl_seconds: float = 30.0):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[int, float]] = {}  # key -> (count, loaded_at)
+        self._refreshing: Dict[str, asyncio.Task] = {}
+    
+    async def get(self, key: str, loader: Callable[[], Awaitable[int]]) -> Tuple[int, bool]:
+        """Return (count, is_estimate); stale values are served while refreshing"""
+        entry = self._entries.get(key)
+        
+        if entry is None:
+            # First request for this key has to wait for a real count
+            task = self._refreshing.get(key) or self._start_refresh(key, loader)
+            return await asyncio.shield(task), False
+        
+        count, loaded_at = entry
+        if time.monotonic() - loaded_at > self.ttl_seconds:
+            if key not in self._refreshing:
+                self._start_refresh(key, loader)
+            return count, True
+        
+        return count, False
+    
+    def _start_refresh(self, key: str, loader: Callable[[], Awaitable[int]]) -> asyncio.Task:
+        """Run loader in a background task and store its result"""
+        async def refresh() -> int:
+            try:
+                count = await loader()
+                self._entries[key] = (count, time.monotonic())
+                return count
+            finally:
+                self._refreshing.pop(key, None)
+        
+        task = asyncio.create_task(refresh())
+        task.add_done_callback(lambda t: self._report_failure(key, t))
+        self._refreshing[key] = task
+        return task
+    
+    @staticmethod
+    def _report_failure(key: str, task: asyncio.Task):
+        """Retrieve and log refresh errors; background refreshes have no awaiter"""
+        if not task.cancelled() and task.exception() is not None:
+            print(f"❌ Count refresh failed for {key}: {task.exception()}")
+    
+    def invalidate(self, prefix: str = ""):
+        """Mark cached counts stale so the next read refreshes them"""
+        for key, (count, _) in list(self._entries.items()):
+            if key.startswith(prefix):
+                self._entries[key] = (count, float("-inf"))
 
 class APIController:
     """Base API controller"""
@@ -906,15 +1894,34 @@ class UserController(APIController):
 class ProductController(APIController):
     """Product management API controller"""
     
-    def __init__(self, product_repository: ProductRepository):
+    def __init__(self, product_repository: ProductRepository,
+                 count_cache: Optional[CountCache] = None):
         super().__init__()
         self.product_repository = product_repository
+        self.count_cache = count_cache
+    
+    async def _total_count(self, category_id: Optional[int] = None,
+                           search: Optional[str] = None) -> Tuple[int, bool]:
+        """Total for a listing, served from the count cache when configured"""
+        async def loader() -> int:
+            return await self.product_repository.count_products(category_id, search)
+        
+        if self.count_cache is None:
+            return await loader(), False
+        
+        if search:
+            key = f"products:search:{' '.join(ProductSearchIndex.tokenize(search))}"
+        else:
+            key = f"products:category:{category_id or '*'}"
+        return await self.count_cache.get(key, loader)
     
     async def create_product(self, product_data: ProductCreate) -> APIResponse:
         """POST /api/v1/products"""
         
         async def handler():
             product = await self.product_repository.create_product(product_data)
+            if self.count_cache is not None:
+                self.count_cache.invalidate("products:")
             return product.dict()
         
         return await self.handle_request(handler)
@@ -936,27 +1943,49 @@ class ProductController(APIController):
         """GET /api/v1/products"""
         
         async def handler():
+            filters = {"category_id": category_id, "is_active": True} if category_id else None
+            next_cursor = None
+            
             if search:
-                products = await self.product_repository.search_products(search)
-            elif category_id:
-                products = await self.product_repository.get_by_category(category_id)
+                products = await self.product_repository.search_products(
+                    search, pagination.limit, pagination.offset
+                )
+                has_next = None
+            elif pagination.cursor is not None or pagination.page == 1:
+                # Keyset pagination: fetch one extra row to detect the next page
+                after_id = decode_cursor(pagination.cursor) if pagination.cursor else 0
+                rows = await self.product_repository.get_page_after(
+                    "products", after_id, pagination.limit + 1, filters
+                )
+                products = rows[:pagination.limit]
+                has_next = len(rows) > pagination.limit
+                if has_next:
+                    next_cursor = encode_cursor(products[-1]["id"])
             else:
+                # Page-number access kept for compatibility (OFFSET scan)
                 products = await self.product_repository.get_all(
-                    "products", pagination.limit, pagination.offset
+                    "products", pagination.limit, pagination.offset, filters
                 )
+                has_next = None
             
             # Calculate pagination info
-            total_count = len(products)  # Simplified
+            total_count, is_estimate = await self._total_count(category_id, search)
             total_pages = (total_count + pagination.limit - 1) // pagination.limit
+            if has_next is None:
+                has_next = pagination.page < total_pages
             
             pagination_info = {
-                "page": pagination.page,
                 "limit": pagination.limit,
                 "total": total_count,
+                "total_is_estimate": is_estimate,
                 "pages": total_pages,
-                "has_next": pagination.page < total_pages,
-                "has_prev": pagination.page > 1
+                "has_next": has_next,
+                "has_prev": pagination.cursor is not None or pagination.page > 1,
+                "next_cursor": next_cursor
             }
+            if pagination.cursor is None:
+                # Cursor pages have no page number
+                pagination_info = {"page": pagination.page, **pagination_info}
             
             return {
                 "products": products,
@@ -1092,6 +2121,138 @@ async def api_demo():
 # Run API demo
 asyncio.run(api_demo())
 
+# Keyset pagination demonstration
+print("\nKeyset pagination örnekleri:")
+
+async def keyset_pagination_demo(catalog_size: int = 50000, page_size: int = 20):
+    db = SQLiteDatabaseConnection()
+    await db.connect()
+    await db.execute("""
+    CREATE TABLE products (
+        id INTEGER PRIMARY KEY, name TEXT, description TEXT, price REAL,
+        category_id INTEGER, stock_quantity INTEGER, is_active BOOLEAN,
+        created_at TIMESTAMP, updated_at TIMESTAMP
+    )""")
+    await db.execute_many(
+        "INSERT INTO products (name, description, price, category_id, stock_quantity, is_active) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [(f"Product {i}", "Demo product", 9.99, i % 10, 100, True)
+         for i in range(1, catalog_size + 1)]
+    )
+    
+    product_repo = ProductRepository(db)
+    product_controller = ProductController(product_repo, count_cache=CountCache(ttl_seconds=60))
+    
+    try:
+        # Walk the first pages with opaque cursors
+        cursor = None
+        for page in range(1, 4):
+            response = await product_controller.list_products(
+                PaginationParams(limit=page_size, cursor=cursor)
+            )
+            ids = [product["id"] for product in response.data]
+            print(f"  page {page}: ids {ids[0]}..{ids[-1]}, total={response.pagination['total']}, "
+                  f"next_cursor={response.pagination['next_cursor']}")
+            cursor = response.pagination["next_cursor"]
+        
+        # Deep page: OFFSET scan vs keyset seek
+        deep_offset = catalog_size - page_size
+        start = time.perf_counter()
+        for _ in range(20):
+            await product_repo.get_all("products", page_size, deep_offset)
+        offset_time = (time.perf_counter() - start) / 20
+        
+        start = time.perf_counter()
+        for _ in range(20):
+            await product_repo.get_page_after("products", deep_offset, page_size)
+        keyset_time = (time.perf_counter() - start) / 20
+        
+        print(f"  deep page via OFFSET: {offset_time*1000:.3f}ms, via keyset: {keyset_time*1000:.3f}ms")
+    finally:
+        await db.disconnect()
+
+asyncio.run(keyset_pagination_demo())
+
+# Response serialization fast path
+print("\nResponse serialization örnekleri:")
+
+def serialization_benchmark(item_count: int = 1000, rounds: int = 20):
+    products = [
+        ProductResponse(id=i, name=f"Product {i}", description="Demo product",
+                        price=19.99, category_id=i % 10, stock_quantity=100)
+        for i in range(1, item_count + 1)
+    ]
+    
+    def generic():
+        # Previous approach: __dict__ comprehension + generic json.dumps
+        data = [{k: v for k, v in p.__dict__.items() if not k.startswith('_')} for p in products]
+        return json.dumps(APIResponse(data=data).to_dict(), default=str).encode()
+    
+    def fast_path():
+        return APIResponse(data=products).to_json_bytes()
+    
+    for label, func in (("generic json.dumps", generic), ("compiled serializers", fast_path)):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            payload = func()
+        elapsed = (time.perf_counter() - start) / rounds
+        print(f"  {label:<20}: {elapsed*1000:.2f}ms for {item_count} items ({len(payload)} bytes)")
+    
+    chunks = list(APIResponse(data=products).iter_json_bytes(batch_size=250))
+    print(f"  streamed in {len(chunks)} chunks, valid JSON: "
+          f"{len(json.loads(b''.join(chunks))['data']) == item_count}")
+
+serialization_benchmark()
+
+# Request coalescing for read endpoints
+print("\nRequest coalescing örnekleri:")
+
+async def read_coalescing_demo(concurrent_requests: int = 500):
+    db = SQLiteDatabaseConnection()
+    await db.connect()
+    await db.execute("""
+    CREATE TABLE products (
+        id INTEGER PRIMARY KEY, name TEXT, description TEXT, price REAL,
+        category_id INTEGER, stock_quantity INTEGER, is_active BOOLEAN,
+        created_at TIMESTAMP, updated_at TIMESTAMP
+    )""")
+    await db.execute_many(
+        "INSERT INTO products (name, price, category_id, stock_quantity, is_active) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [(f"Product {i}", 9.99, 1, 100, True) for i in range(1, 1001)]
+    )
+    
+    try:
+        for coalescing in (False, True):
+            product_repo = ProductRepository(db)
+            if coalescing:
+                coalescer = product_repo.enable_read_coalescing(micro_ttl=0.05)
+            
+            # Popular product page: identical concurrent reads
+            db.query_count = 0
+            await asyncio.gather(*(product_repo.get_by_id("products", 42)
+                                   for _ in range(concurrent_requests)))
+            hot_queries = db.query_count
+            
+            # Listing widgets: different ids in the same tick
+            db.query_count = 0
+            rows = await asyncio.gather(*(product_repo.get_by_id("products", product_id)
+                                          for product_id in range(1, 201)))
+            batch_queries = db.query_count
+            
+            label = "with coalescing" if coalescing else "without coalescing"
+            print(f"  {label:<19}: {concurrent_requests} hot reads -> {hot_queries} queries, "
+                  f"{len(rows)} distinct reads -> {batch_queries} queries")
+        
+        # Writes invalidate the micro-TTL cache
+        await product_repo.update_stock(42, -1)
+        product = await product_repo.get_by_id("products", 42)
+        print(f"  stock after write: {product['stock_quantity']}, stats: {coalescer.get_stats()}")
+    finally:
+        await db.disconnect()
+
+asyncio.run(read_coalescing_demo())
+
 print("\n" + "="*60)
 print("RESTFUL API GELİŞTİRME TAMAMLANDI")
 print("="*60)
@@ -14,8 +14,8 @@ import time
 import json
 import hashlib
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable, Generator
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Callable, Generator, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 import uuid
 import tempfile
@@ -25,6 +25,12 @@ import statistics
 import threading
 from collections import defaultdict
 import random
+import heapq
+import signal
+import sys
+import sysconfig
+import multiprocessing
+from multiprocessing.connection import wait as wait_for_connections
 
 # =============================================================================
 # 1. UNIT TESTING FRAMEWORK
@@ -63,6 +69,7 @@ class TestExecution:
     error_message: Optional[str] = None
     stack_trace: Optional[str] = None
     assertions_count: int = 0
+    cached: bool = False
     
     def to_dict(self) -> dict:
         """Convert to dictionary"""
@@ -72,8 +79,22 @@ class TestExecution:
             "execution_time": self.execution_time,
             "error_message": self.error_message,
             "stack_trace": self.stack_trace,
-            "assertions_count": self.assertions_count
+            "assertions_count": self.assertions_count,
+            "cached": self.cached
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'TestExecution':
+        """Create from to_dict() output"""
+        return cls(
+            test_name=data["test_name"],
+            result=TestResult(data["result"]),
+            execution_time=data["execution_time"],
+            error_message=data.get("error_message"),
+            stack_trace=data.get("stack_trace"),
+            assertions_count=data.get("assertions_count", 0),
+            cached=data.get("cached", False)
+        )
 
 class AssertionError(Exception):
     """Custom assertion error"""
@@ -160,6 +181,76 @@ class TestAssertions:
         except Exception as e:
             raise AssertionError(f"Expected {exception_class.__name__}, but got {type(e).__name__}: {str(e)}")
 
+class _TestTimeout(BaseException):
+    """Raised into a timed-out sync test; not an Exception, so a broad
+    ``except Exception`` in the test cannot swallow it"""
+
+def _call_with_timeout(function: Callable, timeout: Optional[float], *args):
+    """Call a sync function, stopping it after timeout seconds (None: no limit).
+    
+    On POSIX in the main thread SIGALRM interrupts the call. Elsewhere it
+    runs on a helper thread; on timeout the caller gets TimeoutError, but
+    the abandoned thread keeps running until the function returns.
+    """
+    if timeout is None:
+        return function(*args)
+    
+    if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        outcome = []
+        
+        def target():
+            try:
+                outcome.append((True, function(*args)))
+            except BaseException as e:
+                outcome.append((False, e))
+        
+        thread = threading.Thread(target=target, name="sync-test", daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if not outcome:
+            raise TimeoutError()
+        succeeded, value = outcome[0]
+        if not succeeded:
+            raise value
+        return value
+    
+    finished = False
+    
+    def on_timeout(signum, frame):
+        # An alarm delivered after the call returned must not fail the test
+        if not finished:
+            raise _TestTimeout()
+    
+    previous_handler = signal.signal(signal.SIGALRM, on_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        result = function(*args)
+        finished = True
+        return result
+    except _TestTimeout:
+        raise TimeoutError() from None
+    finally:
+        finished = True
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+def _test_shard_worker(connection, runner: 'TestRunner', tests: List['TestCase']):
+    """Worker process: run one shard, streaming each TestExecution back
+    
+    Tests of a shard share the process, so module-level state one test
+    leaves behind is visible to the next; shards are isolated from each
+    other (and from the parent), individual tests are not.
+    """
+    async def run():
+        for test_case in tests:
+            execution = await runner._execute_test(test_case, report=False)
+            connection.send(execution)
+    
+    try:
+        asyncio.run(run())
+    finally:
+        connection.close()
+
 class TestRunner:
     """Test runner implementation"""
     
@@ -169,6 +260,10 @@ class TestRunner:
         self.setup_functions: List[Callable] = []
         self.teardown_functions: List[Callable] = []
         self.parallel_execution = False
+        # > 1: shard tests across this many worker processes
+        self.worker_processes = 0
+        # test name -> last known duration, used to balance shards
+        self.duration_history: Dict[str, float] = {}
     
     def add_test(self, test_case: TestCase):
         """Add test case"""
@@ -209,7 +304,9 @@ class TestRunner:
                 return self._create_summary()
         
         # Run tests
-        if self.parallel_execution:
+        if self.worker_processes > 1:
+            await self._run_tests_in_processes(tests_to_run)
+        elif self.parallel_execution:
             await self._run_tests_parallel(tests_to_run)
         else:
             await self._run_tests_sequential(tests_to_run)
@@ -258,7 +355,93 @@ class TestRunner:
                 )
                 self.results.append(error_execution)
     
-    async def _execute_test(self, test_case: TestCase) -> TestExecution:
+    def _shard_tests(self, tests: List[TestCase], shard_count: int) -> List[List[TestCase]]:
+        """Longest-first greedy sharding by historical duration"""
+        known = sorted(self.duration_history.values())
+        default_duration = known[len(known) // 2] if known else 1.0
+        
+        shards = [[] for _ in range(shard_count)]
+        loads = [(0.0, index) for index in range(shard_count)]
+        ordered = sorted(tests, key=lambda t: self.duration_history.get(t.name, default_duration), reverse=True)
+        for test_case in ordered:
+            load, index = heapq.heappop(loads)
+            shards[index].append(test_case)
+            heapq.heappush(loads, (load + self.duration_history.get(test_case.name, default_duration), index))
+        return [shard for shard in shards if shard]
+    
+    async def _run_tests_in_processes(self, tests: List[TestCase]):
+        """Run shards in forked worker processes; results stream back as they finish"""
+        shards = self._shard_tests(tests, self.worker_processes)
+        print(f"🧵 Running {len(tests)} tests in {len(shards)} worker processes")
+        
+        context = multiprocessing.get_context("fork")
+        by_name = {test_case.name: test_case for test_case in tests}
+        pending: Dict[Any, List[str]] = {}
+        workers = []
+        
+        def start_worker(shard: List[TestCase]):
+            receiver, sender = context.Pipe(duplex=False)
+            worker = context.Process(target=_test_shard_worker, args=(sender, self, shard), daemon=True)
+            worker.start()
+            sender.close()
+            pending[receiver] = [test_case.name for test_case in shard]
+            workers.append(worker)
+        
+        for shard in shards:
+            start_worker(shard)
+        
+        def collect(connections: List[Any]) -> Tuple[List[TestExecution], List[Any]]:
+            executions, closed = [], []
+            for connection in wait_for_connections(connections, timeout=0.5):
+                try:
+                    executions.append(connection.recv())
+                except EOFError:
+                    closed.append(connection)
+                    continue
+                pending[connection].remove(executions[-1].test_name)
+            return executions, closed
+        
+        while pending:
+            executions, closed = await asyncio.to_thread(collect, list(pending))
+            for connection in closed:
+                connection.close()
+                remaining = pending.pop(connection)
+                if not remaining:
+                    continue
+                # Shards run in order, so the first unreported test is the one
+                # that took the worker down; the rest go to a fresh worker
+                crashed, *rest = remaining
+                executions.append(TestExecution(
+                    test_name=crashed,
+                    result=TestResult.ERROR,
+                    execution_time=0.0,
+                    error_message="Worker process crashed while running this test"
+                ))
+                if rest:
+                    print(f"♻️  Rescheduling {len(rest)} test(s) from a crashed worker")
+                    start_worker([by_name[name] for name in rest])
+            
+            for execution in executions:
+                self.results.append(execution)
+                self.duration_history[execution.test_name] = execution.execution_time
+                self._print_execution(execution)
+        
+        await asyncio.to_thread(lambda: [worker.join() for worker in workers])
+    
+    def _print_execution(self, execution: TestExecution):
+        """Print one test result"""
+        status_icon = {
+            TestResult.PASSED: "✅",
+            TestResult.FAILED: "❌", 
+            TestResult.SKIPPED: "⏭️",
+            TestResult.ERROR: "💥"
+        }
+        
+        print(f"{status_icon[execution.result]} {execution.test_name} ({execution.execution_time:.3f}s)")
+        if execution.error_message:
+            print(f"    {execution.error_message}")
+    
+    async def _execute_test(self, test_case: TestCase, report: bool = True) -> TestExecution:
         """Execute individual test"""
         start_time = time.time()
         assertions = TestAssertions()
@@ -279,13 +462,13 @@ class TestRunner:
                         timeout=test_case.timeout
                     )
                 else:
-                    test_case.test_function(assertions)
+                    _call_with_timeout(test_case.test_function, test_case.timeout, assertions)
                 
                 result = TestResult.PASSED
                 error_message = None
                 stack_trace = None
                 
-            except asyncio.TimeoutError:
+            except (asyncio.TimeoutError, TimeoutError):
                 result = TestResult.ERROR
                 error_message = f"Test timed out after {test_case.timeout} seconds"
                 stack_trace = None
@@ -322,17 +505,9 @@ class TestRunner:
                 assertions_count=assertions.assertion_count
             )
             
-            # Print result
-            status_icon = {
-                TestResult.PASSED: "✅",
-                TestResult.FAILED: "❌", 
-                TestResult.SKIPPED: "⏭️",
-                TestResult.ERROR: "💥"
-            }
-            
-            print(f"{status_icon[result]} {test_case.name} ({execution_time:.3f}s)")
-            if error_message:
-                print(f"    {error_message}")
+            if report:
+                self._print_execution(execution)
+            self.duration_history[test_case.name] = execution_time
             
             return execution
             
@@ -593,6 +768,26 @@ async def unit_testing_demo():
     print("Running only calculator tests:")
     runner.results.clear()  # Clear previous results
     await runner.run_tests(filter_tags=["calculator"])
+    
+    # Shard across worker processes, balanced by the durations recorded above;
+    # a sync test stuck in a loop is stopped by its timeout
+    def test_sync_hang(assertions: TestAssertions):
+        while True:
+            pass
+    
+    runner.add_test(TestCase(
+        name="test_sync_hang",
+        description="Sync test that never finishes",
+        test_function=test_sync_hang,
+        tags=["timeout"],
+        timeout=0.5
+    ))
+    
+    print(f"\n{'-'*40}")
+    print("Running in worker processes:")
+    runner.results.clear()
+    runner.worker_processes = 2
+    await runner.run_tests()
 
 # Run unit testing demo
 asyncio.run(unit_testing_demo())
@@ -994,10 +1189,17 @@ class PerformanceMetrics:
     p99_response_time: float
     requests_per_second: float
     error_rate: float
+    # Open-loop runs only: scheduled vs actually issued arrivals per second
+    intended_rate: Optional[float] = None
+    achieved_rate: Optional[float] = None
+    # Open-loop runs only: successful completions per second inside the
+    # issue window (drain time excluded) and the raw latency samples
+    completed_rate: Optional[float] = None
+    response_times: List[float] = field(default_factory=list, repr=False)
     
     def to_dict(self) -> dict:
         """Convert to dictionary"""
-        return {
+        result = {
             "test_name": self.test_name,
             "total_requests": self.total_requests,
             "successful_requests": self.successful_requests,
@@ -1012,6 +1214,186 @@ class PerformanceMetrics:
             "requests_per_second": self.requests_per_second,
             "error_rate_percent": self.error_rate * 100
         }
+        if self.intended_rate is not None:
+            result["intended_rate"] = self.intended_rate
+            result["achieved_rate"] = self.achieved_rate
+        if self.completed_rate is not None:
+            result["completed_rate"] = self.completed_rate
+        return result
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of integer nanoseconds.
+    
+    Values below 2**SUB_BUCKET_BITS are exact; above that each power of two
+    is split into 2**(SUB_BUCKET_BITS - 1) buckets (<0.8% relative error).
+    Bucket layout is fixed, so merging is exact: counts just add up.
+    """
+    
+    SUB_BUCKET_BITS = 8
+    
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.total_count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+    
+    @classmethod
+    def _index(cls, value_ns: int) -> int:
+        sub_buckets = 1 << cls.SUB_BUCKET_BITS
+        if value_ns < sub_buckets:
+            return value_ns
+        shift = value_ns.bit_length() - cls.SUB_BUCKET_BITS
+        half = sub_buckets >> 1
+        return sub_buckets + (shift - 1) * half + ((value_ns >> shift) - half)
+    
+    @classmethod
+    def _value(cls, index: int) -> int:
+        """Midpoint of the bucket's value range"""
+        sub_buckets = 1 << cls.SUB_BUCKET_BITS
+        if index < sub_buckets:
+            return index
+        half = sub_buckets >> 1
+        shift = (index - sub_buckets) // half + 1
+        mantissa = (index - sub_buckets) % half + half
+        return (mantissa << shift) + (1 << (shift - 1))
+    
+    def record(self, value_ns: int):
+        value_ns = max(int(value_ns), 0)
+        index = self._index(value_ns)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total_count += 1
+        self.total_ns += value_ns
+        if self.min_ns is None or value_ns < self.min_ns:
+            self.min_ns = value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+    
+    def merge(self, other: 'LatencyHistogram'):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self.total_ns += other.total_ns
+        if other.min_ns is not None and (self.min_ns is None or other.min_ns < self.min_ns):
+            self.min_ns = other.min_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+    
+    def quantile_ns(self, q: float) -> int:
+        if self.total_count == 0:
+            return 0
+        rank = q * (self.total_count - 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen > rank:
+                return min(max(self._value(index), self.min_ns), self.max_ns)
+        return self.max_ns
+    
+    def mean_ns(self) -> float:
+        return self.total_ns / self.total_count if self.total_count else 0.0
+
+def _load_worker(connection, test_function: Callable, concurrent_users: int,
+                 duration_seconds: float, rate_per_second: Optional[float]):
+    """Worker process: own event loop, own histogram, per-second stats over the pipe"""
+    
+    async def run():
+        histogram = LatencyHistogram()
+        interval = LatencyHistogram()
+        errors = 0
+        interval_errors = 0
+        start_ns = time.perf_counter_ns()
+        end_ns = start_ns + int(duration_seconds * 1e9)
+        
+        async def execute(intended_ns: int):
+            nonlocal errors, interval_errors
+            try:
+                await test_function()
+            except Exception:
+                errors += 1
+                interval_errors += 1
+            latency_ns = time.perf_counter_ns() - intended_ns
+            histogram.record(latency_ns)
+            interval.record(latency_ns)
+        
+        async def closed_loop_user():
+            while time.perf_counter_ns() < end_ns:
+                await execute(time.perf_counter_ns())
+        
+        async def open_loop_scheduler():
+            # At least 1ns: above 1e9/s a zero interval would never advance
+            interval_ns = max(1, int(1e9 / rate_per_second))
+            next_ns = start_ns
+            pending = set()
+            while next_ns < end_ns:
+                now_ns = time.perf_counter_ns()
+                if next_ns > now_ns:
+                    await asyncio.sleep((next_ns - now_ns) / 1e9)
+                    now_ns = time.perf_counter_ns()
+                while next_ns <= now_ns and next_ns < end_ns:
+                    task = asyncio.create_task(execute(next_ns))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                    next_ns += interval_ns
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        async def reporter():
+            nonlocal interval, interval_errors
+            second = 0
+            while True:
+                await asyncio.sleep(1.0)
+                second += 1
+                connection.send(("tick", second, interval, interval_errors))
+                interval = LatencyHistogram()
+                interval_errors = 0
+        
+        reporter_task = asyncio.create_task(reporter())
+        if rate_per_second:
+            await open_loop_scheduler()
+        else:
+            await asyncio.gather(*(closed_loop_user() for _ in range(concurrent_users)))
+        reporter_task.cancel()
+        
+        connection.send(("done", histogram, errors))
+    
+    try:
+        asyncio.run(run())
+    finally:
+        connection.close()
+
+def percentile(sorted_data: List[float], p: float) -> float:
+    """Linear-interpolated percentile (p in 0..100) of sorted data"""
+    if not sorted_data:
+        return 0
+    k = (len(sorted_data) - 1) * p / 100
+    f = int(k)
+    c = k - f
+    if f + 1 < len(sorted_data):
+        return sorted_data[f] * (1 - c) + sorted_data[f + 1] * c
+    return sorted_data[f]
+
+def bootstrap_ci(samples: List[float], statistic: Callable[[List[float]], float],
+                 confidence: float = 0.95, resamples: int = 1000,
+                 rng: random.Random = None,
+                 baseline: List[float] = None) -> Tuple[float, float]:
+    """Percentile bootstrap confidence interval for statistic(samples), or for
+    statistic(samples) / statistic(baseline) when baseline is given (the two
+    are resampled independently)"""
+    if baseline is None and len(samples) < 2:
+        value = statistic(samples) if samples else 0.0
+        return value, value
+    rng = rng or random.Random(0)
+    
+    def estimate() -> float:
+        value = statistic(rng.choices(samples, k=len(samples)))
+        if baseline is None:
+            return value
+        reference = statistic(rng.choices(baseline, k=len(baseline)))
+        return value / reference if reference > 0 else float("inf")
+    
+    estimates = sorted(estimate() for _ in range(resamples))
+    alpha = (1 - confidence) / 2
+    return percentile(estimates, alpha * 100), percentile(estimates, (1 - alpha) * 100)
 
 class LoadTester:
     """Load testing framework"""
@@ -1100,6 +1482,207 @@ class LoadTester:
         
         return metrics
     
+    async def run_open_loop_test(self, test_name: str, rate_per_second: float = None,
+                                 duration_seconds: float = None,
+                                 rate_schedule: List[Tuple[float, float]] = None,
+                                 verbose: bool = True) -> PerformanceMetrics:
+        """Run open-loop load test at a constant arrival rate or a
+        [(duration_seconds, rate_per_second), ...] schedule.
+        
+        Requests are issued at their scheduled time whether or not earlier
+        ones finished, and latency is measured from the intended start, so
+        a slow system shows up as latency instead of as less offered load.
+        """
+        if test_name not in self.test_functions:
+            raise ValueError(f"Test {test_name} not found")
+        if rate_schedule is None:
+            if rate_per_second is None or duration_seconds is None:
+                raise ValueError("Either rate_per_second and duration_seconds or rate_schedule is required")
+            rate_schedule = [(duration_seconds, rate_per_second)]
+        
+        total_seconds = sum(duration for duration, _ in rate_schedule)
+        if verbose:
+            print(f"\n🚀 Starting open-loop load test: {test_name}")
+            print(f"   Rate schedule: {', '.join(f'{rate:g}/s for {duration:g}s' for duration, rate in rate_schedule)}")
+        
+        test_function = self.test_functions[test_name]
+        response_times = []
+        errors = []
+        completed_ns = []  # finish times of successful requests
+        in_flight = set()
+        
+        async def issue(intended_ns: int):
+            try:
+                await test_function()
+            except Exception as e:
+                errors.append(str(e))
+            else:
+                completed_ns.append(time.perf_counter_ns())
+            response_times.append((time.perf_counter_ns() - intended_ns) / 1e9)
+        
+        start_ns = time.perf_counter_ns()
+        issued = 0
+        segment_start_ns = start_ns
+        
+        for duration, rate in rate_schedule:
+            segment_end_ns = segment_start_ns + int(duration * 1e9)
+            if rate <= 0:
+                # Idle segment: send nothing, but keep the schedule's timing
+                remaining_ns = segment_end_ns - time.perf_counter_ns()
+                if remaining_ns > 0:
+                    await asyncio.sleep(remaining_ns / 1e9)
+                segment_start_ns = segment_end_ns
+                continue
+            
+            # At least 1ns: above 1e9/s a zero interval would never advance
+            interval_ns = max(1, int(1e9 / rate))
+            next_ns = segment_start_ns
+            
+            while next_ns < segment_end_ns:
+                now_ns = time.perf_counter_ns()
+                if next_ns > now_ns:
+                    await asyncio.sleep((next_ns - now_ns) / 1e9)
+                    now_ns = time.perf_counter_ns()
+                
+                # Fire every arrival that is due; a late scheduler catches up
+                # instead of silently skipping load
+                while next_ns <= now_ns and next_ns < segment_end_ns:
+                    task = asyncio.create_task(issue(next_ns))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+                    issued += 1
+                    next_ns += interval_ns
+            
+            segment_start_ns = segment_end_ns
+        
+        issue_end_ns = time.perf_counter_ns()
+        issue_duration = (issue_end_ns - start_ns) / 1e9
+        completed_in_window = sum(1 for done_ns in completed_ns if done_ns <= issue_end_ns)
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        total_duration = (time.perf_counter_ns() - start_ns) / 1e9
+        
+        metrics = self._calculate_metrics(test_name, response_times, errors, total_duration)
+        scheduled = sum(int(duration * rate) for duration, rate in rate_schedule)
+        metrics.intended_rate = scheduled / total_seconds if total_seconds > 0 else 0
+        metrics.achieved_rate = issued / issue_duration if issue_duration > 0 else 0
+        metrics.completed_rate = completed_in_window / issue_duration if issue_duration > 0 else 0
+        metrics.response_times = response_times
+        
+        self.results.append(metrics)
+        if verbose:
+            self._print_metrics(metrics)
+        
+        return metrics
+    
+    async def run_multiprocess_load_test(self, test_name: str, processes: int,
+                                         concurrent_users: int, duration_seconds: float,
+                                         rate_per_second: float = None) -> PerformanceMetrics:
+        """Run load test from N worker processes, each with its own event loop.
+        
+        concurrent_users is per process (closed loop); rate_per_second is the
+        total open-loop rate split across processes. Workers are forked, so
+        registered closures work as-is (POSIX only).
+        """
+        if test_name not in self.test_functions:
+            raise ValueError(f"Test {test_name} not found")
+        
+        print(f"\n🚀 Starting multi-process load test: {test_name}")
+        print(f"   Processes: {processes}")
+        print(f"   " + (f"Rate: {rate_per_second:g}/s total" if rate_per_second
+                        else f"Concurrent users per process: {concurrent_users}"))
+        print(f"   Duration: {duration_seconds}s")
+        
+        context = multiprocessing.get_context("fork")
+        test_function = self.test_functions[test_name]
+        per_process_rate = rate_per_second / processes if rate_per_second else None
+        
+        connections = []
+        workers = []
+        for _ in range(processes):
+            receiver, sender = context.Pipe(duplex=False)
+            worker = context.Process(
+                target=_load_worker,
+                args=(sender, test_function, concurrent_users, duration_seconds, per_process_rate),
+                daemon=True
+            )
+            worker.start()
+            sender.close()
+            connections.append(receiver)
+            workers.append(worker)
+        
+        def collect() -> tuple:
+            merged = LatencyHistogram()
+            errors = 0
+            live: Dict[int, list] = defaultdict(lambda: [LatencyHistogram(), 0, 0, 0])
+            open_connections = list(connections)
+            
+            while open_connections:
+                for connection in wait_for_connections(open_connections):
+                    try:
+                        message = connection.recv()
+                    except EOFError:
+                        open_connections.remove(connection)
+                        continue
+                    
+                    if message[0] == "tick":
+                        _, second, interval, tick_errors = message
+                        stats = live[second]
+                        stats[0].merge(interval)
+                        stats[1] += interval.total_count
+                        stats[2] += tick_errors
+                        stats[3] += 1
+                        if stats[3] == processes:  # every worker reported this second
+                            print(f"   ⏱️  t={second}s: {stats[1]} req/s, errors {stats[2]}, "
+                                  f"p99 {stats[0].quantile_ns(0.99) / 1e6:.2f}ms")
+                    else:
+                        _, histogram, worker_errors = message
+                        merged.merge(histogram)
+                        errors += worker_errors
+            # EOF only says the pipe closed; join (off the event loop) for the exit code
+            for worker in workers:
+                worker.join()
+            return merged, errors
+        
+        start_ns = time.perf_counter_ns()
+        histogram, error_count = await asyncio.to_thread(collect)
+        total_duration = (time.perf_counter_ns() - start_ns) / 1e9
+        
+        crashed = [worker.exitcode for worker in workers if worker.exitcode != 0]
+        if crashed:
+            raise RuntimeError(f"{len(crashed)} of {processes} load workers failed "
+                               f"(exit codes {crashed}); results would be incomplete")
+        
+        metrics = self._metrics_from_histogram(test_name, histogram, error_count, total_duration)
+        if rate_per_second:
+            metrics.intended_rate = rate_per_second
+            metrics.achieved_rate = histogram.total_count / duration_seconds
+        
+        self.results.append(metrics)
+        self._print_metrics(metrics)
+        
+        return metrics
+    
+    def _metrics_from_histogram(self, test_name: str, histogram: LatencyHistogram,
+                                error_count: int, total_duration: float) -> PerformanceMetrics:
+        """Calculate performance metrics from a merged latency histogram"""
+        total_requests = histogram.total_count
+        return PerformanceMetrics(
+            test_name=test_name,
+            total_requests=total_requests,
+            successful_requests=total_requests - error_count,
+            failed_requests=error_count,
+            total_duration=total_duration,
+            min_response_time=(histogram.min_ns or 0) / 1e9,
+            max_response_time=histogram.max_ns / 1e9,
+            avg_response_time=histogram.mean_ns() / 1e9,
+            median_response_time=histogram.quantile_ns(0.50) / 1e9,
+            p95_response_time=histogram.quantile_ns(0.95) / 1e9,
+            p99_response_time=histogram.quantile_ns(0.99) / 1e9,
+            requests_per_second=total_requests / total_duration if total_duration > 0 else 0,
+            error_rate=error_count / total_requests if total_requests > 0 else 0
+        )
+    
     def _calculate_metrics(self, test_name: str, response_times: List[float], 
                           errors: List[str], total_duration: float) -> PerformanceMetrics:
         """Calculate performance metrics"""
@@ -1133,17 +1716,6 @@ class LoadTester:
         median_time = statistics.median(response_times)
         
         # Calculate percentiles
-        def percentile(data: List[float], p: float) -> float:
-            if not data:
-                return 0
-            k = (len(data) - 1) * p / 100
-            f = int(k)
-            c = k - f
-            if f + 1 < len(data):
-                return data[f] * (1 - c) + data[f + 1] * c
-            else:
-                return data[f]
-        
         p95_time = percentile(sorted_times, 95)
         p99_time = percentile(sorted_times, 99)
         
@@ -1176,6 +1748,8 @@ class LoadTester:
         print(f"Error Rate: {metrics.error_rate*100:.2f}%")
         print(f"Duration: {metrics.total_duration:.2f}s")
         print(f"RPS: {metrics.requests_per_second:.2f}")
+        if metrics.intended_rate is not None:
+            print(f"Arrival rate: {metrics.achieved_rate:.1f}/s achieved vs {metrics.intended_rate:.1f}/s intended")
         print(f"\nResponse Times:")
         print(f"  Min: {metrics.min_response_time*1000:.2f}ms")
         print(f"  Max: {metrics.max_response_time*1000:.2f}ms")
@@ -1224,6 +1798,90 @@ class StressTester:
         self._print_stress_summary(results)
         return results
     
+    async def find_capacity(self, test_name: str, slo_p99: float = 0.2,
+                            max_error_rate: float = 0.001, min_rate: float = 10,
+                            max_rate: float = 10000, step_duration: float = 2.0,
+                            precision: float = 0.1, plateau_tolerance: float = 0.05,
+                            max_steps: int = 15) -> dict:
+        """Find the highest open-loop arrival rate that meets the SLO.
+        
+        Doubles the rate until a step fails, then binary-searches the
+        bracket. A step passes only if the whole p99 bootstrap interval is
+        below slo_p99, errors stay within max_error_rate and throughput keeps
+        up with the offered rate (no plateau), so the reported capacity is
+        conservative.
+        """
+        print(f"\n🔎 Capacity search: {test_name}")
+        print(f"   SLO: p99 < {slo_p99*1000:.0f}ms, errors < {max_error_rate*100:.2f}%")
+        
+        steps = []
+        
+        async def probe(rate: float) -> bool:
+            metrics = await self.load_tester.run_open_loop_test(
+                test_name, rate_per_second=rate, duration_seconds=step_duration, verbose=False
+            )
+            p99_low, p99_high = bootstrap_ci(
+                metrics.response_times, lambda data: percentile(sorted(data), 99), resamples=200
+            )
+            # Completions inside the issue window: dividing by a duration that
+            # includes draining the backlog would hide a plateau
+            throughput = metrics.completed_rate
+            plateau = throughput < rate * (1 - plateau_tolerance) * (1 - metrics.error_rate)
+            
+            passed = (p99_high < slo_p99 and metrics.error_rate <= max_error_rate and not plateau)
+            steps.append({
+                "rate": rate,
+                "throughput": throughput,
+                "p99": metrics.p99_response_time,
+                "p99_ci": (p99_low, p99_high),
+                "error_rate": metrics.error_rate,
+                "plateau": plateau,
+                "passed": passed
+            })
+            
+            verdict = "✅" if passed else "❌"
+            print(f"   {verdict} {rate:>8.1f}/s -> {throughput:>8.1f}/s, "
+                  f"p99 {metrics.p99_response_time*1000:.1f}ms "
+                  f"[{p99_low*1000:.1f}, {p99_high*1000:.1f}], "
+                  f"errors {metrics.error_rate*100:.2f}%{' (plateau)' if plateau else ''}")
+            return passed
+        
+        # Exponential ramp to bracket the knee
+        low, high = 0.0, None
+        rate = min_rate
+        while len(steps) < max_steps and rate <= max_rate:
+            if await probe(rate):
+                low = rate
+                rate *= 2
+            else:
+                high = rate
+                break
+        
+        # Binary search inside the bracket
+        while high is not None and len(steps) < max_steps and (high - low) > precision * max(low, min_rate):
+            middle = (low + high) / 2
+            if await probe(middle):
+                low = middle
+            else:
+                high = middle
+        
+        best = max((step for step in steps if step["passed"]), key=lambda step: step["rate"], default=None)
+        result = {
+            "test_name": test_name,
+            "capacity": low,
+            # The knee lies between the last passing and the first failing rate
+            "capacity_interval": (low, high if high is not None else float("inf")),
+            "p99_at_capacity_ci": best["p99_ci"] if best else None,
+            "steps": steps
+        }
+        
+        interval = f"{low:.1f}–{high:.1f}/s" if high is not None else f">= {low:.1f}/s (max_rate reached)"
+        print(f"🏁 Capacity: {low:.1f} req/s (knee in {interval}) after {len(steps)} steps")
+        if best:
+            print(f"   p99 at capacity: {best['p99']*1000:.1f}ms, 95% CI "
+                  f"[{best['p99_ci'][0]*1000:.1f}, {best['p99_ci'][1]*1000:.1f}]ms")
+        return result
+    
     def _print_stress_summary(self, results: List[PerformanceMetrics]):
         """Print stress test summary"""
         print(f"\n🏁 Stress Test Summary")
@@ -1239,57 +1897,113 @@ class StressTester:
 class BenchmarkTester:
     """Benchmark testing for comparing performance"""
     
-    def __init__(self):
+    def __init__(self, target_sample_time: float = 0.002, confidence: float = 0.95,
+                 min_samples: int = 20):
         self.benchmarks = {}
-    
-    async def benchmark(self, name: str, function: Callable, iterations: int = 1000) -> dict:
-        """Benchmark a function"""
-        print(f"\n🏃 Benchmarking: {name} ({iterations} iterations)")
-        
-        execution_times = []
+        self.samples: Dict[str, List[float]] = {}  # per-call seconds, outliers removed
+        self.target_sample_time = target_sample_time
+        self.confidence = confidence
+        self.min_samples = min_samples
+    
+    @staticmethod
+    async def _time_calls(function: Callable, number: int, is_async: bool) -> Tuple[int, int]:
+        """Run function `number` times; return (elapsed ns, errors)"""
         errors = 0
-        
-        start_time = time.time()
-        
-        for i in range(iterations):
-            iter_start = time.time()
-            
+        start_ns = time.perf_counter_ns()
+        for _ in range(number):
             try:
-                if asyncio.iscoroutinefunction(function):
+                if is_async:
                     await function()
                 else:
                     function()
-                
-                iter_time = time.time() - iter_start
-                execution_times.append(iter_time)
-                
-            except Exception as e:
+            except Exception:
                 errors += 1
-                iter_time = time.time() - iter_start
-                execution_times.append(iter_time)
+        return time.perf_counter_ns() - start_ns, errors
+    
+    async def _calibrate(self, function: Callable, is_async: bool, max_number: int) -> int:
+        """Smallest power-of-two inner loop whose sample takes target_sample_time,
+        capped at max_number"""
+        target_ns = self.target_sample_time * 1e9
+        number = 1
+        while number < max_number:
+            elapsed_ns, _ = await self._time_calls(function, number, is_async)
+            if elapsed_ns >= target_ns:
+                return number
+            number *= 2
+        return max_number
+    
+    @staticmethod
+    def _reject_outliers(samples: List[float]) -> List[float]:
+        """Drop samples outside Tukey's fences (1.5 IQR)"""
+        if len(samples) < 4:
+            return list(samples)
+        ordered = sorted(samples)
+        q1, q3 = percentile(ordered, 25), percentile(ordered, 75)
+        fence = 1.5 * (q3 - q1)
+        return [x for x in samples if q1 - fence <= x <= q3 + fence]
+    
+    async def benchmark(self, name: str, function: Callable, iterations: int = 1000,
+                        warmup_iterations: int = None) -> dict:
+        """Benchmark a function
+        
+        iterations is the budget for measured calls and is never exceeded;
+        warmup and calibration calls come on top. The inner loop is capped
+        so the budget still yields min_samples samples, even if that makes
+        samples shorter than target_sample_time.
+        """
+        print(f"\n🏃 Benchmarking: {name} ({iterations} iterations)")
         
-        total_time = time.time() - start_time
+        is_async = asyncio.iscoroutinefunction(function)
         
-        # Calculate statistics
-        if execution_times:
-            min_time = min(execution_times)
-            max_time = max(execution_times)
-            avg_time = sum(execution_times) / len(execution_times)
-            median_time = statistics.median(execution_times)
-        else:
-            min_time = max_time = avg_time = median_time = 0
+        # Warm caches, allocators and lazy imports before measuring
+        if warmup_iterations is None:
+            warmup_iterations = max(1, iterations // 10)
+        await self._time_calls(function, warmup_iterations, is_async)
+        
+        max_number = max(1, iterations // self.min_samples)
+        number = await self._calibrate(function, is_async, max_number)
+        sample_count = max(1, iterations // number)
+        
+        raw_samples = []
+        errors = 0
+        start_ns = time.perf_counter_ns()
+        for _ in range(sample_count):
+            elapsed_ns, sample_errors = await self._time_calls(function, number, is_async)
+            raw_samples.append(elapsed_ns / number / 1e9)
+            errors += sample_errors
+        total_time = (time.perf_counter_ns() - start_ns) / 1e9
+        
+        sample_time = statistics.fmean(raw_samples) * number
+        if number == max_number and sample_time < self.target_sample_time:
+            print(f"⚠️ Samples take {sample_time*1e6:.1f}µs, below target_sample_time "
+                  f"{self.target_sample_time*1e6:.0f}µs: {iterations} iterations over "
+                  f"{self.min_samples} samples cap the inner loop at {max_number} calls; "
+                  f"timer overhead may skew the results")
+        
+        samples = self._reject_outliers(raw_samples)
+        self.samples[name] = samples
+        avg_time = statistics.fmean(samples)
+        ci_low, ci_high = bootstrap_ci(samples, statistics.fmean, self.confidence)
+        total_calls = sample_count * number
         
         result = {
             "name": name,
-            "iterations": iterations,
+            "iterations": total_calls,
             "total_time": total_time,
-            "successful_iterations": iterations - errors,
+            "successful_iterations": total_calls - errors,
             "errors": errors,
-            "min_time": min_time,
-            "max_time": max_time,
+            "min_time": min(samples),
+            "max_time": max(samples),
             "avg_time": avg_time,
-            "median_time": median_time,
-            "iterations_per_second": iterations / total_time if total_time > 0 else 0
+            "median_time": statistics.median(samples),
+            "stdev_time": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            "ci_low": ci_low,
+            "ci_high": ci_high,
+            "inner_loops": number,
+            "samples": len(samples),
+            "outliers": len(raw_samples) - len(samples),
+            "warmup_iterations": warmup_iterations,
+            "iterations_per_second": total_calls / total_time if total_time > 0 else 0
         }
         
         self.benchmarks[name] = result
@@ -1300,15 +2014,23 @@ class BenchmarkTester:
     def _print_benchmark_result(self, result: dict):
         """Print benchmark result"""
         print(f"📈 Benchmark Results: {result['name']}")
-        print(f"   Iterations: {result['iterations']}")
+        print(f"   Iterations: {result['iterations']} "
+              f"({result['samples']} samples x {result['inner_loops']} calls, "
+              f"{result['outliers']} outliers dropped)")
         print(f"   ✅ Successful: {result['successful_iterations']}")
         print(f"   ❌ Errors: {result['errors']}")
         print(f"   Total Time: {result['total_time']:.3f}s")
-        print(f"   Avg Time: {result['avg_time']*1000:.3f}ms")
+        print(f"   Avg Time: {result['avg_time']*1000:.3f}ms "
+              f"[{result['ci_low']*1000:.3f}, {result['ci_high']*1000:.3f}] "
+              f"{self.confidence*100:.0f}% CI")
         print(f"   Min Time: {result['min_time']*1000:.3f}ms")
         print(f"   Max Time: {result['max_time']*1000:.3f}ms")
         print(f"   Iterations/sec: {result['iterations_per_second']:.2f}")
     
+    def _ratio_ci(self, baseline_samples: List[float], samples: List[float]) -> Tuple[float, float]:
+        """Bootstrap CI of mean(samples) / mean(baseline_samples)"""
+        return bootstrap_ci(samples, statistics.fmean, self.confidence, baseline=baseline_samples)
+    
     def compare_benchmarks(self, baseline: str, *comparison_names):
         """Compare benchmarks against baseline"""
         if baseline not in self.benchmarks:
@@ -1319,9 +2041,9 @@ class BenchmarkTester:
         baseline_avg = baseline_result['avg_time']
         
         print(f"\n📊 Benchmark Comparison (baseline: {baseline})")
-        print(f"{'='*60}")
-        print(f"{'Benchmark':<20} {'Avg Time':<12} {'vs Baseline':<15}")
-        print(f"{'-'*50}")
+        print(f"{'='*72}")
+        print(f"{'Benchmark':<20} {'Avg Time':<12} {'vs Baseline':<15} {'Ratio CI':<16} {'Significant'}")
+        print(f"{'-'*72}")
         
         # Print baseline
         print(f"{baseline:<20} {baseline_avg*1000:<12.3f} {'100.0%':<15}")
@@ -1341,7 +2063,53 @@ class BenchmarkTester:
                 else:
                     performance = "N/A"
                 
-                print(f"{name:<20} {avg_time*1000:<12.3f} {performance:<15}")
+                # Significant only if the ratio CI excludes 1.0
+                low, high = self._ratio_ci(self.samples[baseline], self.samples[name])
+                significant = "yes" if low > 1 or high < 1 else "no"
+                ci = f"[{low:.3f}, {high:.3f}]"
+                print(f"{name:<20} {avg_time*1000:<12.3f} {performance:<15} {ci:<16} {significant}")
+    
+    def save_baseline(self, file_path: str, names: List[str] = None):
+        """Persist results and samples as a JSON baseline"""
+        names = names or list(self.benchmarks)
+        baseline = {
+            name: {**self.benchmarks[name], "sample_times": self.samples[name]}
+            for name in names
+        }
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump({"created_at": datetime.now().isoformat(), "benchmarks": baseline}, f, indent=2)
+        print(f"💾 Benchmark baseline saved: {file_path} ({len(baseline)} benchmarks)")
+    
+    def check_regressions(self, file_path: str, threshold: float = 0.10) -> List[dict]:
+        """Compare current results with a baseline file.
+        
+        A benchmark regresses when the whole ratio CI (current / baseline
+        mean time) lies above 1 + threshold, i.e. it is significantly slower
+        by more than the allowed margin.
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)["benchmarks"]
+        
+        regressions = []
+        for name, previous in baseline.items():
+            if name not in self.samples:
+                continue
+            low, high = self._ratio_ci(previous["sample_times"], self.samples[name])
+            status = "regressed" if low > 1 + threshold else "improved" if high < 1 else "ok"
+            print(f"   {'❌' if status == 'regressed' else '✅'} {name}: "
+                  f"x{statistics.fmean(self.samples[name]) / previous['avg_time']:.2f} "
+                  f"[{low:.2f}, {high:.2f}] {status}")
+            if status == "regressed":
+                regressions.append({"name": name, "ratio_ci": (low, high), "threshold": threshold})
+        return regressions
+    
+    def assert_no_regressions(self, file_path: str, threshold: float = 0.10):
+        """Fail (for CI suites) when any benchmark regressed beyond threshold"""
+        print(f"\n🔍 Checking benchmarks against baseline (threshold {threshold*100:.0f}%)")
+        regressions = self.check_regressions(file_path, threshold)
+        if regressions:
+            names = ", ".join(regression["name"] for regression in regressions)
+            raise AssertionError(f"Benchmark regression beyond {threshold*100:.0f}%: {names}")
 
 # Performance testing demonstration
 print("Performance testing örnekleri:")
@@ -1357,6 +2125,8 @@ async def performance_testing_demo():
         def __init__(self):
             self.data = {}
             self.counter = 0
+            self.connection_lock = asyncio.Lock()
+            self.worker_slots = asyncio.Semaphore(4)
         
         async def fast_operation(self):
             """Fast operation for testing"""
@@ -1381,6 +2151,19 @@ async def performance_testing_demo():
             
             return {"result": "success", "counter": self.counter}
         
+        async def capacity_limited_operation(self):
+            """Service with 4 workers and 5ms service time (~800 req/s)"""
+            async with self.worker_slots:
+                await asyncio.sleep(0.005)
+            return {"result": "success"}
+        
+        async def stalling_operation(self):
+            """Single-connection service with an occasional 200ms stall"""
+            async with self.connection_lock:
+                self.counter += 1
+                await asyncio.sleep(0.2 if self.counter % 200 == 0 else 0.002)
+            return {"result": "success", "counter": self.counter}
+        
         def cpu_intensive_sync(self):
             """CPU intensive synchronous operation"""
             result = 0
@@ -1403,6 +2186,8 @@ async def performance_testing_demo():
     load_tester.register_test("fast_operation", service.fast_operation)
     load_tester.register_test("slow_operation", service.slow_operation)
     load_tester.register_test("unreliable_operation", service.unreliable_operation)
+    load_tester.register_test("stalling_operation", service.stalling_operation)
+    load_tester.register_test("capacity_limited_operation", service.capacity_limited_operation)
     
     # 1. Load Testing
     print("\n--- Load Testing ---")
@@ -1428,6 +2213,32 @@ async def performance_testing_demo():
         duration_seconds=4
     )
     
+    # Closed loop vs open loop on a service that stalls: the closed loop
+    # stops sending during the stall, the open loop keeps the offered rate
+    closed_loop = await load_tester.run_load_test(
+        "stalling_operation",
+        concurrent_users=1,
+        duration_seconds=3
+    )
+    open_loop = await load_tester.run_open_loop_test(
+        "stalling_operation",
+        rate_schedule=[(1.5, 100), (1.5, 200)]
+    )
+    print(f"\np99 closed loop: {closed_loop.p99_response_time*1000:.1f}ms, "
+          f"open loop: {open_loop.p99_response_time*1000:.1f}ms")
+    
+    # Several processes, each with its own loop and histogram
+    async def noop_operation():
+        await asyncio.sleep(0)
+    
+    load_tester.register_test("noop_operation", noop_operation)
+    await load_tester.run_multiprocess_load_test(
+        "noop_operation",
+        processes=2,
+        concurrent_users=50,
+        duration_seconds=3
+    )
+    
     # 2. Stress Testing
     print("\n--- Stress Testing ---")
     
@@ -1438,6 +2249,16 @@ async def performance_testing_demo():
         step_size=10
     )
     
+    # Adaptive search: doubling, then bisection around the knee
+    await stress_tester.find_capacity(
+        "capacity_limited_operation",
+        slo_p99=0.05,
+        max_error_rate=0.001,
+        min_rate=50,
+        max_rate=3200,
+        step_duration=1.0
+    )
+    
     # 3. Benchmark Testing
     print("\n--- Benchmark Testing ---")
     
@@ -1471,6 +2292,24 @@ async def performance_testing_demo():
         return len(data)
     
     await benchmark_tester.benchmark("memory_allocation", memory_test, iterations=50)
+    
+    # Regression gating against a persisted baseline
+    baseline_file = os.path.join(tempfile.gettempdir(), "benchmark_baseline.json")
+    benchmark_tester.save_baseline(baseline_file)
+    
+    def cpu_intensive_sync_regressed():
+        """Same hot path after an accidental 2x slowdown"""
+        service.cpu_intensive_sync()
+        service.cpu_intensive_sync()
+    
+    candidate = BenchmarkTester()
+    await candidate.benchmark("cpu_intensive_sync", cpu_intensive_sync_regressed, iterations=100)
+    try:
+        candidate.assert_no_regressions(baseline_file, threshold=0.10)
+    except AssertionError as e:
+        print(f"🛑 {e}")
+    finally:
+        os.remove(baseline_file)
 
 # =============================================================================
 # 4. TEST AUTOMATION & CI/CD
@@ -1478,14 +2317,124 @@ async def performance_testing_demo():
 
 print("\n=== Test Automation & CI/CD ===")
 
+class TestImpactTracker:
+    """Records which source files each test executes and caches results.
+    
+    A test is re-run only when the content hash of one of the files it
+    touched changed since its cached result was stored.
+    """
+    
+    # Results worth reusing; errors (timeouts, crashes) are always re-run
+    REUSABLE_RESULTS = (TestResult.PASSED, TestResult.FAILED)
+    
+    def __init__(self, cache_file: str):
+        self.cache_file = cache_file
+        self.cache: Dict[str, dict] = {}
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    self.cache = json.load(f)
+            except (OSError, ValueError) as e:
+                # A truncated or corrupt cache only costs a full run
+                print(f"⚠️ Ignoring unreadable test impact cache {cache_file}: {e}")
+        self._hashes: Dict[str, tuple] = {}  # path -> ((mtime_ns, size), sha256)
+        self._library_paths = tuple(
+            os.path.realpath(sysconfig.get_paths()[key]) for key in ("stdlib", "platstdlib", "purelib", "platlib")
+        )
+    
+    def file_hash(self, path: str) -> Optional[str]:
+        """Content hash, recomputed only when mtime or size changed"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._hashes.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self._hashes[path] = (stamp, digest)
+        return digest
+    
+    def _dependencies(self, touched: set) -> Dict[str, str]:
+        dependencies = {}
+        for filename in touched:
+            if filename.startswith("<"):
+                continue
+            path = os.path.realpath(filename)
+            if path.startswith(self._library_paths):
+                continue
+            digest = self.file_hash(path)
+            if digest is not None:
+                dependencies[path] = digest
+        return dependencies
+    
+    def traced(self, function: Callable, touched: set,
+               on_finish: Callable[[Dict[str, str]], None] = None) -> Callable:
+        """Wrap a function so the files it calls into are added to touched;
+        on_finish, if given, receives the dependencies when it returns"""
+        def trace(frame, event, arg):
+            # 'call' events only: returning None disables per-line tracing
+            touched.add(frame.f_code.co_filename)
+            return None
+        
+        def finish(previous):
+            # Hand tracing back to a debugger or coverage tool, if any
+            sys.settrace(previous)
+            if on_finish is not None:
+                on_finish(self._dependencies(touched))
+        
+        if asyncio.iscoroutinefunction(function):
+            async def async_wrapper(*args):
+                previous = sys.gettrace()
+                sys.settrace(trace)
+                try:
+                    return await function(*args)
+                finally:
+                    finish(previous)
+            return async_wrapper
+        
+        def wrapper(*args):
+            previous = sys.gettrace()
+            sys.settrace(trace)
+            try:
+                return function(*args)
+            finally:
+                finish(previous)
+        return wrapper
+    
+    def cached_result(self, test_name: str) -> Optional[dict]:
+        """Cached result if none of the test's dependencies changed"""
+        entry = self.cache.get(test_name)
+        if entry is None or not entry["dependencies"]:
+            return None
+        for path, digest in entry["dependencies"].items():
+            if self.file_hash(path) != digest:
+                return None
+        return entry["result"]
+    
+    def store(self, test_name: str, dependencies: Dict[str, str], result: dict):
+        self.cache[test_name] = {"dependencies": dependencies, "result": result}
+    
+    def discard(self, test_name: str):
+        """Drop a stale entry so it can never be reused"""
+        self.cache.pop(test_name, None)
+    
+    def save(self):
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f, indent=2)
+
 class TestSuite:
     """Comprehensive test suite"""
     
-    def __init__(self):
+    def __init__(self, impact_cache_file: str = None):
         self.unit_tests = []
         self.integration_tests = []
         self.performance_tests = []
         self.results = {}
+        # Set to enable incremental runs (test impact analysis)
+        self.impact_tracker = TestImpactTracker(impact_cache_file) if impact_cache_file else None
     
     def add_unit_test(self, test_case: TestCase):
         """Add unit test"""
@@ -1505,35 +2454,96 @@ class TestSuite:
             "function": test_function
         })
     
-    async def run_full_suite(self, include_performance: bool = False) -> dict:
-        """Run complete test suite"""
-        print(f"\n🎯 Running Full Test Suite")
+    async def run_full_suite(self, include_performance: bool = False,
+                             incremental: bool = False) -> dict:
+        """Run complete test suite (incremental: skip tests whose dependencies are unchanged)"""
+        tracker = self.impact_tracker if incremental else None
+        if incremental and tracker is None:
+            raise ValueError("Incremental runs need TestSuite(impact_cache_file=...)")
+        
+        print(f"\n🎯 Running {'Incremental' if tracker else 'Full'} Test Suite")
         print(f"{'='*60}")
         
         suite_start_time = time.time()
+        reused = 0
         
         # Run unit tests
         print("\n1️⃣ Running Unit Tests...")
         unit_runner = TestRunner()
+        unit_dependencies: Dict[str, Dict[str, str]] = {}
         
         for test_case in self.unit_tests:
-            unit_runner.add_test(test_case)
+            if tracker is None:
+                unit_runner.add_test(test_case)
+                continue
+            
+            cached = tracker.cached_result(test_case.name)
+            if cached is not None and TestResult(cached["result"]) in tracker.REUSABLE_RESULTS:
+                execution = TestExecution.from_dict(cached)
+                execution.cached = True
+                unit_runner.results.append(execution)
+                reused += 1
+                print(f"♻️  {test_case.name} (cached {execution.result.value})")
+                continue
+            
+            def record(dependencies: Dict[str, str], name: str = test_case.name):
+                unit_dependencies[name] = dependencies
+            
+            # Setup and teardown count as dependencies too; the last one to
+            # run reports the combined set
+            touched = set()
+            setup, teardown = test_case.setup_function, test_case.teardown_function
+            unit_runner.add_test(TestCase(
+                name=test_case.name,
+                description=test_case.description,
+                test_function=tracker.traced(test_case.test_function, touched,
+                                             None if teardown else record),
+                setup_function=tracker.traced(setup, touched) if setup else None,
+                teardown_function=tracker.traced(teardown, touched, record) if teardown else None,
+                tags=test_case.tags,
+                timeout=test_case.timeout
+            ))
         
         unit_results = await unit_runner.run_tests()
         self.results["unit_tests"] = unit_results
         
+        if tracker is not None:
+            for execution in unit_runner.results:
+                if not execution.cached and execution.test_name in unit_dependencies:
+                    tracker.store(execution.test_name, unit_dependencies[execution.test_name],
+                                  execution.to_dict())
+        
         # Run integration tests
         print("\n2️⃣ Running Integration Tests...")
         integration_results = {"total": 0, "passed": 0, "failed": 0, "results": []}
         
         for test_info in self.integration_tests:
             start_time = time.time()
+            cache_key = f"integration::{test_info['name']}"
             
+            if tracker is not None:
+                cached = tracker.cached_result(cache_key)
+                if cached is not None:
+                    integration_results[cached["status"].lower()] += 1
+                    integration_results["results"].append({**cached, "cached": True})
+                    integration_results["total"] += 1
+                    reused += 1
+                    print(f"♻️  {test_info['name']} (cached {cached['status']})")
+                    continue
+            
+            dependencies: Dict[str, str] = {}
+            function = test_info["function"]
+            if tracker is not None:
+                function = tracker.traced(function, set(), dependencies.update)
+            
+            # Like REUSABLE_RESULTS: only passes and assertion failures are
+            # cached; other errors (connection refused, timeouts) may be flaky
+            cacheable = True
             try:
-                if asyncio.iscoroutinefunction(test_info["function"]):
-                    await test_info["function"]()
+                if asyncio.iscoroutinefunction(function):
+                    await function()
                 else:
-                    test_info["function"]()
+                    function()
                 
                 result = {
                     "name": test_info["name"],
@@ -1544,6 +2554,7 @@ class TestSuite:
                 print(f"✅ {test_info['name']}")
                 
             except Exception as e:
+                cacheable = isinstance(e, AssertionError)
                 result = {
                     "name": test_info["name"],
                     "status": "FAILED",
@@ -1555,9 +2566,17 @@ class TestSuite:
             
             integration_results["results"].append(result)
             integration_results["total"] += 1
+            if tracker is not None:
+                if cacheable:
+                    tracker.store(cache_key, dependencies, result)
+                else:
+                    tracker.discard(cache_key)
         
         self.results["integration_tests"] = integration_results
         
+        if tracker is not None:
+            tracker.save()
+        
         # Run performance tests if requested
         if include_performance:
             print("\n3️⃣ Running Performance Tests...")
@@ -1584,7 +2603,8 @@ class TestSuite:
         overall_results = {
             "suite_duration": total_duration,
             "unit_tests": self.results["unit_tests"],
-            "integration_tests": self.results["integration_tests"]
+            "integration_tests": self.results["integration_tests"],
+            "reused_results": reused
         }
         
         if include_performance:
@@ -1599,6 +2619,8 @@ class TestSuite:
         print(f"\n🏆 Test Suite Summary")
         print(f"{'='*60}")
         print(f"Total Duration: {results['suite_duration']:.2f}s")
+        if results.get("reused_results"):
+            print(f"♻️  Reused cached results: {results['reused_results']}")
         
         # Unit tests summary
         unit = results["unit_tests"]
@@ -1637,20 +2659,53 @@ class TestSuite:
                 print("⚠️ Test suite needs attention")
 
 class CIPipeline:
-    """Continuous Integration Pipeline"""
+    """Continuous Integration Pipeline
     
-    def __init__(self):
+    Stages form a DAG and independent stages run concurrently (up to
+    ``max_workers``). A stage added without ``depends_on`` waits for the
+    stage added before it, so plain add_stage() calls stay sequential.
+    """
+    
+    def __init__(self, max_workers: int = 2, fail_fast: bool = True):
         self.stages = []
         self.artifacts = {}
+        self.max_workers = max_workers
+        self.fail_fast = fail_fast
+        self.stage_durations: Dict[str, float] = {}  # last run, used for priorities
     
-    def add_stage(self, name: str, stage_function: Callable):
+    def add_stage(self, name: str, stage_function: Callable, depends_on: List[str] = None):
         """Add pipeline stage"""
+        if depends_on is None:
+            depends_on = [self.stages[-1]["name"]] if self.stages else []
+        
+        known = {stage["name"] for stage in self.stages}
+        unknown = [dep for dep in depends_on if dep not in known]
+        if unknown:
+            # Dependencies must be added first, which also rules out cycles
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {unknown}")
+        
         self.stages.append({
             "name": name,
-            "function": stage_function
+            "function": stage_function,
+            "depends_on": list(depends_on)
         })
         print(f"🔧 Pipeline stage added: {name}")
     
+    def _critical_path_ranks(self) -> Dict[str, float]:
+        """Longest estimated remaining time through each stage"""
+        ranks = {}
+        for stage in reversed(self.stages):
+            dependents = [s["name"] for s in self.stages if stage["name"] in s["depends_on"]]
+            ranks[stage["name"]] = (self.stage_durations.get(stage["name"], 1.0)
+                                    + max((ranks[d] for d in dependents), default=0.0))
+        return ranks
+    
+    async def _run_stage(self, stage: dict):
+        if asyncio.iscoroutinefunction(stage["function"]):
+            return await stage["function"]()
+        # Sync stages run on a worker thread so they overlap with others
+        return await asyncio.to_thread(stage["function"])
+    
     async def run_pipeline(self) -> dict:
         """Run CI/CD pipeline"""
         print(f"\n🚀 Starting CI/CD Pipeline")
@@ -1659,47 +2714,68 @@ class CIPipeline:
         pipeline_start_time = time.time()
         results = {"stages": [], "overall_status": "SUCCESS"}
         
-        for i, stage in enumerate(self.stages, 1):
-            stage_start_time = time.time()
+        ranks = self._critical_path_ranks()
+        order = {stage["name"]: i for i, stage in enumerate(self.stages)}
+        by_name = {stage["name"]: stage for stage in self.stages}
+        remaining = {stage["name"]: len(stage["depends_on"]) for stage in self.stages}
+        ready = [(-ranks[name], order[name], name) for name, count in remaining.items() if count == 0]
+        heapq.heapify(ready)
+        ready_at = {name: pipeline_start_time for _, _, name in ready}
+        running: Dict[asyncio.Task, tuple] = {}  # task -> (name, start, queue_time)
+        completed = set()
+        stopped = False
+        
+        while ready or running:
+            while ready and len(running) < self.max_workers and not stopped:
+                _, _, name = heapq.heappop(ready)
+                now = time.time()
+                print(f"\n▶️ Stage: {name}")
+                task = asyncio.create_task(self._run_stage(by_name[name]))
+                running[task] = (name, now, now - ready_at[name])
             
-            print(f"\n{i}️⃣ Stage: {stage['name']}")
-            print(f"{'-'*40}")
+            if not running:
+                break
             
-            try:
-                if asyncio.iscoroutinefunction(stage["function"]):
-                    stage_result = await stage["function"]()
-                else:
-                    stage_result = stage["function"]()
-                
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name, stage_start_time, queue_time = running.pop(task)
                 stage_duration = time.time() - stage_start_time
+                stage_info = {"name": name, "duration": stage_duration, "queue_time": queue_time}
                 
-                stage_info = {
-                    "name": stage["name"],
-                    "status": "SUCCESS",
-                    "duration": stage_duration,
-                    "result": stage_result
-                }
-                
-                print(f"✅ Stage '{stage['name']}' completed successfully ({stage_duration:.2f}s)")
-                
-            except Exception as e:
-                stage_duration = time.time() - stage_start_time
-                
-                stage_info = {
-                    "name": stage["name"],
-                    "status": "FAILED",
-                    "duration": stage_duration,
-                    "error": str(e)
-                }
-                
-                print(f"❌ Stage '{stage['name']}' failed: {str(e)}")
-                results["overall_status"] = "FAILED"
+                if task.cancelled():
+                    stage_info.update(status="CANCELLED", error="Cancelled after another stage failed")
+                    print(f"🛑 Stage '{name}' cancelled")
+                elif task.exception() is not None:
+                    stage_info.update(status="FAILED", error=str(task.exception()))
+                    print(f"❌ Stage '{name}' failed: {task.exception()}")
+                    results["overall_status"] = "FAILED"
+                    if self.fail_fast and not stopped:
+                        stopped = True
+                        for other, (other_name, _, _) in running.items():
+                            # A to_thread() stage cannot be interrupted: its thread
+                            # keeps running, so wait for it and report the real outcome
+                            if asyncio.iscoroutinefunction(by_name[other_name]["function"]):
+                                other.cancel()
+                else:
+                    stage_info.update(status="SUCCESS", result=task.result())
+                    print(f"✅ Stage '{name}' completed successfully ({stage_duration:.2f}s)")
+                    self.stage_durations[name] = stage_duration
+                    completed.add(name)
+                    for stage in self.stages:
+                        if name in stage["depends_on"]:
+                            remaining[stage["name"]] -= 1
+                            if remaining[stage["name"]] == 0:
+                                heapq.heappush(ready, (-ranks[stage["name"]], order[stage["name"]], stage["name"]))
+                                ready_at[stage["name"]] = time.time()
                 
-                # Stop pipeline on failure
                 results["stages"].append(stage_info)
-                break
-            
-            results["stages"].append(stage_info)
+        
+        # Dependents of failed stages (and everything left after fail fast) never ran
+        reported = {stage["name"] for stage in results["stages"]}
+        for stage in self.stages:
+            if stage["name"] not in reported:
+                results["stages"].append({"name": stage["name"], "status": "SKIPPED",
+                                          "duration": 0.0, "queue_time": 0.0})
         
         pipeline_duration = time.time() - pipeline_start_time
         results["total_duration"] = pipeline_duration
@@ -1715,10 +2791,12 @@ class CIPipeline:
         print(f"Overall Status: {results['overall_status']}")
         print(f"Total Duration: {results['total_duration']:.2f}s")
         
+        status_icons = {"SUCCESS": "✅", "FAILED": "❌", "CANCELLED": "🛑", "SKIPPED": "⏭️"}
         print(f"\nStage Results:")
         for stage in results["stages"]:
-            status_icon = "✅" if stage["status"] == "SUCCESS" else "❌"
-            print(f"{status_icon} {stage['name']}: {stage['status']} ({stage['duration']:.2f}s)")
+            status_icon = status_icons[stage["status"]]
+            print(f"{status_icon} {stage['name']}: {stage['status']} "
+                  f"(queued {stage['queue_time']:.2f}s, ran {stage['duration']:.2f}s)")
 
 # Test automation demonstration
 print("Test automation & CI/CD örnekleri:")
@@ -1837,11 +2915,12 @@ async def test_automation_demo():
         return {"environment": "staging", "status": "deployed"}
     
     # Add stages to pipeline
-    pipeline.add_stage("Code Quality", stage_code_quality)
-    pipeline.add_stage("Unit Tests", stage_unit_tests)
-    pipeline.add_stage("Integration Tests", stage_integration_tests)
-    pipeline.add_stage("Build Artifact", stage_build_artifact)
-    pipeline.add_stage("Deploy to Staging", stage_deploy)
+    # Code quality and unit tests are independent and run side by side
+    pipeline.add_stage("Code Quality", stage_code_quality, depends_on=[])
+    pipeline.add_stage("Unit Tests", stage_unit_tests, depends_on=[])
+    pipeline.add_stage("Integration Tests", stage_integration_tests, depends_on=["Unit Tests"])
+    pipeline.add_stage("Build Artifact", stage_build_artifact, depends_on=["Code Quality", "Unit Tests"])
+    pipeline.add_stage("Deploy to Staging", stage_deploy, depends_on=["Build Artifact", "Integration Tests"])
     
     # Run pipeline
     pipeline_results = await pipeline.run_pipeline()
@@ -1853,6 +2932,36 @@ async def test_automation_demo():
     else:
         print("\n💥 Pipeline failed!")
         print("   Check logs and fix issues before retry")
+    
+    # Incremental runs: only tests whose touched files changed are re-run
+    print("\n--- Incremental Test Selection ---")
+    work_dir = tempfile.mkdtemp(prefix="test_impact_")
+    pricing_file = os.path.join(work_dir, "pricing.py")
+    with open(pricing_file, 'w', encoding='utf-8') as f:
+        f.write("def apply_discount(price):\n    return round(price * 0.9, 2)\n")
+    
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("pricing", pricing_file)
+    pricing = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(pricing)
+    
+    def test_discount(assertions: TestAssertions):
+        assertions.assert_equal(pricing.apply_discount(100), 90.0)
+    
+    incremental_suite = TestSuite(impact_cache_file=os.path.join(work_dir, "impact_cache.json"))
+    incremental_suite.add_unit_test(TestCase("test_calc_basic_ops", "Calculator operations", test_calc_basic_ops))
+    incremental_suite.add_unit_test(TestCase("test_discount", "Pricing discount", test_discount))
+    
+    await incremental_suite.run_full_suite(incremental=True)  # cold cache: everything runs
+    await incremental_suite.run_full_suite(incremental=True)  # nothing changed: all cached
+    
+    with open(pricing_file, 'a', encoding='utf-8') as f:
+        f.write("\nVAT_RATE = 0.2\n")
+    await incremental_suite.run_full_suite(incremental=True)  # only test_discount re-runs
+    
+    for name in os.listdir(work_dir):
+        os.remove(os.path.join(work_dir, name))
+    os.rmdir(work_dir)
 
 # Run performance testing demo
 asyncio.run(performance_testing_demo())